@@ -0,0 +1,145 @@
+"""
+CROSS-VALIDATION FOR POLYNOMIAL DEGREE
+Pick the degree that predicts new points best, not the one that
+wiggles through the known points best
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from polynomial_sweep import IncrementalQR, basis_columns, degree_sweep
+
+# what a worker sees: filled in once per process by _share_data
+_worker = {}
+
+
+# ========================================
+# K-FOLD
+# ========================================
+
+def _share_data(x, y):
+    # Pool initializer: the data is sent once per worker, not once per fold
+    _worker.update(x=x, y=y)
+
+
+def _fold_errors(validation, max_degree, basis):
+    # Fit every degree on the rows NOT in this fold (one sweep), then
+    # return the squared-error sum on the fold for each degree
+    x, y = _worker['x'], _worker['y']
+    train = np.ones(len(x), dtype=bool)
+    train[validation] = False
+
+    sweep = degree_sweep(x[train], y[train], max_degree, basis)
+    x_test, y_test = x[validation], y[validation]
+    return np.array([np.sum((f(x_test) - y_test) ** 2) for f in sweep['functions']])
+
+
+def kfold_cv(x_points, y_points, max_degree, folds=5, workers=1, basis='chebyshev', seed=0):
+    """
+    k-fold cross-validation error for degrees 1..max_degree
+
+    The points are shuffled into `folds` groups. Each group is left out
+    once: all degrees are fitted on the rest (one degree_sweep) and
+    tested on the left-out group. Folds run in parallel when workers > 1.
+
+    Returns: dict with 'degrees', 'cv_error' (mean squared error on the
+    left-out points), 'cv_std' (spread between folds), 'best_degree'
+    """
+    x = np.asarray(x_points, dtype=float)
+    y = np.asarray(y_points, dtype=float)
+    n = len(x)
+    if not 2 <= folds <= n:
+        raise ValueError(f"folds must be between 2 and {n}")
+
+    order = np.random.default_rng(seed).permutation(n)
+    groups = np.array_split(order, folds)
+    tasks = [(group, max_degree, basis) for group in groups]
+
+    if workers == 1:
+        _share_data(x, y)
+        sums = [_fold_errors(*task) for task in tasks]
+        _worker.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_share_data, initargs=(x, y)) as pool:
+            sums = list(pool.map(_fold_errors, *zip(*tasks)))
+
+    sums = np.array(sums)                                   # (folds, degrees)
+    sizes = np.array([len(group) for group in groups])[:, None]
+    fold_mse = sums / sizes
+
+    degrees = np.arange(1, max_degree + 1)
+    cv_error = sums.sum(axis=0) / n
+    return {
+        'method': 'kfold',
+        'degrees': degrees,
+        'cv_error': cv_error,
+        'cv_std': fold_mse.std(axis=0),
+        'best_degree': int(degrees[np.argmin(cv_error)]),
+    }
+
+
+# ========================================
+# LEAVE-ONE-OUT (NO REFITS)
+# ========================================
+
+def loo_cv(x_points, y_points, max_degree, basis='chebyshev'):
+    """
+    Leave-one-out cross-validation error for degrees 1..max_degree
+
+    Refitting n times isn't needed: for least squares, the error at
+    point i when i is left out is e_i / (1 - h_i), where e_i is the
+    normal residual and h_i the leverage (diagonal of the hat matrix
+    Q Qᵀ, so h_i = sum of Q[i, :]²). One growing QR gives the residuals
+    and leverages for every degree - the whole thing costs one fit.
+
+    Returns: dict with 'degrees', 'cv_error', 'best_degree'
+    """
+    x = np.asarray(x_points, dtype=float)
+    y = np.asarray(y_points, dtype=float)
+    n = len(x)
+    if max_degree < 1 or max_degree > n - 2:
+        raise ValueError(f"Degree must be between 1 and {n - 2} for leave-one-out on {n} points")
+
+    qr = IncrementalQR(y, max_degree + 1)
+    leverage = np.zeros(n)
+    cv_error = []
+
+    for degree, (column, _) in enumerate(basis_columns(x, max_degree, basis)):
+        qr.add_column(column)
+        leverage += qr.Q[:, degree] ** 2
+        if degree == 0:
+            continue
+
+        with np.errstate(divide='ignore'):
+            left_out = qr.residual / (1 - leverage)
+        cv_error.append(np.mean(left_out ** 2) if np.all(leverage < 1 - 1e-12) else np.inf)
+
+    degrees = np.arange(1, max_degree + 1)
+    cv_error = np.array(cv_error)
+    return {
+        'method': 'loo',
+        'degrees': degrees,
+        'cv_error': cv_error,
+        'best_degree': int(degrees[np.argmin(cv_error)]),
+    }
+
+
+def select_degree(x_points, y_points, max_degree=10, method='kfold', folds=5, workers=1, basis='chebyshev'):
+    """
+    Best polynomial degree by cross-validation
+
+    method: 'kfold' (parallel over folds) or 'loo' (leave-one-out, hat-matrix shortcut)
+    max_degree is lowered automatically when there are too few points.
+
+    Returns: (best_degree, curves) - curves is the kfold_cv / loo_cv dict
+    """
+    n = len(x_points)
+    if method == 'loo':
+        curves = loo_cv(x_points, y_points, min(max_degree, n - 2), basis)
+    elif method == 'kfold':
+        folds = min(folds, n)
+        # Each training set has n - (largest fold) points
+        largest_fold = -(-n // folds)
+        curves = kfold_cv(x_points, y_points, min(max_degree, n - largest_fold - 1), folds, workers, basis)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    return curves['best_degree'], curves
@@ -0,0 +1,67 @@
+"""
+READING DATA FILES IN CHUNKS
+Rows of numbers from CSV or .npy files, a block at a time,
+so files bigger than memory can still be processed
+"""
+
+import itertools
+import numpy as np
+
+
+def _csv_chunks(path, chunk_rows, delimiter=','):
+    # Blocks of rows from a CSV file of numbers, a text header line is skipped
+    with open(path) as file:
+        first = file.readline()
+        try:
+            [float(value) for value in first.split(delimiter)]
+            pending = [first]
+        except ValueError:
+            pending = []  # header
+
+        while True:
+            lines = pending + list(itertools.islice(file, chunk_rows - len(pending)))
+            pending = []
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+
+
+def _npy_chunks(path, chunk_rows):
+    # Blocks of rows from a .npy file, through a memory map
+    data = np.load(path, mmap_mode='r')
+    data = data.reshape(len(data), -1)
+    for start in range(0, len(data), chunk_rows):
+        yield np.asarray(data[start:start + chunk_rows], dtype=float)
+
+
+def row_chunks(path, chunk_rows=100_000):
+    """Blocks of rows (2D arrays) from a .npy or CSV file"""
+    reader = _npy_chunks if str(path).endswith('.npy') else _csv_chunks
+    return reader(path, chunk_rows)
+
+
+def file_chunks(path, chunk_rows=100_000):
+    """
+    Read samples from a .npy or CSV file in blocks of rows
+
+    One column: y (uniform grid). Two columns: x, y.
+    Yields y arrays or (x, y) pairs.
+    """
+    for rows in row_chunks(path, chunk_rows):
+        if rows.shape[1] == 1:
+            yield rows[:, 0]
+        else:
+            yield rows[:, 0], rows[:, 1]
+
+
+def xy_chunks(path, chunk_rows=100_000):
+    """
+    (x, y) pairs from a file that must have two columns
+
+    Raises ValueError for a file with only one column.
+    """
+    for rows in row_chunks(path, chunk_rows):
+        if rows.shape[1] < 2:
+            raise ValueError(f"{path} needs two columns (x, y), found {rows.shape[1]}")
+        yield rows[:, 0], rows[:, 1]
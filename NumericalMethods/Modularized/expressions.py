@@ -0,0 +1,357 @@
+"""
+USER EXPRESSIONS
+Turn a typed formula like "sin(x)*exp(-x**2)" into a fast numpy function
+"""
+
+import ast
+import numpy as np
+
+# The only functions and constants an expression may use
+FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'log2': np.log2,
+    'sqrt': np.sqrt, 'abs': np.abs, 'sign': np.sign,
+}
+CONSTANTS = {'pi': np.pi, 'e': np.e}
+VARIABLE = 'x'
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+EXPRESSION_CACHE_SIZE = 64
+
+# typed text and its normalized spelling -> CompiledExpression (oldest entry first)
+_expression_cache = {}
+
+
+# ========================================
+# PARSING AND CHECKING
+# ========================================
+
+def _check(node):
+    # Raise ValueError for anything that isn't numbers, x, constants,
+    # + - * / ** and the whitelisted functions
+    if isinstance(node, ast.Expression):
+        _check(node.body)
+    elif isinstance(node, ast.Constant):
+        if type(node.value) not in (int, float):
+            raise ValueError(f"Not a number: {node.value!r}")
+    elif isinstance(node, ast.Name):
+        if node.id != VARIABLE and node.id not in CONSTANTS:
+            raise ValueError(f"Unknown name '{node.id}' (use x, pi, e)")
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _OPERATORS):
+            raise ValueError(f"Operator not allowed: {type(node.op).__name__}")
+        _check(node.left)
+        _check(node.right)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _OPERATORS):
+            raise ValueError(f"Operator not allowed: {type(node.op).__name__}")
+        _check(node.operand)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            name = node.func.id if isinstance(node.func, ast.Name) else ast.unparse(node.func)
+            raise ValueError(f"Unknown function '{name}'")
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError(f"{node.func.id}() takes exactly one argument")
+        _check(node.args[0])
+    else:
+        raise ValueError(f"Not allowed in an expression: {ast.unparse(node)}")
+
+
+def _too_deep(text):
+    # Deeply nested input overflows the parser or the recursive tree walks
+    short = text if len(text) <= 40 else text[:40] + '...'
+    return ValueError(f"Expression is nested too deeply: {short!r}")
+
+
+def parse_expression(text):
+    """
+    Parse and check an expression, returns its ast
+
+    ^ is accepted as a power sign (x^2 means x**2).
+    Raises ValueError if the text isn't a valid, allowed expression
+    (including one nested too deeply to parse).
+    """
+    try:
+        tree = ast.parse(text.replace('^', '**').strip(), mode='eval')
+        _check(tree)
+    except SyntaxError:
+        raise ValueError(f"Can't read expression: {text!r}")
+    except (RecursionError, MemoryError):
+        # The C parser reports a too-deep tree as MemoryError
+        raise _too_deep(text) from None
+    return tree
+
+
+def normalize_expression(text):
+    """Standard spelling of an expression ('x^2+1' and 'x ** 2 + 1' give the same)"""
+    tree = parse_expression(text)
+    try:
+        return ast.unparse(tree)
+    except RecursionError:
+        raise _too_deep(text) from None
+
+
+# ========================================
+# SYMBOLIC DERIVATIVE
+# ========================================
+
+def _number(value):
+    return ast.Constant(value)
+
+
+def _is_number(node, value=None):
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return _is_number(node.operand, None if value is None else -value)
+    if not isinstance(node, ast.Constant):
+        return False
+    return value is None or node.value == value
+
+
+def _depends_on_x(node):
+    return any(isinstance(n, ast.Name) and n.id == VARIABLE for n in ast.walk(node))
+
+
+# Building blocks that skip the obvious 0 and 1 terms, so the
+# derivative of x**2 reads "2 * x" and not "2 * x ** 1 * 1"
+
+def _add(a, b):
+    if _is_number(a, 0):
+        return b
+    if _is_number(b, 0):
+        return a
+    return ast.BinOp(a, ast.Add(), b)
+
+
+def _sub(a, b):
+    if _is_number(b, 0):
+        return a
+    if _is_number(a, 0):
+        return _neg(b)
+    return ast.BinOp(a, ast.Sub(), b)
+
+
+def _mul(a, b):
+    if _is_number(a, 0) or _is_number(b, 0):
+        return _number(0)
+    if _is_number(a, 1):
+        return b
+    if _is_number(b, 1):
+        return a
+    if isinstance(a, ast.Constant) and isinstance(b, ast.Constant):
+        return _number(a.value * b.value)
+    return ast.BinOp(a, ast.Mult(), b)
+
+
+def _div(a, b):
+    if _is_number(a, 0):
+        return _number(0)
+    if _is_number(b, 1):
+        return a
+    return ast.BinOp(a, ast.Div(), b)
+
+
+def _pow(a, b):
+    if _is_number(b, 1):
+        return a
+    if _is_number(b, 0):
+        return _number(1)
+    return ast.BinOp(a, ast.Pow(), b)
+
+
+def _neg(a):
+    if isinstance(a, ast.Constant):
+        return _number(-a.value)
+    if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+        return a.operand
+    return ast.UnaryOp(ast.USub(), a)
+
+
+def _call(name, arg):
+    return ast.Call(ast.Name(name, ast.Load()), [arg], [])
+
+
+# d/du of each function, as an expression in u
+_CHAIN_RULES = {
+    'sin': lambda u: _call('cos', u),
+    'cos': lambda u: _neg(_call('sin', u)),
+    'tan': lambda u: _div(_number(1), _pow(_call('cos', u), _number(2))),
+    'arcsin': lambda u: _div(_number(1), _call('sqrt', _sub(_number(1), _pow(u, _number(2))))),
+    'arccos': lambda u: _neg(_div(_number(1), _call('sqrt', _sub(_number(1), _pow(u, _number(2)))))),
+    'arctan': lambda u: _div(_number(1), _add(_number(1), _pow(u, _number(2)))),
+    'sinh': lambda u: _call('cosh', u),
+    'cosh': lambda u: _call('sinh', u),
+    'tanh': lambda u: _sub(_number(1), _pow(_call('tanh', u), _number(2))),
+    'exp': lambda u: _call('exp', u),
+    'log': lambda u: _div(_number(1), u),
+    'log10': lambda u: _div(_number(1), _mul(u, _call('log', _number(10)))),
+    'log2': lambda u: _div(_number(1), _mul(u, _call('log', _number(2)))),
+    'sqrt': lambda u: _div(_number(0.5), _call('sqrt', u)),
+    'abs': lambda u: _call('sign', u),
+    'sign': lambda u: _number(0),
+}
+
+
+def _differentiate(node):
+    # d(node)/dx as a new ast
+    if isinstance(node, ast.Constant):
+        return _number(0)
+
+    if isinstance(node, ast.Name):
+        return _number(1 if node.id == VARIABLE else 0)
+
+    if isinstance(node, ast.UnaryOp):
+        inner = _differentiate(node.operand)
+        return _neg(inner) if isinstance(node.op, ast.USub) else inner
+
+    if isinstance(node, ast.Call):
+        name, u = node.func.id, node.args[0]
+        # chain rule: f(u)' = f'(u) * u'
+        return _mul(_CHAIN_RULES[name](u), _differentiate(u))
+
+    u, v = node.left, node.right
+    du, dv = _differentiate(u), _differentiate(v)
+
+    if isinstance(node.op, ast.Add):
+        return _add(du, dv)
+    if isinstance(node.op, ast.Sub):
+        return _sub(du, dv)
+    if isinstance(node.op, ast.Mult):
+        # (u v)' = u' v + u v'
+        return _add(_mul(du, v), _mul(u, dv))
+    if isinstance(node.op, ast.Div):
+        # (u / v)' = (u' v - u v') / v²
+        if not _depends_on_x(v):
+            return _div(du, v)
+        return _div(_sub(_mul(du, v), _mul(u, dv)), _pow(v, _number(2)))
+
+    # Power
+    if not _depends_on_x(v):
+        # (u^n)' = n u^(n-1) u'
+        exponent = _number(ast.literal_eval(v) - 1) if _is_number(v) else _sub(v, _number(1))
+        return _mul(_mul(v, _pow(u, exponent)), du)
+    if not _depends_on_x(u):
+        # (a^v)' = a^v ln(a) v'
+        return _mul(_mul(node, _call('log', u)), dv)
+    # (u^v)' = u^v (v' ln(u) + v u' / u)
+    return _mul(node, _add(_mul(dv, _call('log', u)), _div(_mul(v, du), u)))
+
+
+def symbolic_derivative(text):
+    """d/dx of an expression, as expression text"""
+    tree = parse_expression(text)
+    try:
+        return ast.unparse(_differentiate(tree.body))
+    except RecursionError:
+        raise _too_deep(text) from None
+
+
+# ========================================
+# COMPILED EXPRESSIONS
+# ========================================
+
+class CompiledExpression:
+    """
+    A checked expression compiled once into a python function of x
+
+    f = compile_expression("sin(x)*exp(-x**2)")
+    f(np.linspace(0, 1, 5))    # works on whole arrays (numpy functions)
+    f.derivative(0.5)          # exact derivative, also compiled
+
+    Works with plain numbers, numpy arrays, complex numbers (complex
+    step) and dual numbers, so every differentiation method can use it.
+    """
+
+    def __init__(self, text):
+        tree = parse_expression(text)
+        try:
+            self.text = ast.unparse(tree)
+            self.function = self._compile(tree.body)
+        except RecursionError:
+            raise _too_deep(text) from None
+        self._derivative = None
+
+    @staticmethod
+    def _compile(body):
+        # ast of the expression -> python function of x
+
+        # Whole numbers become floats, so 9**9**9 overflows quickly
+        # instead of building a giant python integer
+        for node in ast.walk(body):
+            if isinstance(node, ast.Constant) and type(node.value) is int:
+                node.value = float(node.value)
+
+        if not _depends_on_x(body):
+            # Constant expression: still return one value per x
+            body = ast.BinOp(body, ast.Add(), ast.BinOp(_number(0.0), ast.Mult(), ast.Name(VARIABLE, ast.Load())))
+
+        function = ast.Expression(ast.Lambda(
+            ast.arguments(posonlyargs=[], args=[ast.arg(VARIABLE)], kwonlyargs=[],
+                          kw_defaults=[], defaults=[]),
+            body))
+        code = compile(ast.fix_missing_locations(function), '<expression>', 'eval')
+
+        # _check already made sure only whitelisted names are used
+        namespace = {**FUNCTIONS, **CONSTANTS}
+        return eval(code, namespace)
+
+    def __call__(self, x):
+        if isinstance(x, (list, tuple)):
+            x = np.asarray(x, dtype=float)
+        return self.function(x)
+
+    @property
+    def derivative(self):
+        """The symbolic derivative, compiled the first time it's needed"""
+        if self._derivative is None:
+            self._derivative = compile_expression(symbolic_derivative(self.text))
+        return self._derivative
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+def _cached(key):
+    # Cache hit moves to the back, so it is the last one to be dropped
+    compiled = _expression_cache.pop(key, None)
+    if compiled is not None:
+        _expression_cache[key] = compiled
+    return compiled
+
+
+def _remember(key, compiled):
+    _expression_cache[key] = compiled
+
+    # Drop the least recently used entry when the cache is full
+    if len(_expression_cache) > EXPRESSION_CACHE_SIZE:
+        del _expression_cache[next(iter(_expression_cache))]
+
+
+def compile_expression(text):
+    """
+    Compiled function for an expression, from the cache when possible
+
+    The text exactly as typed is looked up first, so a repeat costs one
+    dict lookup and no parsing. Only on a miss is it parsed and
+    normalized, and the normalized text is looked up too, so 'x^2' and
+    'x ** 2' still share one compiled function.
+    Raises ValueError for a bad expression.
+    """
+    compiled = _cached(text)
+    if compiled is not None:
+        return compiled
+
+    key = normalize_expression(text)
+    compiled = _cached(key) or CompiledExpression(key)
+    _remember(key, compiled)
+    if text != key:
+        _remember(text, compiled)
+
+    return compiled
+
+
+def clear_expression_cache():
+    """Forget every compiled expression"""
+    _expression_cache.clear()
@@ -0,0 +1,192 @@
+"""
+FINITE DIFFERENCE ENGINE
+Derivatives of any vectorized function at many points at once
+"""
+
+import numpy as np
+
+# Stencil offsets (in steps of h) for the first derivative
+STENCIL_OFFSETS = {
+    'forward':   [0, 1],
+    'backward':  [-1, 0],
+    'central':   [-1, 1],
+    'central4':  [-2, -1, 1, 2],          # 4-point, error ~ h⁴
+    'central6':  [-3, -2, -1, 1, 2, 3],   # 6-point, error ~ h⁶
+}
+
+
+# ========================================
+# STENCIL WEIGHTS
+# ========================================
+
+def stencil_weights(offsets, order=1):
+    """
+    Weights w so that f^(order)(x) ≈ sum(w[i] * f(x + offsets[i]*h)) / h^order
+
+    Found by making the stencil exact for 1, t, t², ... (Taylor series),
+    which is a small Vandermonde system.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    k = len(offsets)
+    if order >= k:
+        raise ValueError(f"Need more than {order} points for derivative order {order}")
+
+    # Row p: sum(w * offsets^p) = p! if p == order else 0
+    V = np.vander(offsets, k, increasing=True).T
+    rhs = np.zeros(k)
+    rhs[order] = np.prod(np.arange(1, order + 1))
+    return np.linalg.solve(V, rhs)
+
+
+# Precomputed weights for the named stencils
+STENCILS = {name: (np.asarray(offsets, dtype=float), stencil_weights(offsets))
+            for name, offsets in STENCIL_OFFSETS.items()}
+
+
+# ========================================
+# DERIVATIVE
+# ========================================
+
+def derivative(f, x, h=1e-5, method='central'):
+    """
+    Numerical first derivative of f at every point in x
+
+    f: vectorized function (works on numpy arrays, like np.sin)
+    x: one number or an array of points
+    h: step size (one number, or one per point)
+    method: 'forward', 'backward', 'central', 'central4', 'central6'
+            or a list of custom offsets
+
+    All stencil points for all x are built into one array, so f is
+    called exactly once - a million points is one numpy call.
+    """
+    if isinstance(method, str):
+        if method not in STENCILS:
+            raise ValueError(f"Unknown method: {method}")
+        offsets, weights = STENCILS[method]
+    else:
+        offsets = np.asarray(method, dtype=float)
+        weights = stencil_weights(offsets)
+
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+
+    # Shape (..., number of stencil points): every x with every offset
+    points = x[..., np.newaxis] + h[..., np.newaxis] * offsets
+    values = f(points)
+
+    result = (values @ weights) / h
+    return result[()]  # Plain number when x was a single number
+
+
+def function_evaluations(x, method='central'):
+    """How many times f is evaluated for derivative(f, x, method=method)"""
+    if method == 'complex':
+        return np.size(x)
+    points = len(STENCILS[method][0]) if isinstance(method, str) else len(method)
+    return np.size(x) * points
+
+
+# ========================================
+# COMPLEX STEP
+# ========================================
+
+def complex_step_derivative(f, x, h=1e-20):
+    """
+    First derivative from one complex evaluation: f'(x) ≈ Im f(x + ih) / h
+
+    Taylor: f(x + ih) = f(x) + ih f'(x) - h² f''(x)/2 - ...
+    so the imaginary part is h f'(x) with no subtraction at all - there
+    is no cancellation and h can be tiny (1e-20), giving machine precision.
+
+    f must be real-analytic and written with numpy functions that accept
+    complex numbers (np.sin, np.exp, **, ...). abs(), comparisons and
+    np.real break it.
+    """
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+    values = np.asarray(f(x + 1j * h))
+    result = values.imag / h
+    return result[()]
+
+
+# ========================================
+# ADAPTIVE STEP SIZE (RICHARDSON EXTRAPOLATION)
+# ========================================
+
+# (offsets, weights, error power) for the base difference of the tableau
+RICHARDSON_BASE = {
+    'central':  ([-1, 1], [-0.5, 0.5], 2),   # error ~ h², h⁴, h⁶, ...
+    'forward':  ([0, 1], [-1.0, 1.0], 1),    # error ~ h, h², h³, ...
+    'backward': ([-1, 0], [-1.0, 1.0], 1),
+}
+
+
+def adaptive_derivative(f, x, h=None, method='central', tol=1e-10, max_levels=12, ratio=2.0):
+    """
+    Derivative with automatic step size (Richardson / Romberg tableau)
+
+    Starts at step h and divides it by ratio each level. Each new row of
+    the tableau cancels one more error term of the level above, and the
+    difference between diagonal entries is the error estimate. It stops
+    when that estimate is below tol (relative to the derivative), or when
+    round-off makes it grow again.
+
+    f(x + offset) values are memoized by offset, so a point shared by
+    several levels (like f(x) itself for forward differences) is only
+    evaluated once.
+
+    Returns: (derivative, error_estimate, evaluations)
+    - evaluations: total number of f values computed (all x together)
+    """
+    offsets, weights, power = RICHARDSON_BASE[method]
+    x = np.asarray(x, dtype=float)
+    if h is None:
+        h = 0.1 * np.maximum(1.0, np.abs(x))
+    h = np.asarray(h, dtype=float)
+
+    cache = {}
+    evaluations = 0
+
+    def f_shifted(offset, step_level):
+        # f(x + offset * h / ratio^level), computed once per distinct shift
+        nonlocal evaluations
+        key = offset / ratio**step_level
+        if key not in cache:
+            cache[key] = f(x + key * h)
+            evaluations += x.size
+        return cache[key]
+
+    best = None
+    best_error = np.full(x.shape, np.inf)
+    growing = 0
+    previous_row = None
+
+    for level in range(max_levels):
+        step = h / ratio**level
+        row = [sum(w * f_shifted(o, level) for o, w in zip(offsets, weights)) / step]
+
+        # Richardson: remove the next error term using the row above
+        for j in range(1, level + 1):
+            factor = ratio**(power * j)
+            row.append(row[j - 1] + (row[j - 1] - previous_row[j - 1]) / (factor - 1))
+
+        if level == 0:
+            best = row[0]
+        else:
+            error = np.abs(row[-1] - previous_row[-1])
+            better = error < best_error
+            best = np.where(better, row[-1], best)
+            best_error = np.where(better, error, best_error)
+
+            if np.all(best_error <= tol * np.maximum(1.0, np.abs(best))):
+                break
+
+            # Error went up two levels in a row everywhere: round-off has taken over
+            growing = 0 if np.any(better) else growing + 1
+            if growing >= 2:
+                break
+
+        previous_row = row
+
+    return best[()], best_error[()], evaluations
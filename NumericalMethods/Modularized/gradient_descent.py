@@ -0,0 +1,254 @@
+"""
+ITERATIVE REGRESSION ENGINE
+Gradient descent for least squares: full batch, mini-batch, stochastic,
+with plain steps, Momentum or Adam, and early stopping
+"""
+
+import numpy as np
+
+MODES = ('batch', 'minibatch', 'stochastic')
+OPTIMIZERS = ('sgd', 'momentum', 'adam')
+
+
+# ========================================
+# LOSS AND GRADIENT
+# ========================================
+
+def mse_and_gradient(X, y, weights):
+    """
+    Mean squared error of X @ weights against y, and its gradient
+
+    gradient = 2/n Xᵀ(X w - y) - two matrix-vector products, no loops
+    """
+    errors = X @ weights - y
+    loss = errors @ errors / len(y)
+    gradient = (2.0 / len(y)) * (X.T @ errors)
+    return loss, gradient
+
+
+def data_loss(X, y, weights, chunk_rows=1_000_000):
+    """Mean squared error measured on the data, chunk by chunk (one O(n d) pass)"""
+    total = 0.0
+    for start in range(0, len(y), chunk_rows):
+        errors = X[start:start + chunk_rows] @ weights - y[start:start + chunk_rows]
+        total += errors @ errors
+    return total / len(y)
+
+
+class _GramGradient:
+    """
+    Full-batch gradient from G = XᵀX/n and c = Xᵀy/n
+
+    These are summed in one pass over the data; after that every
+    gradient 2 (G w - c) costs O(d²) instead of O(n d), whatever n is.
+    The loss itself is not taken from G and c (wᵀGw - 2wᵀc + yᵀy/n
+    loses everything to round-off near the answer): it is measured on
+    the data with data_loss when it is needed.
+    """
+
+    def __init__(self, X, y, chunk_rows=1_000_000):
+        n, d = X.shape
+        self.G = np.zeros((d, d))
+        self.c = np.zeros(d)
+        for start in range(0, n, chunk_rows):
+            X_part, y_part = X[start:start + chunk_rows], y[start:start + chunk_rows]
+            self.G += X_part.T @ X_part
+            self.c += X_part.T @ y_part
+        self.G /= n
+        self.c /= n
+
+    def gradient(self, weights):
+        return 2 * (self.G @ weights - self.c)
+
+    def change(self, gradient, direction, step):
+        """
+        loss(w - step*direction) - loss(w), exact for the squared error
+
+        = -step gᵀd + step² dᵀG d, with no big numbers to subtract,
+        so the line search can compare steps without a pass over the data
+        """
+        return -step * (gradient @ direction) + step * step * (direction @ self.G @ direction)
+
+
+# ========================================
+# OPTIMIZER STEPS
+# ========================================
+
+class _Optimizer:
+    # Turns a gradient into a step, remembering what the method needs
+
+    def __init__(self, name, size, learning_rate, momentum, beta1, beta2, epsilon):
+        if name not in OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer: {name}")
+        self.name = name
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self.beta1, self.beta2, self.epsilon = beta1, beta2, epsilon
+        self.velocity = np.zeros(size)   # momentum: running direction, adam: mean of g
+        self.scale = np.zeros(size)      # adam: mean of g²
+        self.steps = 0
+
+    def direction(self, gradient):
+        """Step to subtract from the weights, before the learning rate"""
+        self.steps += 1
+        if self.name == 'sgd':
+            return gradient
+        if self.name == 'momentum':
+            # Keep rolling in the direction we were already going
+            self.velocity = self.momentum * self.velocity + gradient
+            return self.velocity
+        # Adam: averages of g and g², corrected for starting at 0
+        self.velocity = self.beta1 * self.velocity + (1 - self.beta1) * gradient
+        self.scale = self.beta2 * self.scale + (1 - self.beta2) * gradient**2
+        mean = self.velocity / (1 - self.beta1**self.steps)
+        spread = self.scale / (1 - self.beta2**self.steps)
+        return mean / (np.sqrt(spread) + self.epsilon)
+
+
+def _line_search(objective, weights, gradient, direction, step, shrink=0.5, c=1e-4, max_halvings=50):
+    # Backtracking (Armijo): halve the step until the loss goes down enough
+    slope = gradient @ direction
+    for _ in range(max_halvings):
+        if objective.change(gradient, direction, step) <= -c * step * slope:
+            return weights - step * direction, step
+        step *= shrink
+    return weights, step
+
+
+def _batches(X, y, rows, batch_size):
+    # The rows of one epoch gathered in one go, then cut into consecutive batch views
+    X_rows, y_rows = X[rows], y[rows]
+    for start in range(0, len(rows), batch_size):
+        yield X_rows[start:start + batch_size], y_rows[start:start + batch_size]
+
+
+# ========================================
+# FITTING
+# ========================================
+
+def fit_iterative(X, y, mode='batch', optimizer='sgd', learning_rate=0.01, max_epochs=1000,
+                  batch_size=32, momentum=0.9, beta1=0.9, beta2=0.999, epsilon=1e-8,
+                  line_search=False, gradient_tol=1e-8, loss_tol=1e-12, loss_every=10,
+                  weights=None, seed=0, callback=None):
+    """
+    Least-squares weights (minimize mean((X @ w - y)²)) by gradient descent
+
+    mode: 'batch'      one step per epoch using all rows (the data is read once
+                       into XᵀX and Xᵀy, then each gradient is tiny - see _GramGradient)
+          'minibatch'  shuffled groups of batch_size rows, every row once per epoch
+          'stochastic' batch_size rows drawn at random (with replacement) for every
+                       step, len(y) / batch_size steps per epoch
+    Each mini-batch gradient is a couple of numpy matrix products on a block
+    of rows; batch_size=1 gives classic one-row SGD but pays python overhead
+    for every row, so keep it in the tens or hundreds for millions of rows.
+    optimizer: 'sgd', 'momentum' or 'adam'
+    line_search: pick each step length by backtracking (batch mode only)
+    gradient_tol: stop when the full gradient is that small (converged)
+    loss_tol: also stop when the measured loss changed less than loss_tol
+        (relative) since it was last measured
+    loss_every: batch mode measures the loss on the data every loss_every
+        epochs (one pass each), the other modes every epoch
+    callback: called as callback(epoch, weights, loss) whenever the loss is measured
+
+    Returns: (weights, info)
+    - info['losses']: every measured loss, info['loss_epochs']: the epochs they belong to
+    - info['epochs'], info['converged'], info['reason'], info['gradient_norm']
+    - info['converged'] is only True when the gradient test passed: a loss_tol stop
+      means the loss stopped moving, which on badly scaled data can happen far
+      from the answer
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    if line_search and mode != 'batch':
+        raise ValueError("line_search needs mode='batch'")
+
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, d = X.shape
+    weights = np.zeros(d) if weights is None else np.array(weights, dtype=float)
+
+    rng = np.random.default_rng(seed)
+    stepper = _Optimizer(optimizer, d, learning_rate, momentum, beta1, beta2, epsilon)
+
+    objective = _GramGradient(X, y) if mode == 'batch' else None
+    every = max(1, loss_every) if mode == 'batch' else 1
+
+    losses = np.empty(max_epochs // every + 2)
+    loss_epochs = np.empty(len(losses), dtype=int)
+    measured = 0
+    step = learning_rate
+    reason = 'max_epochs'
+    epoch = 0
+
+    # Overflow just means it diverged, which is reported in info
+    with np.errstate(over='ignore', invalid='ignore'):
+        for epoch in range(max_epochs + 1):
+            # Full gradient at the current weights (also the batch-mode step)
+            if objective is not None:
+                gradient = objective.gradient(weights)
+                loss = None
+            else:
+                loss, gradient = mse_and_gradient(X, y, weights)
+            gradient_norm = np.linalg.norm(gradient)
+
+            if not np.isfinite(gradient_norm):
+                reason = 'diverged (try a smaller learning rate)'
+            elif gradient_norm <= gradient_tol:
+                reason = 'gradient_tol'
+            last = reason != 'max_epochs' or epoch == max_epochs
+
+            # The loss, from the data: every epoch it's measured, and always the last one
+            if last or epoch % every == 0:
+                if loss is None:
+                    loss = data_loss(X, y, weights)
+                losses[measured], loss_epochs[measured] = loss, epoch
+                measured += 1
+                if callback is not None:
+                    callback(epoch, weights, loss)
+                if not last and not np.isfinite(loss):
+                    reason, last = 'diverged (try a smaller learning rate)', True
+                elif (not last and measured > 1
+                      and abs(losses[measured - 2] - loss) <= loss_tol * max(1.0, loss)):
+                    reason, last = 'loss_tol', True
+            if last:
+                break
+
+            if mode == 'batch':
+                direction = stepper.direction(gradient)
+                if line_search:
+                    # Try a bit longer than last time, then backtrack
+                    weights, step = _line_search(objective, weights, gradient, direction, 2 * step)
+                else:
+                    weights = weights - learning_rate * direction
+            else:
+                if mode == 'minibatch':
+                    rows = rng.permutation(n)
+                else:
+                    rows = rng.integers(0, n, size=max(n // batch_size, 1) * batch_size)
+                for X_batch, y_batch in _batches(X, y, rows, batch_size):
+                    _, batch_gradient = mse_and_gradient(X_batch, y_batch, weights)
+                    weights = weights - learning_rate * stepper.direction(batch_gradient)
+
+    info = {
+        'mode': mode,
+        'optimizer': optimizer,
+        'epochs': epoch,
+        'losses': losses[:measured],
+        'loss_epochs': loss_epochs[:measured],
+        'gradient_norm': float(gradient_norm),
+        'converged': reason == 'gradient_tol',
+        'reason': reason,
+    }
+    return weights, info
+
+
+def fit_line_iterative(x_points, y_points, **options):
+    """
+    Best line y = mx + b by gradient descent (options as fit_iterative)
+
+    Returns: (m, b, info)
+    """
+    x = np.asarray(x_points, dtype=float)
+    X = np.column_stack([x, np.ones_like(x)])
+    weights, info = fit_iterative(X, y_points, **options)
+    return weights[0], weights[1], info
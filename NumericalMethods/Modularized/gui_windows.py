@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import messagebox
 from numerical_core import *
 from plotting import *
+from expressions import compile_expression
+from cross_validation import select_degree
 
 # ========================================
 # GAUSSIAN ELIMINATION WINDOW
@@ -28,6 +30,15 @@ def create_gaussian_window(parent_gui):
     num_vars = tk.Entry(window)
     num_vars.pack()
     
+    # Solving mode
+    mode = tk.StringVar(value="double")
+    mode_frame = tk.Frame(window)
+    mode_frame.pack(pady=5)
+    tk.Radiobutton(mode_frame, text="Double precision",
+                  variable=mode, value="double").pack(side="left")
+    tk.Radiobutton(mode_frame, text="Mixed precision (float32 + refinement)",
+                  variable=mode, value="mixed").pack(side="left")
+    
     # Scrollable frame for equation inputs
     canvas = tk.Canvas(window, height=300)
     scrollbar = tk.Scrollbar(window, orient="vertical", command=canvas.yview)
@@ -98,13 +109,21 @@ def create_gaussian_window(parent_gui):
                 answers.append(answer)
             
             # Solve using our function
-            solution = solve_gaussian(equations, answers)
+            # (double mode is cached, so re-solving the same equations skips elimination)
+            solution, info = solve_gaussian(equations, answers, use_cache=True,
+                                            mode=mode.get(), return_info=True)
             
             if solution is not None:
                 parent_gui.log_output("\nSOLUTION:")
                 for i, val in enumerate(solution):
                     var = chr(120 + i)
                     parent_gui.log_output(f"  {var} = {val:.4f}")
+                
+                if 'backward_error' in info:
+                    parent_gui.log_output(f"\nBackward error: {info['backward_error']:.2e}")
+                    parent_gui.log_output(f"Refinement steps: {info['refinements']}")
+                    if info['fell_back']:
+                        parent_gui.log_output("Refinement stalled - used full float64 solve")
                 messagebox.showinfo("Success", "Solution found! Check output below.")
             else:
                 messagebox.showerror("Error", "Cannot solve system!")
@@ -130,15 +149,20 @@ def create_differentiation_window(parent_gui):
     """Create window for numerical differentiation"""
     parent_gui.clear_output()
     parent_gui.log_output("=== NUMERICAL DIFFERENTIATION ===\n")
-    parent_gui.log_output("Function: f(x) = x² + 2x + 1\n")
+    parent_gui.log_output("Type any f(x), e.g. sin(x)*exp(-x**2)\n")
     
     window = tk.Toplevel(parent_gui.root)
     window.title("Numerical Differentiation")
-    window.geometry("300x250")
+    window.geometry("300x380")
     
     tk.Label(window, text="Numerical Differentiation", 
             font=("Arial", 14, "bold")).pack(pady=10)
     
+    tk.Label(window, text="f(x):").pack()
+    f_entry = tk.Entry(window, width=30)
+    f_entry.insert(0, "x**2 + 2*x + 1")
+    f_entry.pack()
+    
     tk.Label(window, text="x value:").pack()
     x_entry = tk.Entry(window)
     x_entry.pack()
@@ -150,16 +174,19 @@ def create_differentiation_window(parent_gui):
     
     def calculate():
         try:
+            # Compiled once, then reused from the cache on every click
+            f = compile_expression(f_entry.get())
             x = float(x_entry.get())
             h = float(h_entry.get())
             
             # Calculate using different methods
-            forward = differentiate_function(x, h, 'forward')
-            central = differentiate_function(x, h, 'central')
-            backward = differentiate_function(x, h, 'backward')
-            exact = exact_derivative(x)
+            forward = differentiate_function(x, h, 'forward', f)
+            central = differentiate_function(x, h, 'central', f)
+            backward = differentiate_function(x, h, 'backward', f)
+            exact = f.derivative(x)
             
-            parent_gui.log_output(f"\nx = {x}, h = {h}")
+            parent_gui.log_output(f"\nf(x) = {f.text}, f'(x) = {f.derivative.text}")
+            parent_gui.log_output(f"x = {x}, h = {h}")
             parent_gui.log_output(f"Exact derivative: {exact:.6f}")
             parent_gui.log_output(f"Forward difference: {forward:.6f}")
             parent_gui.log_output(f"Backward difference: {backward:.6f}")
@@ -170,8 +197,41 @@ def create_differentiation_window(parent_gui):
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
+    def calculate_adaptive():
+        try:
+            f = compile_expression(f_entry.get())
+            x = float(x_entry.get())
+            
+            # No h needed: Richardson extrapolation picks the steps itself
+            derivative, error, evaluations = differentiate_adaptive(x, f=f)
+            exact = f.derivative(x)
+            
+            parent_gui.log_output(f"\nf(x) = {f.text}")
+            parent_gui.log_output(f"x = {x}, adaptive step size (Richardson)")
+            parent_gui.log_output(f"Exact derivative: {exact:.6f}")
+            parent_gui.log_output(f"Adaptive central: {derivative:.10f}")
+            parent_gui.log_output(f"Error estimate: {error:.2e}")
+            parent_gui.log_output(f"Function evaluations: {evaluations}")
+            
+            messagebox.showinfo("Done", "Results shown in output!")
+            
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
+    def show_plot():
+        try:
+            f = compile_expression(f_entry.get())
+            x = float(x_entry.get())
+            plot_function(f, x, f.derivative(x))
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
     tk.Button(window, text="Calculate", command=calculate,
              bg="#2196F3", fg="white").pack(pady=10)
+    tk.Button(window, text="Adaptive (automatic h)", command=calculate_adaptive,
+             bg="#2196F3", fg="white").pack()
+    tk.Button(window, text="Plot f(x) and tangent", command=show_plot,
+             bg="#4CAF50", fg="white").pack(pady=10)
 
 
 # ========================================
@@ -252,7 +312,7 @@ def create_polynomial_window(parent_gui):
     
     window = tk.Toplevel(parent_gui.root)
     window.title("Polynomial Regression")
-    window.geometry("500x450")
+    window.geometry("500x500")
     
     tk.Label(window, text="Polynomial Regression", 
             font=("Arial", 14, "bold")).pack(pady=10)
@@ -312,9 +372,45 @@ def create_polynomial_window(parent_gui):
         except Exception as e:
             messagebox.showerror("Error", f"Invalid input: {str(e)}")
     
+    def auto_degree():
+        try:
+            x = [float(val.strip()) for val in x_entry.get().strip().split(',')]
+            y = [float(val.strip()) for val in y_entry.get().strip().split(',')]
+            
+            if len(x) != len(y):
+                messagebox.showerror("Error", "X and Y must have same number of points!")
+                return
+            
+            if len(x) < 4:
+                messagebox.showerror("Error", "Need at least 4 points for cross-validation!")
+                return
+            
+            # Leave-one-out for small data (exact, no refits), 5-fold for big data
+            method = 'loo' if len(x) <= 1000 else 'kfold'
+            degree, curves = select_degree(x, y, max_degree=10, method=method)
+            coeffs, poly = polynomial_regression(x, y, degree)
+            
+            parent_gui.log_output(f"Data points: {len(x)}, cross-validation: {method}")
+            for d, error in zip(curves['degrees'], curves['cv_error']):
+                parent_gui.log_output(f"  Degree {d}: CV error = {error:.6g}")
+            parent_gui.log_output(f"Best degree: {degree}")
+            parent_gui.log_output(f"Degree {degree}: {poly}")
+            
+            degree_entry.delete(0, tk.END)
+            degree_entry.insert(0, str(degree))
+            
+            plot_cv_curve(curves['degrees'], curves['cv_error'], degree)
+            plot_polynomial_regression(x, y, degree, poly)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Invalid input: {str(e)}")
+    
     tk.Button(window, text="Calculate & Plot",
              command=process_data, bg="#9C27B0", fg="white",
-             width=20, height=2).pack(pady=20)
+             width=20, height=2).pack(pady=(20, 5))
+    tk.Button(window, text="Best Degree (Cross-Validation)",
+             command=auto_degree, bg="#9C27B0", fg="white",
+             width=25).pack(pady=5)
     
     tk.Label(window, text="Tip: Try degree=1 for line, degree=2 for parabola",
             font=("Arial", 9, "italic")).pack()
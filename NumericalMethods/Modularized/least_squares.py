@@ -0,0 +1,135 @@
+"""
+LEAST SQUARES FOR NON-SQUARE SYSTEMS
+More equations than unknowns (tall) or fewer (wide)
+"""
+
+import numpy as np
+
+
+# ========================================
+# SMALL IN-MEMORY SYSTEMS
+# ========================================
+
+def least_squares(equations, answers, rcond=None):
+    """
+    Best answer for any shape of system
+
+    Tall (more equations): the x with the smallest error ||A x - b||
+    Wide (fewer equations) or rank deficient: the smallest x that fits
+
+    Returns: (solution, rank, residual)
+    - rank: how many equations are really independent
+    - residual: ||A x - b|| for the returned x
+    """
+    A = np.asarray(equations, dtype=float)
+    b = np.asarray(answers, dtype=float)
+
+    solution, _, rank, _ = np.linalg.lstsq(A, b, rcond=rcond)
+    residual = np.linalg.norm(A @ solution - b)
+    return solution, int(rank), float(residual)
+
+
+# ========================================
+# TSQR - STREAMING QR FOR TALL SYSTEMS
+# ========================================
+
+def _block_r(A_block, b_block):
+    # R factor of [A | b] for one block of rows, (d+1) x (d+1) at most
+    augmented = np.column_stack([A_block, b_block])
+    return np.linalg.qr(augmented, mode='r')
+
+
+def combine_r(R_top, R_bottom):
+    """
+    Merge the R factors of two row blocks
+
+    QR of [A1; A2] has the same R as QR of [R1; R2], so only the small
+    R matrices are needed, never the rows themselves.
+    """
+    return np.linalg.qr(np.vstack([R_top, R_bottom]), mode='r')
+
+
+def solve_from_r(R, rcond=None):
+    """
+    Least-squares answer from the R factor of [A | b]
+
+    R = [[R11, z], [0, rho]]: solve R11 x = z, and |rho| is the residual
+    """
+    d = R.shape[1] - 1
+    R11 = R[:d, :d]
+    z = R[:d, d]
+    rho = R[d, d] if R.shape[0] > d else 0.0
+
+    # lstsq on the small d x d system handles rank deficiency (minimum-norm x)
+    solution, _, rank, _ = np.linalg.lstsq(R11, z, rcond=rcond)
+
+    # Rank-deficient R11 leaves part of z unexplained, add that to the residual
+    extra = np.linalg.norm(R11 @ solution - z)
+    residual = np.hypot(rho, extra)
+    return solution, int(rank), float(residual)
+
+
+def tsqr_least_squares(row_blocks, rcond=None):
+    """
+    Least squares for a tall system given as blocks of rows
+
+    row_blocks: iterable of (A_block, b_block), e.g. read from a file
+    Only one block and one small R are in memory at a time.
+
+    Returns: (solution, rank, residual)
+    """
+    R = None
+    for A_block, b_block in row_blocks:
+        R_block = _block_r(np.asarray(A_block, dtype=float), np.asarray(b_block, dtype=float))
+        R = R_block if R is None else combine_r(R, R_block)
+
+    if R is None:
+        raise ValueError("No rows given")
+
+    return solve_from_r(R, rcond)
+
+
+def _reduce_npy_rows(a_path, b_path, start, stop, chunk_rows):
+    # Worker: R factor of rows start..stop of the .npy files (opened as memmaps)
+    A = np.load(a_path, mmap_mode='r')
+    b = np.load(b_path, mmap_mode='r')
+
+    blocks = ((A[i:min(i + chunk_rows, stop)], b[i:min(i + chunk_rows, stop)])
+              for i in range(start, stop, chunk_rows))
+
+    R = None
+    for A_block, b_block in blocks:
+        R_block = _block_r(np.asarray(A_block, dtype=float), np.asarray(b_block, dtype=float))
+        R = R_block if R is None else combine_r(R, R_block)
+    return R
+
+
+def tsqr_least_squares_npy(a_path, b_path, chunk_rows=100_000, workers=1, rcond=None):
+    """
+    Least squares for a tall system stored in .npy files
+
+    a_path: (rows, d) coefficient matrix, b_path: (rows,) answers
+    The rows are split into one range per worker; each worker streams
+    its range in chunks and sends back just its R factor, which are
+    then merged here. The full matrix is never loaded.
+
+    Returns: (solution, rank, residual)
+    """
+    rows = np.load(a_path, mmap_mode='r').shape[0]
+    ranges = np.linspace(0, rows, workers + 1).astype(int)
+    tasks = [(a_path, b_path, start, stop, chunk_rows)
+             for start, stop in zip(ranges[:-1], ranges[1:]) if stop > start]
+
+    if workers == 1:
+        R_parts = [_reduce_npy_rows(*task) for task in tasks]
+    else:
+        # Only loaded when worker processes are really used
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            R_parts = list(pool.map(_reduce_npy_rows, *zip(*tasks)))
+
+    R = R_parts[0]
+    for R_part in R_parts[1:]:
+        R = combine_r(R, R_part)
+
+    return solve_from_r(R, rcond)
@@ -0,0 +1,317 @@
+"""
+LU FACTORIZATION - FACTOR ONCE, SOLVE MANY TIMES
+"""
+
+import hashlib
+import numpy as np
+
+# How many factorizations lu_factor() remembers
+LU_CACHE_SIZE = 32
+
+# matrix key -> LUFactorization (oldest entry first)
+_lu_cache = {}
+
+
+# Panel width for the blocked factorization (None = one column at a time)
+BLOCK_SIZE = 128
+
+# Panels narrower than this are eliminated column by column
+PANEL_LEAF = 16
+
+
+# ========================================
+# ELIMINATION ROUTINES
+# ========================================
+
+def factor_panel(A, perm, start, end, tiny):
+    """
+    Eliminate columns start..end-1 of A in place (partial pivoting)
+
+    Only columns start..end-1 of the rows below are updated, the caller
+    updates the rest of the matrix. Row swaps move whole rows of A and
+    are recorded in perm.
+
+    Wide panels are split in half: the left half is factored, the right
+    half updated with one matrix product, then factored - so most of the
+    panel work is a matmul too, not one outer product per column.
+
+    Returns: False if a pivot is not bigger than tiny (singular), else True
+    """
+    if end - start > PANEL_LEAF:
+        mid = (start + end) // 2
+        if not factor_panel(A, perm, start, mid, tiny):
+            return False
+        L11 = np.tril(A[start:mid, start:mid], -1) + np.eye(mid - start, dtype=A.dtype)
+        A[start:mid, mid:end] = np.linalg.solve(L11, A[start:mid, mid:end])
+        A[mid:, mid:end] -= A[mid:, start:mid] @ A[start:mid, mid:end]
+        return factor_panel(A, perm, mid, end, tiny)
+
+    for i in range(start, end):
+        # Partial pivoting: biggest entry in this column goes on the diagonal
+        p = i + np.argmax(np.abs(A[i:, i]))
+        if abs(A[p, i]) <= tiny:
+            return False
+
+        if p != i:
+            A[[i, p]] = A[[p, i]]
+            perm[[i, p]] = perm[[p, i]]
+
+        # Whole column of multipliers at once, then one outer product instead of a row loop
+        A[i + 1:, i] /= A[i, i]
+        A[i + 1:, i + 1:end] -= np.outer(A[i + 1:, i], A[i, i + 1:end])
+
+    return True
+
+
+def lu_decompose(A, block_size=None):
+    """
+    Factor A in place into P*A = L*U with partial pivoting
+
+    L (unit diagonal) is stored below the diagonal, U on and above it.
+    block_size=None: one column at a time (rank-1 updates)
+    block_size=nb:   panels of nb columns, the trailing matrix is updated
+                     with one matrix product per panel (BLAS-3, much faster)
+    Works in the precision of A (float64 or float32).
+
+    Returns: perm (perm[i] = original row now at row i), or None if singular
+    """
+    n = A.shape[0]
+    perm = np.arange(n)
+
+    # Pivots this small compared to the biggest entry are treated as zero
+    tiny = np.finfo(A.dtype).eps * n * (np.abs(A).max() if A.size else 1.0)
+
+    if block_size is None or block_size >= n:
+        return perm if factor_panel(A, perm, 0, n, tiny) else None
+
+    for k in range(0, n, block_size):
+        end = min(k + block_size, n)
+
+        # Factor the tall panel A[k:, k:end], row swaps are applied to whole rows
+        if not factor_panel(A, perm, k, end, tiny):
+            return None
+
+        if end == n:
+            break
+
+        # U12 = inv(L11) * A12, L11 is the small unit lower triangle of the panel
+        L11 = np.tril(A[k:end, k:end], -1) + np.eye(end - k, dtype=A.dtype)
+        A[k:end, end:] = np.linalg.solve(L11, A[k:end, end:])
+
+        # Trailing update A22 = A22 - L21*U12, this is where nearly all the flops are
+        A[end:, end:] -= A[end:, k:end] @ A[k:end, end:]
+
+    return perm
+
+
+def lu_solve(LU, perm, answers, block_size=BLOCK_SIZE):
+    """
+    Forward then back substitution with the factors from lu_decompose
+
+    answers: vector of shape (n,) or several columns, shape (n, m)
+    Rows are done block_size at a time: the knowns are subtracted with
+    one matrix product, then the small triangle on the diagonal is solved.
+    Returns: solution with the same shape as answers
+    """
+    b = np.asarray(answers)
+    y = b.astype(np.result_type(LU.dtype, b.dtype))[perm]
+    n = LU.shape[0]
+    blocks = range(0, n, block_size or n or 1)
+
+    # Forward substitution with L (ones on the diagonal)
+    for k in blocks:
+        end = min(k + block_size, n) if block_size else n
+        L11 = np.tril(LU[k:end, k:end], -1) + np.eye(end - k, dtype=LU.dtype)
+        y[k:end] = np.linalg.solve(L11, y[k:end] - LU[k:end, :k] @ y[:k])
+
+    # Back substitution with U, last block first
+    for k in reversed(blocks):
+        end = min(k + block_size, n) if block_size else n
+        y[k:end] = np.linalg.solve(np.triu(LU[k:end, k:end]), y[k:end] - LU[k:end, end:] @ y[end:])
+
+    return y
+
+
+# ========================================
+# LU FACTORIZATION OBJECT
+# ========================================
+
+class LUFactorization:
+    """
+    LU factorization with partial pivoting: P*A = L*U
+
+    The expensive O(n³) elimination is done once in __init__.
+    After that, every solve() only needs forward and back
+    substitution, which is O(n²) per answer vector.
+    """
+
+    def __init__(self, equations, dtype=float, block_size=BLOCK_SIZE):
+        """
+        Factor the coefficient matrix
+
+        equations: square coefficient matrix (list of lists or array)
+        dtype: precision of the stored factors (float or np.float32)
+        block_size: panel width for lu_decompose (None = column by column)
+        """
+        LU = np.array(equations, dtype=dtype)  # Copy, we factor in place
+
+        if LU.ndim != 2 or LU.shape[0] != LU.shape[1]:
+            raise ValueError("equations must be a square matrix")
+
+        perm = lu_decompose(LU, block_size)
+        if perm is None:
+            raise np.linalg.LinAlgError("Singular matrix")
+
+        self.LU = LU
+        self.perm = perm
+        self.n = LU.shape[0]
+
+    def solve(self, answers):
+        """
+        Solve A x = answers using the stored factors
+
+        answers: vector of shape (n,) or several columns, shape (n, m)
+        Returns: solution with the same shape as answers
+        """
+        if np.shape(answers)[0] != self.n:
+            raise ValueError(f"answers must have {self.n} rows")
+        return lu_solve(self.LU, self.perm, answers)
+
+    @property
+    def L(self):
+        """Unit lower triangular factor"""
+        return np.tril(self.LU, -1) + np.eye(self.n, dtype=self.LU.dtype)
+
+    @property
+    def U(self):
+        """Upper triangular factor"""
+        return np.triu(self.LU)
+
+
+# ========================================
+# CACHED FACTORIZATION
+# ========================================
+
+def matrix_key(equations, dtype=float):
+    """Content hash of a matrix, used as the cache key"""
+    A = np.ascontiguousarray(equations, dtype=dtype)
+    digest = hashlib.sha1(A.tobytes()).hexdigest()
+    return (A.shape, A.dtype.str, digest)
+
+
+def lu_factor(equations, dtype=float, use_cache=False):
+    """
+    Get an LUFactorization for a coefficient matrix
+
+    With use_cache=True the factorization is stored by the matrix
+    contents, so solving the same system again skips factoring.
+    """
+    if not use_cache:
+        return LUFactorization(equations, dtype)
+
+    key = matrix_key(equations, dtype)
+    if key in _lu_cache:
+        # Move to the back so it is the last one to be dropped
+        factorization = _lu_cache.pop(key)
+        _lu_cache[key] = factorization
+        return factorization
+
+    factorization = LUFactorization(equations, dtype)
+    _lu_cache[key] = factorization
+
+    # Drop the least recently used entry when the cache is full
+    if len(_lu_cache) > LU_CACHE_SIZE:
+        del _lu_cache[next(iter(_lu_cache))]
+
+    return factorization
+
+
+def clear_lu_cache():
+    """Forget every cached factorization"""
+    _lu_cache.clear()
+
+
+# ========================================
+# MIXED PRECISION SOLVE
+# ========================================
+
+def backward_error(A, x, b, residual=None, A_norm=None):
+    """
+    Normwise backward error: ||b - A x|| / (||A|| ||x|| + ||b||)
+    About 1e-16 means x is as good as a float64 answer can be
+
+    residual (b - A x) and A_norm (||A|| in the inf-norm) can be passed
+    in when they are already known, so a refinement loop doesn't
+    recompute them every step.
+    """
+    r = b - A @ x if residual is None else residual
+    if A_norm is None:
+        A_norm = np.linalg.norm(A, np.inf)
+    scale = A_norm * np.linalg.norm(x, np.inf) + np.linalg.norm(b, np.inf)
+    return np.linalg.norm(r, np.inf) / scale if scale else 0.0
+
+
+def solve_mixed_precision(equations, answers, max_refinements=10, tol=None):
+    """
+    Factor in float32, then refine the answer to float64 accuracy
+
+    The O(n³) factorization runs on float32 numbers (half the memory,
+    roughly twice the speed) with the blocked lu_decompose, so nearly
+    all the work is float32 matrix products. Each refinement step
+    computes the residual in float64 and solves for a correction with
+    the float32 factors, which only costs O(n²).
+
+    If refinement stops improving (ill-conditioned matrix), the system
+    is solved again in float64 with np.linalg.solve (LAPACK).
+
+    Returns: (solution, info)
+    - info['backward_error']: final backward error
+    - info['refinements']: refinement steps done
+    - info['fell_back']: True if the float64 fallback was used
+    - info['history']: backward error after each step
+    """
+    A = np.asarray(equations, dtype=float)
+    b = np.asarray(answers, dtype=float)
+    n = A.shape[0]
+
+    if tol is None:
+        tol = np.finfo(float).eps * np.sqrt(n)
+
+    history = []
+    A_norm = np.linalg.norm(A, np.inf)
+
+    try:
+        lu32 = LUFactorization(A, dtype=np.float32, block_size=BLOCK_SIZE)
+    except np.linalg.LinAlgError:
+        # Singular in float32 (maybe not in float64), go straight to the fallback
+        lu32 = None
+
+    if lu32 is not None:
+        x = lu32.solve(b.astype(np.float32)).astype(float)
+
+        for step in range(max_refinements + 1):
+            residual = b - A @ x
+            error = backward_error(A, x, b, residual, A_norm)
+            history.append(error)
+
+            if not np.isfinite(error):
+                break
+            if error <= tol:
+                return x, {'backward_error': error, 'refinements': step,
+                           'fell_back': False, 'history': history}
+            # Stalled: each step should cut the error down a lot
+            if step > 0 and error > 0.5 * history[-2]:
+                break
+            if step == max_refinements:
+                break
+
+            # Correction from the float64 residual, solved with float32 factors
+            x += lu32.solve(residual.astype(np.float32))
+
+    # Refinement didn't converge: pay for a full float64 factorization
+    x = np.linalg.solve(A, b)
+    error = backward_error(A, x, b, A_norm=A_norm)
+    history.append(error)
+    return x, {'backward_error': error, 'refinements': max(len(history) - 2, 0),
+               'fell_back': True, 'history': history}
+
@@ -0,0 +1,212 @@
+"""
+MULTIPLE REGRESSION WITH ANY NUMBER OF FEATURES
+y = w1*x1 + w2*x2 + ... + wd*xd + c, fitted chunk by chunk
+"""
+
+import numpy as np
+from least_squares import combine_r, solve_from_r
+
+METHODS = ('normal', 'qr')
+
+# Default memory for one chunk of rows (bytes)
+MEMORY_BUDGET = 256 * 2**20
+
+
+# ========================================
+# RUNNING STATE
+# ========================================
+
+class MultipleRegressionState:
+    """
+    Sufficient statistics of a linear fit, added to chunk by chunk
+
+    method 'normal': keeps XᵀX and Xᵀy (with a column of ones for the
+                     intercept) - fastest, one matrix product per chunk
+    method 'qr':     keeps the R factor of [X 1 | y] (TSQR, see
+                     least_squares.py) - slower but never squares the
+                     condition number, for nearly dependent features
+
+    Either way the memory used is about d² numbers, whatever the number
+    of rows. Every value is shifted by the first chunk's averages before
+    it is added, so features with big offsets (like years, or prices in
+    the millions) don't wipe out the small differences that matter.
+    """
+
+    def __init__(self, features, method='normal'):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        self.d = features
+        self.method = method
+        self.n = 0
+        self.x_shift = None
+        self.y_shift = 0.0
+
+        # Shifted y: sum and sum of squares, for R² without a second pass
+        self.sum_y = 0.0
+        self.sum_y2 = 0.0
+
+        size = features + 1
+        self.gram = np.zeros((size, size))   # 'normal': [X 1]ᵀ[X 1]
+        self.moment = np.zeros(size)         # 'normal': [X 1]ᵀ y
+        self.R = None                        # 'qr': R of [X 1 | y]
+        self.solver = None                   # what solve() used last time
+        self._weights = None                 # solved (shifted) weights, until the next update
+        self._residual = None                # 'qr': residual norm from the same solve
+
+    def update(self, X, y):
+        """Add a chunk of rows (X: rows x d, y: rows), returns self"""
+        X = np.asarray(X, dtype=float).reshape(len(y), self.d)
+        y = np.asarray(y, dtype=float)
+        if len(y) == 0:
+            return self
+
+        if self.x_shift is None:
+            self.x_shift = X.mean(axis=0)
+            self.y_shift = float(y.mean())
+
+        A = np.empty((len(y), self.d + 1))
+        np.subtract(X, self.x_shift, out=A[:, :self.d])
+        A[:, self.d] = 1.0
+        y = y - self.y_shift
+
+        self._weights = None
+        self.n += len(y)
+        self.sum_y += float(y.sum())
+        self.sum_y2 += float(y @ y)
+
+        if self.method == 'normal':
+            self.gram += A.T @ A
+            self.moment += A.T @ y
+        else:
+            R_block = np.linalg.qr(np.column_stack([A, y]), mode='r')
+            self.R = R_block if self.R is None else combine_r(self.R, R_block)
+        return self
+
+    def _shifted_weights(self):
+        # Weights for the shifted data, solved once and kept until update() is called again
+        if self._weights is not None:
+            return self._weights
+        if self.n == 0:
+            raise ValueError("No rows added yet")
+
+        if self.method == 'qr':
+            w, rank, self._residual = solve_from_r(self.R)
+            self.solver = 'qr' if rank == self.d + 1 else 'qr (rank deficient)'
+        else:
+            w = None
+            try:
+                L = np.linalg.cholesky(self.gram)
+                diagonal = np.abs(np.diag(L))
+                # cond(XᵀX) = cond(L)²: give up on Cholesky well before round-off takes over
+                if diagonal.min() > 1e-7 * diagonal.max():
+                    w = np.linalg.solve(L.T, np.linalg.solve(L, self.moment))
+                    self.solver = 'cholesky'
+            except np.linalg.LinAlgError:
+                pass
+            if w is None:
+                w = np.linalg.lstsq(self.gram, self.moment, rcond=None)[0]
+                self.solver = 'lstsq'
+
+        self._weights = w
+        return w
+
+    def solve(self):
+        """
+        Returns: (coefficients, intercept)
+
+        'normal': Cholesky of XᵀX; if that fails or XᵀX is nearly singular,
+        falls back to an SVD least-squares solve (smallest weights that fit).
+        'qr': back substitution with R.
+        """
+        w = self._shifted_weights()
+        coefficients = w[:self.d]
+        # Undo the shift: y = w (x - x_shift) + w0 + y_shift
+        intercept = w[self.d] + self.y_shift - coefficients @ self.x_shift
+        return coefficients, float(intercept)
+
+    def r_squared(self):
+        """
+        Goodness of fit (0 to 1) from the kept sums, no second pass
+
+        SS_tot = sum (y - mean)², SS_res = yᵀy - wᵀXᵀy at the least-squares w
+        """
+        ss_tot = self.sum_y2 - self.sum_y**2 / self.n
+        w = self._shifted_weights()
+        if self.method == 'qr':
+            ss_res = self._residual**2
+        else:
+            ss_res = max(self.sum_y2 - w @ self.moment, 0.0)
+        return 1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0
+
+
+# ========================================
+# ARRAYS, CHUNKS AND FILES
+# ========================================
+
+def rows_for_budget(features, memory_bytes=MEMORY_BUDGET):
+    """How many rows per chunk fit in memory_bytes (row copy + work space)"""
+    return max(1, memory_bytes // (8 * 3 * (features + 2)))
+
+
+def fit_chunks(chunks, features, method='normal'):
+    """One pass over an iterable of (X, y) chunks, returns the state"""
+    state = MultipleRegressionState(features, method)
+    for X, y in chunks:
+        state.update(X, y)
+    return state
+
+
+def multiple_regression(X, y, method='normal', memory_bytes=MEMORY_BUDGET):
+    """
+    Fit y = X w + c for any number of features
+
+    X can be a normal array or a memory map (np.load(..., mmap_mode='r')):
+    it is read in chunks sized to memory_bytes and never copied whole.
+
+    Returns: (coefficients, intercept, r_squared)
+    """
+    X = X if isinstance(X, np.ndarray) else np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    n, d = X.shape
+    chunk = rows_for_budget(d, memory_bytes)
+
+    state = fit_chunks(((X[i:i + chunk], y[i:i + chunk]) for i in range(0, n, chunk)), d, method)
+    coefficients, intercept = state.solve()
+    return coefficients, intercept, state.r_squared()
+
+
+def multiple_regression_columns(columns, y, method='normal', memory_bytes=MEMORY_BUDGET):
+    """
+    Same as multiple_regression, but the features come as separate columns
+
+    e.g. multiple_regression_columns([sizes, ages], prices)
+    Only one chunk of rows is ever put side by side, so the full
+    design matrix is never built.
+
+    Returns: (coefficients, intercept, r_squared)
+    """
+    columns = [np.asarray(column, dtype=float).ravel() for column in columns]
+    y = np.asarray(y, dtype=float).ravel()
+    if any(len(column) != len(y) for column in columns):
+        raise ValueError("Every feature column needs one value per y")
+    d = len(columns)
+    chunk = rows_for_budget(d, memory_bytes)
+
+    chunks = ((np.column_stack([column[i:i + chunk] for column in columns]), y[i:i + chunk])
+              for i in range(0, len(y), chunk))
+    state = fit_chunks(chunks, d, method)
+    coefficients, intercept = state.solve()
+    return coefficients, intercept, state.r_squared()
+
+
+def multiple_regression_npy(x_path, y_path, method='normal', memory_bytes=MEMORY_BUDGET):
+    """
+    Fit from .npy files (x_path: rows x d features, y_path: rows targets)
+
+    Both files are memory mapped, so only one chunk is in memory at a time.
+    Returns: (coefficients, intercept, r_squared)
+    """
+    X = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    return multiple_regression(X, y, method, memory_bytes)
@@ -3,61 +3,192 @@
 
 
 import numpy as np
+from lu_solver import lu_factor, solve_mixed_precision
+from least_squares import least_squares
+from sparse_solvers import LinearOperator, solve_sparse
+from finite_differences import derivative, adaptive_derivative, complex_step_derivative
+from dual_numbers import dual_derivative
+from streaming_regression import RegressionState
+from multiple_regression import multiple_regression_columns
 
 # ========================================
 # GAUSSIAN ELIM
 # ========================================
 
-def solve_gaussian(equations, answers):
+def solve_gaussian(equations, answers, use_cache=False, mode='double', return_info=False):
     # Solve system of equations using Gaussian Elimination
     
     # equations: list of lists [[2,3], [1,-1]] means 2x+3y, x-y
+    #            or a LinearOperator (only A @ x is known, the matrix is
+    #            never built), which is solved iteratively
     # answers: list [8, 1] means = 8, = 1
+    # use_cache: remember the LU factorization of this matrix, so solving
+    #            the same equations again (new answers) skips elimination
+    # mode: 'double' = normal float64 solve
+    #       'mixed'  = factor in float32, refine to float64 accuracy
+    #                  (see solve_mixed_precision for the backward error)
+    #       'least_squares' = any shape of system: best fit when there are
+    #                  more equations than unknowns, smallest answer when
+    #                  there are fewer (see least_squares for rank and residual)
+    
+    # return_info: also return a dict of details about the solve
+    #              (iterative: iterations and residuals, 'mixed': backward
+    #              error, refinements and fallback, 'least_squares': rank
+    #              and residual, and 'error' when it can't be solved)
     
     # Returns: list of solutions [x, y] or None if can't solve
+    #          (solution, info) when return_info is True
     
+    info = {}
     try:
-        # Convert to numpy arrays for calculation
-        A = np.array(equations)  # Coefficient matrix
-        b = np.array(answers)    # Answer vector
-        
-        # Solve using numpy (it uses Gaussian elimination internally)
-        solution = np.linalg.solve(A, b)
-        return solution
-    except:
-        # Return None if system can't be solved
-        return None
+        if isinstance(equations, LinearOperator):
+            # Matrix-free: CG or BiCGSTAB, never forms the coefficients
+            solution, info = solve_sparse(equations, answers)
+            if not info['converged']:
+                solution = None
+        else:
+            # Convert to numpy arrays for calculation
+            A = np.array(equations)  # Coefficient matrix
+            b = np.array(answers)    # Answer vector
+            
+            if mode == 'mixed':
+                solution, info = solve_mixed_precision(A, b)
+            elif mode == 'least_squares':
+                solution, rank, residual = least_squares(A, b)
+                info = {'rank': rank, 'residual': residual}
+            elif use_cache:
+                # Factor once (or reuse the cached factors), then O(n²) solve
+                solution = lu_factor(A, use_cache=True).solve(b)
+            else:
+                # Solve using numpy (it uses Gaussian elimination internally)
+                solution = np.linalg.solve(A, b)
+    except Exception as error:
+        # None if system can't be solved
+        solution = None
+        info = {'error': str(error)}
+    
+    if return_info:
+        return solution, info
+    return solution
+
+
+def solve_gaussian_batch(equations, answers, tolerance=1e-12):
+
+    # Solve many systems of equations in one vectorized pass
+
+    # equations: stacked coefficient matrices, shape (k, n, n)
+    # answers: stacked answer vectors, shape (k, n)
+    #          or several answer columns per system, shape (k, n, m)
+    # tolerance: pivots smaller than this (relative to the row scale) mean singular
+
+    # Returns: (solutions, solved)
+    # - solutions: same shape as answers, NaN for systems that can't be solved
+    # - solved: boolean mask of shape (k,), True where the system was solved
+
+    A = np.array(equations, dtype=float)  # Copy, we eliminate in place
+    b = np.array(answers, dtype=float)
+
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("equations must have shape (k, n, n)")
+
+    k, n, _ = A.shape
+
+    # Treat a single answer vector per system as one answer column
+    single_rhs = (b.ndim == 2)
+    if single_rhs:
+        b = b[:, :, np.newaxis]
+
+    if b.ndim != 3 or b.shape[:2] != (k, n):
+        raise ValueError("answers must have shape (k, n) or (k, n, m)")
+
+    # Row scale of each system, so the singular test works for big and small numbers
+    scale = np.abs(A).max(axis=(1, 2))
+    scale[scale == 0] = 1.0
+    solved = np.ones(k, dtype=bool)
+    systems = np.arange(k)
+
+    # FORWARD ELIMINATION - one column at a time, all k systems together
+    for col in range(n):
+        # Partial pivoting: biggest number in this column for every system
+        pivot_rows = col + np.argmax(np.abs(A[:, col:, col]), axis=1)
+
+        # Swap rows (only changes systems where pivot_rows != col)
+        A[systems, [col], :], A[systems, pivot_rows, :] = A[systems, pivot_rows, :], A[systems, [col], :]
+        b[systems, [col], :], b[systems, pivot_rows, :] = b[systems, pivot_rows, :], b[systems, [col], :]
+
+        pivots = A[:, col, col]
+
+        # Mark singular systems and give them a harmless pivot so the batch keeps going
+        singular = np.abs(pivots) <= tolerance * scale
+        solved &= ~singular
+        pivots = np.where(singular, 1.0, pivots)
+        A[:, col, col] = pivots
+
+        # Eliminate everything below the pivot in every system at once
+        factors = A[:, col + 1:, col] / pivots[:, np.newaxis]
+        A[:, col + 1:, col:] -= factors[:, :, np.newaxis] * A[:, np.newaxis, col, col:]
+        b[:, col + 1:, :] -= factors[:, :, np.newaxis] * b[:, np.newaxis, col, :]
+
+    # BACK SUBSTITUTION - bottom row first, all k systems together
+    x = np.zeros_like(b)
+    for row in range(n - 1, -1, -1):
+        known = np.einsum('kj,kjm->km', A[:, row, row + 1:], x[:, row + 1:, :])
+        x[:, row, :] = (b[:, row, :] - known) / A[:, row, row][:, np.newaxis]
+
+    # Systems that can't be solved get NaN instead of garbage numbers
+    x[~solved] = np.nan
+
+    if single_rhs:
+        x = x[:, :, 0]
+
+    return x, solved
 
 
 # ========================================
 # NUMERICAL DIFF
 # ========================================
 
-def differentiate_function(x, h, method='central'):
+def simple_function(x):
+
+    # The default function to differentiate: f(x) = x² + 2x + 1
+
+    return x**2 + 2*x + 1
+
 
-    # Calculate derivative of f(x) = x² + 2x + 1
+def differentiate_function(x, h, method='central', f=simple_function):
+
+    # Calculate derivative of f(x) (default: x² + 2x + 1)
     
-    # x: point where we want the derivative
+    # x: point where we want the derivative, or an array of points
     # h: step size (small number like 0.01)
-    # method: 'forward', 'backward', or 'central'
+    # method: 'forward', 'backward', 'central',
+    #         or higher order 'central4' / 'central6',
+    #         or 'dual' for the exact derivative with dual numbers (h is ignored)
+    #         or 'complex' for the complex step Im f(x+ih)/h (h can be tiny, e.g. 1e-20)
+    # f: any function that works on numpy arrays, e.g. np.sin
     
-    # Returns: approximate derivative value
+    # Returns: approximate derivative value (array if x is an array)
 
-    # Define the function
-    def f(x):
-        return x**2 + 2*x + 1
-    
-    if method == 'forward':
-        # Forward difference: look ahead
-        derivative = (f(x + h) - f(x)) / h
-    elif method == 'backward':
-        # Backward difference: look behind
-        derivative = (f(x) - f(x - h)) / h
-    else:  # central
-        # Central difference: look both ways (most accurate)
-        derivative = (f(x + h) - f(x - h)) / (2 * h)
+    if method == 'dual':
+        # Forward-mode automatic differentiation (see dual_numbers.py)
+        return dual_derivative(f, x)
+
+    if method == 'complex':
+        # One complex evaluation per point, no cancellation
+        return complex_step_derivative(f, x, h)
+
+    # All stencil points go to f in one call (see finite_differences.py)
+    return derivative(f, x, h, method)
+
+
+def differentiate_adaptive(x, method='central', f=simple_function, tol=1e-10):
+
+    # Derivative WITHOUT choosing h: Richardson extrapolation tries
+    # smaller and smaller steps until the error estimate is below tol
     
-    return derivative
+    # Returns: (derivative, error_estimate, function_evaluations)
+
+    return adaptive_derivative(f, x, method=method, tol=tol)
 
 
 def exact_derivative(x):
@@ -83,19 +214,10 @@ def linear_regression(x_points, y_points):
     
     # Returns: (m, b) where m is slope, b is y-intercept
 
-    n = len(x_points)
-    
-    # Calculate sums needed for formulas
-    sum_x = sum(x_points)
-    sum_y = sum(y_points)
-    sum_xy = sum(x_points[i] * y_points[i] for i in range(n))
-    sum_x2 = sum(x * x for x in x_points)
-    
-    # Formula for slope (m)
-    m = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-    
-    # Formula for intercept (b)
-    b = (sum_y - m * sum_x) / n
+    # One pass of centered sums (see streaming_regression.py); the old
+    # n*sum_x2 - sum_x*sum_x formula loses accuracy for big n or large x
+    state = RegressionState.from_arrays(x_points, y_points)
+    m, b = state.fit()
     
     return m, b
 
@@ -139,20 +261,10 @@ def multiple_regression_3d(x_data, y_data, z_data):
     # - c: constant term
     # - r_squared: goodness of fit (0 to 1, higher is better)
 
-    n = len(x_data)
-    
-    # Build design matrix: each row is [x, y, 1]
-    A = np.column_stack([x_data, y_data, np.ones(n)])
-    z = np.array(z_data)
-    
-    # Solve using least squares (like Gaussian elimination)
-    coefficients, residuals, rank, s = np.linalg.lstsq(A, z, rcond=None)
-    a, b, c = coefficients
-    
-    # Calculate R-squared (how good is the fit?)
-    z_predicted = a * np.array(x_data) + b * np.array(y_data) + c
-    ss_res = np.sum((z - z_predicted) ** 2)  # Residual sum of squares
-    ss_tot = np.sum((z - np.mean(z)) ** 2)   # Total sum of squares
-    r_squared = 1 - (ss_res / ss_tot)
+    # Same as multiple_regression with two features: XᵀX and Xᵀz are
+    # built chunk by chunk from the x and y columns and solved with
+    # Cholesky, and R² comes from the same sums - the [x y 1] matrix
+    # and the predicted values are never stored
+    (a, b), c, r_squared = multiple_regression_columns([x_data, y_data], z_data)
     
     return a, b, c, r_squared
\ No newline at end of file
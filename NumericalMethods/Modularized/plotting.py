@@ -121,4 +121,69 @@ def plot_3d_regression(x_data, y_data, z_data, a, b, c):
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+# ========================================
+# FUNCTION AND TANGENT
+# ========================================
+
+def plot_function(f, x0, slope, width=3.0):
+    """
+    Plot a function and its tangent line at x0
+    
+    f: any vectorized function, e.g. a compiled expression
+    x0: point of the tangent
+    slope: f'(x0)
+    """
+    # Create figure
+    plt.figure(figsize=(8, 6))
+    
+    # One call of f for the whole curve
+    x_smooth = np.linspace(x0 - width, x0 + width, 400)
+    y_smooth = f(x_smooth)
+    y0 = f(x0)
+    
+    label = f'f(x) = {f.text}' if hasattr(f, 'text') else 'f(x)'
+    plt.plot(x_smooth, y_smooth, 'b-', linewidth=2, label=label)
+    plt.plot(x_smooth, y0 + slope * (x_smooth - x0), 'r--', linewidth=1.5,
+            label=f"Tangent at x = {x0} (slope {slope:.4f})")
+    plt.scatter([x0], [y0], color='red', s=80, zorder=3)
+    
+    # Labels and styling
+    plt.xlabel('X', fontsize=12)
+    plt.ylabel('Y', fontsize=12)
+    plt.title('Function and Tangent', fontsize=14, fontweight='bold')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
+# ========================================
+# CROSS-VALIDATION CURVE
+# ========================================
+
+def plot_cv_curve(degrees, cv_error, best_degree):
+    """
+    Plot cross-validation error against polynomial degree
+    
+    Too low a degree misses the shape, too high a degree chases the
+    noise - the bottom of the curve is the best degree
+    """
+    # Create figure
+    plt.figure(figsize=(8, 6))
+    
+    plt.semilogy(degrees, cv_error, 'bo-', linewidth=2, label='CV error')
+    best = list(degrees).index(best_degree)
+    plt.scatter([best_degree], [cv_error[best]], color='red', s=150, zorder=3,
+               label=f'Best degree: {best_degree}')
+    
+    # Labels and styling
+    plt.xlabel('Polynomial degree', fontsize=12)
+    plt.ylabel('Mean squared error on left-out points', fontsize=12)
+    plt.title('Cross-Validation', fontsize=14, fontweight='bold')
+    plt.xticks(degrees)
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,185 @@
+"""
+POLYNOMIAL DEGREE SWEEP
+Fits of degree 1, 2, ..., D for about the cost of one fit
+"""
+
+import numpy as np
+
+BASES = ('monomial', 'chebyshev')
+
+
+# ========================================
+# QR ONE COLUMN AT A TIME
+# ========================================
+
+class IncrementalQR:
+    """
+    QR factorization of a design matrix that grows one column at a time
+
+    Q: orthonormal columns (n x k), R: upper triangular (k x k)
+    z = Qᵀy and the residual y - Q z are kept up to date as well, so
+    after every new column the least-squares fit of the columns so far
+    is one small back substitution, and its RSS is already known.
+
+    Adding a column is Gram-Schmidt against the existing Q, done twice
+    ("twice is enough") so Q stays orthogonal to round-off.
+    """
+
+    def __init__(self, y, max_columns):
+        self.y = np.asarray(y, dtype=float)
+        n = len(self.y)
+        self.Q = np.empty((n, max_columns))
+        self.R = np.zeros((max_columns, max_columns))
+        self.z = np.zeros(max_columns)
+        self.residual = self.y.copy()
+        self.k = 0
+
+    def add_column(self, column):
+        """Append one column; raises ValueError if it adds nothing new"""
+        v = np.array(column, dtype=float)
+        size = np.linalg.norm(v)
+        Q = self.Q[:, :self.k]
+
+        r = np.zeros(self.k)
+        for _ in range(2):
+            correction = Q.T @ v
+            v -= Q @ correction
+            r += correction
+
+        rho = np.linalg.norm(v)
+        if rho <= 1e-12 * max(size, 1e-300):
+            raise ValueError("New column is (nearly) a combination of the others "
+                             "- degree too high for these x values")
+
+        q = v / rho
+        self.Q[:, self.k] = q
+        self.R[:self.k, self.k] = r
+        self.R[self.k, self.k] = rho
+
+        # Project the remaining residual on the new direction
+        self.z[self.k] = q @ self.residual
+        self.residual -= self.z[self.k] * q
+        self.k += 1
+
+    def coefficients(self):
+        """Least-squares coefficients for the columns so far (solve R c = z)"""
+        k = self.k
+        R, z = self.R[:k, :k], self.z[:k]
+        c = np.zeros(k)
+        for i in range(k - 1, -1, -1):
+            c[i] = (z[i] - R[i, i + 1:] @ c[i + 1:]) / R[i, i]
+        return c
+
+    def rss(self):
+        """Residual sum of squares of the current fit"""
+        return float(self.residual @ self.residual)
+
+
+# ========================================
+# DEGREE SWEEP
+# ========================================
+
+def basis_columns(x, max_degree, basis='monomial', domain=None):
+    """
+    Design-matrix columns for degree 0, 1, ..., max_degree, one at a time
+
+    Yields (column, scale): the column is already divided by scale,
+    so fitted coefficients must be divided by scale too.
+    monomial: x^k scaled to length 1 (like polyfit)
+    chebyshev: T_k(t) with t = x mapped from domain (default: x range) to [-1, 1]
+    """
+    if basis not in BASES:
+        raise ValueError(f"Unknown basis: {basis}")
+    n = len(x)
+
+    if basis == 'chebyshev':
+        low, high = domain if domain is not None else (x.min(), x.max())
+        t = (2 * x - (low + high)) / (high - low)
+        previous, current = np.ones(n), t
+        yield previous, 1.0
+        if max_degree >= 1:
+            yield current, 1.0
+        for _ in range(2, max_degree + 1):
+            # T_k = 2t T_(k-1) - T_(k-2)
+            previous, current = current, 2 * t * current - previous
+            yield current, 1.0
+    else:
+        power = np.ones(n)
+        for _ in range(max_degree + 1):
+            scale = np.linalg.norm(power) or 1.0
+            yield power / scale, scale
+            power = power * x
+
+
+def information_criteria(rss, n, parameters):
+    """
+    AIC and BIC of a least-squares fit (lower is better)
+
+    Both reward a small error but charge for every extra coefficient;
+    BIC charges more when there are many points.
+    """
+    fit_term = n * np.log(max(rss, 1e-300) / n)
+    return fit_term + 2 * parameters, fit_term + parameters * np.log(n)
+
+
+def degree_sweep(x_points, y_points, max_degree, basis='monomial'):
+    """
+    Polynomial fits for every degree 1..max_degree in one pass
+
+    The QR of the design matrix is built once and one column is added
+    per degree (see IncrementalQR), instead of a new polyfit per degree.
+
+    basis: 'monomial'  columns 1, x, x², ... (coefficients like np.polyfit)
+           'chebyshev' columns T0, T1, T2, ... on the x range, much better
+                       conditioned for high degrees
+
+    Returns: dict of lists/arrays, one entry per degree 1..max_degree
+    - 'degrees', 'coefficients', 'functions' (np.poly1d or np.polynomial.Chebyshev),
+      'rss', 'r_squared', 'aic', 'bic'
+    """
+    x = np.asarray(x_points, dtype=float)
+    y = np.asarray(y_points, dtype=float)
+    n = len(x)
+    if max_degree < 1 or max_degree >= n:
+        raise ValueError(f"Degree must be between 1 and {n - 1} for {n} points")
+
+    qr = IncrementalQR(y, max_degree + 1)
+    low, high = x.min(), x.max()
+
+    scales = []
+    result = {name: [] for name in ('degrees', 'coefficients', 'functions', 'rss', 'r_squared', 'aic', 'bic')}
+    total = float(((y - y.mean()) ** 2).sum())
+
+    columns = basis_columns(x, max_degree, basis, (low, high))
+    for degree, (column, scale) in enumerate(columns):
+        scales.append(scale)
+        qr.add_column(column)
+        if degree == 0:
+            continue
+
+        c = qr.coefficients() / np.array(scales)
+        if basis == 'chebyshev':
+            function = np.polynomial.Chebyshev(c, domain=[low, high])
+            coefficients = c
+        else:
+            coefficients = c[::-1]  # highest power first, like np.polyfit
+            function = np.poly1d(coefficients)
+
+        rss = qr.rss()
+        aic, bic = information_criteria(rss, n, degree + 1)
+        result['degrees'].append(degree)
+        result['coefficients'].append(coefficients)
+        result['functions'].append(function)
+        result['rss'].append(rss)
+        result['r_squared'].append(1 - rss / total if total > 0 else 1.0)
+        result['aic'].append(aic)
+        result['bic'].append(bic)
+
+    for name in ('degrees', 'rss', 'r_squared', 'aic', 'bic'):
+        result[name] = np.array(result[name])
+    return result
+
+
+def best_degree(sweep, criterion='bic'):
+    """Degree with the lowest AIC or BIC in a degree_sweep result"""
+    return int(sweep['degrees'][np.argmin(sweep[criterion])])
@@ -0,0 +1,242 @@
+"""
+DERIVATIVES OF SAMPLED DATA
+dy/dx when y is a measured signal (array, CSV or .npy), not a formula
+"""
+
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from finite_differences import stencil_weights
+from data_files import file_chunks
+
+
+# ========================================
+# UNIFORM GRID
+# ========================================
+
+def uniform_stencils(order=2):
+    """
+    Weights for a uniform grid, accurate to h^order everywhere
+
+    Returns: (interior, left, right)
+    - interior: centered stencil, offsets -order/2 .. order/2
+    - left[i]: one-sided stencil for point i (offsets -i .. order - i)
+    - right[i]: one-sided stencil for the point i from the end
+    """
+    if order < 2 or order % 2:
+        raise ValueError("order must be an even number (2, 4, 6, ...)")
+    half = order // 2
+    interior = stencil_weights(np.arange(-half, half + 1))
+    left = [stencil_weights(np.arange(-i, order + 1 - i)) for i in range(half)]
+    right = [stencil_weights(np.arange(i - order, i + 1)) for i in range(half)]
+    return interior, left, right
+
+
+def uniform_derivative(y, dx=1.0, order=2):
+    """
+    dy/dx of samples taken every dx
+
+    order 2: (y[i+1] - y[i-1]) / 2dx inside, 3-point one-sided at the ends
+    order 4: (y[i-2] - 8y[i-1] + 8y[i+1] - y[i+2]) / 12dx inside, 5-point at the ends
+
+    The inside is one sliding-window product (a convolution), only the
+    order/2 points at each end use their own one-sided stencils.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n < order + 1:
+        raise ValueError(f"Need at least {order + 1} samples for order {order}")
+
+    interior, left, right = uniform_stencils(order)
+    half = order // 2
+
+    result = np.empty(n)
+    result[half:n - half] = sliding_window_view(y, order + 1) @ interior
+    for i in range(half):
+        result[i] = y[:order + 1] @ left[i]
+        result[n - 1 - i] = y[n - order - 1:] @ right[i]
+    return result / dx
+
+
+# ========================================
+# NON-UNIFORM GRID
+# ========================================
+
+def nonuniform_derivative(x, y, order=2):
+    """
+    dy/dx of samples at any (increasing) x positions
+
+    Every point gets its own stencil from its order+1 nearest neighbours
+    (centered inside, one-sided at the ends). The weights come from a
+    small Vandermonde system per point, all solved in one batched call.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, k, half = len(x), order + 1, order // 2
+    if n < k:
+        raise ValueError(f"Need at least {k} samples for order {order}")
+
+    # Indices of each point's stencil, shape (n, k)
+    start = np.clip(np.arange(n) - half, 0, n - k)
+    neighbours = start[:, None] + np.arange(k)
+
+    # Offsets scaled to about 1, so the Vandermonde systems are well conditioned
+    offsets = x[neighbours] - x[:, None]
+    scale = np.abs(offsets).max(axis=1, keepdims=True)
+    t = offsets / scale
+
+    # Row p of each system: sum(w * t^p) = 1 if p == 1 else 0
+    V = t[:, None, :] ** np.arange(k)[None, :, None]
+    rhs = np.zeros((n, k, 1))
+    rhs[:, 1] = 1.0
+    weights = np.linalg.solve(V, rhs)[..., 0]
+
+    return np.sum(weights * y[neighbours], axis=1) / scale[:, 0]
+
+
+# ========================================
+# NOISY DATA: SAVITZKY-GOLAY
+# ========================================
+
+def savgol_coefficients(window=11, polyorder=3, deriv=1):
+    """
+    Convolution weights of a Savitzky-Golay filter
+
+    Fits a polynomial of degree polyorder to the window (least squares)
+    and takes its deriv-th derivative at the middle point. Since the fit
+    is linear in y, that is just a fixed weighted sum of the window.
+    """
+    if window % 2 == 0 or window <= polyorder:
+        raise ValueError("window must be odd and bigger than polyorder")
+    if deriv > polyorder:
+        raise ValueError("deriv can't be more than polyorder")
+    half = window // 2
+    A = np.arange(-half, half + 1)[:, None] ** np.arange(polyorder + 1)
+    return math.factorial(deriv) * np.linalg.pinv(A)[deriv]
+
+
+def savgol_derivative(y, dx=1.0, window=11, polyorder=3, deriv=1):
+    """
+    Smoothed derivative of noisy samples taken every dx
+
+    A plain stencil divides the noise by dx, which blows it up; the
+    Savitzky-Golay fit averages it out first. deriv=0 just smooths.
+    At the ends the polynomial fitted to the first / last window is used.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n < window:
+        raise ValueError(f"Need at least {window} samples for window {window}")
+
+    half = window // 2
+    result = np.empty(n)
+    result[half:n - half] = sliding_window_view(y, window) @ savgol_coefficients(window, polyorder, deriv)
+
+    # Ends: fit the first / last window and differentiate the polynomial
+    t = np.arange(window)
+    for segment, positions, target in ((y[:window], t[:half], slice(0, half)),
+                                       (y[n - window:], t[window - half:], slice(n - half, n))):
+        fit = np.polynomial.polynomial.polyfit(t, segment, polyorder)
+        slope = np.polynomial.polynomial.polyder(fit, deriv)
+        result[target] = np.polynomial.polynomial.polyval(positions, slope)
+
+    return result / dx**deriv
+
+
+def sampled_derivative(y, x=None, dx=1.0, method='stencil', order=2, window=11, polyorder=3):
+    """
+    Derivative of sampled data, picks the right routine
+
+    method 'stencil': uniform_derivative (or nonuniform_derivative when x is given)
+    method 'savgol':  savgol_derivative (uniform grid, spacing from x if given)
+    """
+    if method == 'stencil':
+        if x is None:
+            return uniform_derivative(y, dx, order)
+        return nonuniform_derivative(x, y, order)
+    if method == 'savgol':
+        if x is not None:
+            dx = x[1] - x[0]
+        return savgol_derivative(y, dx, window, polyorder)
+    raise ValueError(f"Unknown method: {method}")
+
+
+def _reach(method, order, window):
+    # How many neighbours on each side a point's derivative depends on
+    return window // 2 if method == 'savgol' else order // 2
+
+
+# ========================================
+# STREAMING (BIGGER THAN MEMORY)
+# ========================================
+
+def stream_derivative(chunks, dx=1.0, method='stencil', order=2, window=11, polyorder=3):
+    """
+    Derivative of a long signal given chunk by chunk
+
+    chunks: iterable of y arrays, or of (x, y) pairs for a non-uniform grid
+    Yields the derivative for the samples in order, chunk by chunk.
+
+    The last few samples of each chunk (the stencil reach) are kept and
+    put in front of the next chunk, so every point is computed with its
+    full stencil - the result is the same as for the whole array at once.
+    """
+    reach = _reach(method, order, window)
+    buffer = None        # rows: (x, y) or just (y,)
+    emitted = 0          # samples at the front of buffer that were already yielded
+
+    chunks = iter(chunks)
+    current = next(chunks, None)
+    while current is not None:
+        following = next(chunks, None)
+        last = following is None
+
+        block = np.atleast_2d(np.asarray(current, dtype=float))
+        buffer = block if buffer is None else np.concatenate([buffer, block], axis=1)
+        length = buffer.shape[1]
+
+        # Points near the right end need samples from the next chunk
+        end = length if last else length - reach
+        if end > emitted and (last or length >= 2 * reach + 1):
+            x = buffer[0] if len(buffer) == 2 else None
+            derivative = sampled_derivative(buffer[-1], x, dx, method, order, window, polyorder)
+            yield derivative[emitted:end]
+
+            # Keep the points not yielded yet plus their left neighbours
+            keep = min(length, (length - end) + reach)
+            buffer = buffer[:, length - keep:]
+            emitted = keep - (length - end)
+
+        current = following
+
+
+# ========================================
+# FILES
+# ========================================
+
+def differentiate_file(path, dx=1.0, method='stencil', order=2, window=11, polyorder=3,
+                       chunk_rows=100_000, out_path=None):
+    """
+    Derivative of the samples in a CSV or .npy file, read chunk by chunk
+
+    Returns the derivative array, or if out_path is given writes it
+    to that .npy file piece by piece (for files bigger than memory)
+    and returns out_path.
+    """
+    pieces = stream_derivative(file_chunks(path, chunk_rows), dx, method, order, window, polyorder)
+    if out_path is None:
+        return np.concatenate(list(pieces))
+
+    if str(path).endswith('.npy'):
+        rows = len(np.load(path, mmap_mode='r'))
+    else:
+        rows = sum(len(chunk[-1] if isinstance(chunk, tuple) else chunk)
+                   for chunk in file_chunks(path, chunk_rows))
+
+    out = np.lib.format.open_memmap(out_path, mode='w+', dtype=float, shape=(rows,))
+    position = 0
+    for piece in pieces:
+        out[position:position + len(piece)] = piece
+        position += len(piece)
+    out.flush()
+    return out_path
@@ -0,0 +1,631 @@
+"""
+SPARSE AND BANDED LINEAR SOLVERS
+For big systems where most coefficients are zero
+(or where the matrix is never built at all, see LinearOperator)
+"""
+
+import numpy as np
+
+# Banded LU is only used automatically when the band is this narrow
+BANDED_MAX_WIDTH = 32
+
+
+# ========================================
+# CSR SPARSE MATRIX
+# ========================================
+
+class CSRMatrix:
+    """
+    Compressed Sparse Row matrix - only the nonzero numbers are stored
+
+    data:    the nonzero values, row by row
+    indices: column of each value in data
+    indptr:  row i uses data[indptr[i]:indptr[i+1]]
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+
+        # Row number of every stored value (lets matvec use one bincount)
+        self.row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """Build from (row, col, value) triplets, duplicates are added together"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+
+        # Sort by row, then column, and merge duplicate positions
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows):
+            new_entry = np.ones(len(rows), dtype=bool)
+            new_entry[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            starts = np.flatnonzero(new_entry)
+            values = np.add.reduceat(values, starts)
+            rows, cols = rows[starts], cols[starts]
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values, cols, indptr, shape)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """Build from a normal 2D array (zeros are dropped)"""
+        A = np.asarray(matrix, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        """Number of stored nonzeros"""
+        return len(self.data)
+
+    def dot(self, x):
+        """Matrix-vector product A @ x"""
+        products = self.data * x[self.indices]
+        return np.bincount(self.row_ids, weights=products, minlength=self.shape[0])
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+    def diagonal(self):
+        """Main diagonal as a dense vector"""
+        on_diagonal = self.row_ids == self.indices
+        diag = np.zeros(min(self.shape))
+        diag[self.row_ids[on_diagonal]] = self.data[on_diagonal]
+        return diag
+
+    def bandwidth(self):
+        """(lower, upper) bandwidth: how far nonzeros sit from the diagonal"""
+        if self.nnz == 0:
+            return 0, 0
+        offsets = self.indices - self.row_ids
+        return int(max(0, -offsets.min())), int(max(0, offsets.max()))
+
+    def transpose(self):
+        """Transposed matrix (rows become columns)"""
+        return CSRMatrix.from_coo(self.indices, self.row_ids, self.data, self.shape[::-1])
+
+    def is_symmetric(self, tolerance=1e-12):
+        """True if A equals its transpose"""
+        if self.shape[0] != self.shape[1]:
+            return False
+        T = self.transpose()
+        return (np.array_equal(self.indptr, T.indptr)
+                and np.array_equal(self.indices, T.indices)
+                and np.allclose(self.data, T.data, rtol=tolerance, atol=0))
+
+    def to_banded(self, lower, upper, extra_rows=0):
+        """
+        Band storage: band[extra_rows + upper + i - j, j] = A[i, j]
+
+        extra_rows leaves empty rows on top for fill-in during pivoting.
+        """
+        band = np.zeros((extra_rows + upper + lower + 1, self.shape[1]))
+        band[extra_rows + upper + self.row_ids - self.indices, self.indices] = self.data
+        return band
+
+
+def as_csr(matrix):
+    """Accept a CSRMatrix or anything numpy can turn into a 2D array"""
+    if isinstance(matrix, CSRMatrix):
+        return matrix
+    return CSRMatrix.from_dense(matrix)
+
+
+# ========================================
+# MATRIX-FREE LINEAR OPERATOR
+# ========================================
+
+class LinearOperator:
+    """
+    A matrix that is never stored - only y = A @ x is known
+
+    Good for stencils, Kronecker products, etc. where computing A @ x
+    is cheap but writing out all n² coefficients is not.
+
+    matvec: function x -> A @ x
+    shape: (rows, cols)
+    diagonal: optional diagonal of A (needed by Jacobi)
+    symmetric: set True for symmetric positive definite operators,
+               so solve_sparse picks Conjugate Gradient
+    """
+
+    def __init__(self, matvec, shape, dtype=float, diagonal=None, symmetric=False):
+        self.matvec = matvec
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._diagonal = None if diagonal is None else np.asarray(diagonal, dtype=float)
+        self.symmetric = symmetric
+
+    def dot(self, x):
+        """Matrix-vector product A @ x"""
+        return self.matvec(x)
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+    def diagonal(self):
+        """Main diagonal (only if it was given)"""
+        if self._diagonal is None:
+            raise ValueError("This operator has no diagonal, pass diagonal= when creating it")
+        return self._diagonal
+
+
+def as_operator(matrix):
+    """
+    Anything with A @ x for the iterative solvers
+
+    CSRMatrix and LinearOperator are used as they are,
+    anything else is converted to CSR.
+    """
+    if isinstance(matrix, (CSRMatrix, LinearOperator)):
+        return matrix
+    return as_csr(matrix)
+
+
+def _relative_residual(A, x, b, b_norm):
+    return np.linalg.norm(b - A.dot(x)) / b_norm
+
+
+def _info(method, iterations, residuals, converged):
+    # Same report shape for every solver
+    return {
+        'method': method,
+        'iterations': iterations,
+        'residuals': residuals,
+        'converged': converged,
+    }
+
+
+# ========================================
+# TRIDIAGONAL (THOMAS ALGORITHM)
+# ========================================
+
+def thomas_solve(lower, diag, upper, answers):
+    """
+    Solve a tridiagonal system in O(n)
+
+    lower: below-diagonal values, length n-1
+    diag:  diagonal values, length n
+    upper: above-diagonal values, length n-1
+    answers: right side, length n
+
+    No pivoting, so it is meant for diagonally dominant systems.
+    """
+    a = np.asarray(lower, dtype=float)
+    b = np.array(diag, dtype=float)       # Copies, changed below
+    c = np.asarray(upper, dtype=float)
+    d = np.array(answers, dtype=float)
+    n = len(b)
+
+    # Forward sweep: remove the lower diagonal
+    for i in range(1, n):
+        if b[i - 1] == 0:
+            raise np.linalg.LinAlgError("Zero pivot in tridiagonal solve")
+        factor = a[i - 1] / b[i - 1]
+        b[i] -= factor * c[i - 1]
+        d[i] -= factor * d[i - 1]
+
+    if b[n - 1] == 0:
+        raise np.linalg.LinAlgError("Zero pivot in tridiagonal solve")
+
+    # Back substitution: bottom row first
+    x = np.empty(n)
+    x[n - 1] = d[n - 1] / b[n - 1]
+    for i in range(n - 2, -1, -1):
+        x[i] = (d[i] - c[i] * x[i + 1]) / b[i]
+
+    return x
+
+
+# ========================================
+# BANDED LU
+# ========================================
+
+def banded_lu_solve(band, lower, upper, answers):
+    """
+    Solve a banded system with LU and partial pivoting
+
+    band: band storage from CSRMatrix.to_banded(lower, upper, extra_rows=lower)
+          (the extra rows hold the fill-in created by row swaps)
+    lower, upper: number of diagonals below / above the main diagonal
+    answers: right side, shape (n,) or (n, m)
+
+    Memory and work are O(n * band width) instead of O(n²) and O(n³).
+    """
+    ab = np.array(band, dtype=float)
+    n = ab.shape[1]
+    top = lower + upper       # Row of the main diagonal in ab
+    width = lower + upper     # Upper bandwidth of U after pivoting
+    pivots = np.zeros(n, dtype=np.int64)
+
+    # Window of the matrix touched by one elimination step:
+    # rows k..k+lower, columns k..k+width, as positions in ab
+    a = np.arange(lower + 1)[:, np.newaxis]
+    b = np.arange(width + 1)[np.newaxis, :]
+    window_rows = top + a - b
+
+    for k in range(n):
+        rows = min(lower + 1, n - k)
+        cols = min(width + 1, n - k)
+        ab_rows = window_rows[:rows, :cols]
+        ab_cols = k + b[:, :cols]
+
+        block = ab[ab_rows, ab_cols]
+
+        # Partial pivoting inside the band
+        p = np.argmax(np.abs(block[:, 0]))
+        if block[p, 0] == 0:
+            raise np.linalg.LinAlgError("Singular banded matrix")
+        pivots[k] = k + p
+        if p != 0:
+            block[[0, p]] = block[[p, 0]]
+
+        # Multipliers, then rank-1 update of the small window
+        block[1:, 0] /= block[0, 0]
+        block[1:, 1:] -= np.outer(block[1:, 0], block[0, 1:])
+
+        ab[ab_rows, ab_cols] = block
+
+    # Work with answer columns, so one or many right sides use the same code
+    y = np.array(answers, dtype=float)
+    single_rhs = (y.ndim == 1)
+    if single_rhs:
+        y = y[:, np.newaxis]
+
+    # Forward: apply row swaps and L
+    for k in range(n):
+        p = pivots[k]
+        if p != k:
+            y[[k, p]] = y[[p, k]]
+        last = min(k + lower, n - 1)
+        if last > k:
+            multipliers = ab[top + 1:top + 1 + last - k, k]
+            y[k + 1:last + 1] -= np.outer(multipliers, y[k])
+
+    # Back substitution with U (band of width lower + upper)
+    for i in range(n - 1, -1, -1):
+        last = min(i + width, n - 1)
+        if last > i:
+            j = np.arange(i + 1, last + 1)
+            y[i] -= ab[top + i - j, j] @ y[i + 1:last + 1]
+        y[i] /= ab[top, i]
+
+    return y[:, 0] if single_rhs else y
+
+
+# ========================================
+# PRECONDITIONERS
+# ========================================
+# A preconditioner is a function r -> (approximately) A⁻¹ r.
+# Cheap to apply, and makes CG / BiCGSTAB need far fewer iterations.
+
+def jacobi_preconditioner(A):
+    """Divide by the diagonal of A (works for CSRMatrix or LinearOperator)"""
+    diag = as_operator(A).diagonal()
+    if np.any(diag == 0):
+        raise np.linalg.LinAlgError("Jacobi preconditioner needs a nonzero diagonal")
+    inverse = 1.0 / diag
+    return lambda r: inverse * r
+
+
+def ilu0_preconditioner(A):
+    """
+    Incomplete LU with no fill-in: ILU(0)
+
+    Same elimination as LU, but only entries that are already nonzero
+    in A are kept, so L and U have the sparsity of A.
+    Needs the actual nonzeros, so A must be a CSRMatrix (or dense).
+    """
+    A = as_csr(A)
+    n = A.shape[0]
+    data = A.data.copy()
+    indices, indptr = A.indices, A.indptr
+
+    # Position of the diagonal inside each row
+    diag_pos = np.full(n, -1)
+    on_diagonal = np.flatnonzero(A.row_ids == indices)
+    diag_pos[A.row_ids[on_diagonal]] = on_diagonal
+    if np.any(diag_pos < 0):
+        raise np.linalg.LinAlgError("ILU(0) needs every diagonal entry stored")
+
+    # where[col] = position of (i, col) in data for the current row i, -1 if not stored
+    where = np.full(n, -1)
+
+    for i in range(1, n):
+        start, end = indptr[i], indptr[i + 1]
+        where[indices[start:end]] = np.arange(start, end)
+
+        for pos in range(start, diag_pos[i]):
+            k = indices[pos]
+            data[pos] /= data[diag_pos[k]]
+
+            # Row i -= l_ik * (upper part of row k), only where row i has entries
+            k_upper = slice(diag_pos[k] + 1, indptr[k + 1])
+            targets = where[indices[k_upper]]
+            keep = targets >= 0
+            data[targets[keep]] -= data[pos] * data[k_upper][keep]
+
+        where[indices[start:end]] = -1
+
+    def apply(r):
+        # Forward solve with L (unit diagonal), then back solve with U
+        y = np.array(r, dtype=float)
+        for i in range(n):
+            lower = slice(indptr[i], diag_pos[i])
+            y[i] -= data[lower] @ y[indices[lower]]
+        for i in range(n - 1, -1, -1):
+            upper = slice(diag_pos[i] + 1, indptr[i + 1])
+            y[i] = (y[i] - data[upper] @ y[indices[upper]]) / data[diag_pos[i]]
+        return y
+
+    return apply
+
+
+# ========================================
+# ITERATIVE SOLVERS
+# ========================================
+
+def jacobi_solve(A, answers, x0=None, tol=1e-8, max_iterations=1000):
+    """
+    Jacobi iteration: x = x + (b - A x) / diag(A)
+
+    Converges for diagonally dominant matrices. Every update uses
+    only the old x, so one sweep is a single vectorized matvec.
+    A LinearOperator works too if it was given its diagonal.
+    """
+    A = as_operator(A)
+    b = np.asarray(answers, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    diag = A.diagonal()
+    if np.any(diag == 0):
+        raise np.linalg.LinAlgError("Jacobi needs a nonzero diagonal")
+
+    b_norm = np.linalg.norm(b) or 1.0
+    residuals = []
+
+    for iteration in range(1, max_iterations + 1):
+        r = b - A.dot(x)
+        residuals.append(np.linalg.norm(r) / b_norm)
+        if residuals[-1] < tol:
+            return x, _info('jacobi', iteration - 1, residuals, True)
+        x = x + r / diag
+
+    residuals.append(_relative_residual(A, x, b, b_norm))
+    return x, _info('jacobi', max_iterations, residuals, residuals[-1] < tol)
+
+
+def sor_solve(A, answers, omega=1.0, x0=None, tol=1e-8, max_iterations=1000):
+    """
+    Successive Over-Relaxation (omega=1 is Gauss-Seidel)
+
+    Each row uses the newest values of the rows above it, so the
+    sweep goes row by row (only the row dot products are vectorized).
+    """
+    A = as_csr(A)
+    b = np.asarray(answers, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    diag = A.diagonal()
+    if np.any(diag == 0):
+        raise np.linalg.LinAlgError("SOR needs a nonzero diagonal")
+
+    method = 'gauss_seidel' if omega == 1.0 else 'sor'
+    b_norm = np.linalg.norm(b) or 1.0
+    residuals = [_relative_residual(A, x, b, b_norm)]
+    data, indices, indptr = A.data, A.indices, A.indptr
+
+    for iteration in range(1, max_iterations + 1):
+        if residuals[-1] < tol:
+            return x, _info(method, iteration - 1, residuals, True)
+
+        for i in range(A.shape[0]):
+            start, end = indptr[i], indptr[i + 1]
+            row_sum = data[start:end] @ x[indices[start:end]]
+            # row_sum includes the diagonal term, so this is the usual SOR update
+            x[i] += omega * (b[i] - row_sum) / diag[i]
+
+        residuals.append(_relative_residual(A, x, b, b_norm))
+
+    return x, _info(method, max_iterations, residuals, residuals[-1] < tol)
+
+
+def gauss_seidel_solve(A, answers, x0=None, tol=1e-8, max_iterations=1000):
+    """Gauss-Seidel iteration (SOR with omega = 1)"""
+    return sor_solve(A, answers, 1.0, x0, tol, max_iterations)
+
+
+def conjugate_gradient_solve(A, answers, x0=None, tol=1e-8, max_iterations=None,
+                             preconditioner=None):
+    """
+    Conjugate Gradient for symmetric positive definite matrices
+
+    In exact arithmetic it finishes in at most n steps; in practice
+    far fewer for well-conditioned systems.
+    preconditioner: optional function r -> M⁻¹ r (M must be symmetric too)
+    """
+    A = as_operator(A)
+    apply_m = preconditioner or (lambda r: r)
+    b = np.asarray(answers, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    if max_iterations is None:
+        max_iterations = 10 * len(b)
+
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - A.dot(x)
+    z = apply_m(r)
+    p = z.copy()
+    rz = r @ z
+    residuals = [np.linalg.norm(r) / b_norm]
+
+    for iteration in range(1, max_iterations + 1):
+        if residuals[-1] < tol:
+            return x, _info('cg', iteration - 1, residuals, True)
+
+        Ap = A.dot(p)
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        residuals.append(np.linalg.norm(r) / b_norm)
+
+        z = apply_m(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+    return x, _info('cg', max_iterations, residuals, residuals[-1] < tol)
+
+
+def bicgstab_solve(A, answers, x0=None, tol=1e-8, max_iterations=None,
+                   preconditioner=None):
+    """
+    BiCGSTAB for general (non-symmetric) matrices
+    Two matvecs per iteration, no growing memory like GMRES
+    preconditioner: optional function r -> M⁻¹ r (applied on the right)
+    """
+    A = as_operator(A)
+    apply_m = preconditioner or (lambda r: r)
+    b = np.asarray(answers, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    if max_iterations is None:
+        max_iterations = 10 * len(b)
+
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - A.dot(x)
+    r_hat = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    residuals = [np.linalg.norm(r) / b_norm]
+
+    for iteration in range(1, max_iterations + 1):
+        if residuals[-1] < tol:
+            return x, _info('bicgstab', iteration - 1, residuals, True)
+
+        rho_new = r_hat @ r
+        if rho_new == 0 or omega == 0:
+            # Breakdown: the method can't continue from here
+            break
+
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        p_hat = apply_m(p)
+        v = A.dot(p_hat)
+        alpha = rho_new / (r_hat @ v)
+        s = r - alpha * v
+
+        s_hat = apply_m(s)
+        t = A.dot(s_hat)
+        tt = t @ t
+        omega = (t @ s) / tt if tt != 0 else 0.0
+        x += alpha * p_hat + omega * s_hat
+        r = s - omega * t
+        rho = rho_new
+
+        residuals.append(np.linalg.norm(r) / b_norm)
+
+    return x, _info('bicgstab', len(residuals) - 1, residuals, residuals[-1] < tol)
+
+
+# ========================================
+# AUTOMATIC SOLVER CHOICE
+# ========================================
+
+def choose_method(A):
+    """
+    Pick a solver from the structure of A
+
+    tridiagonal           -> 'thomas'
+    narrow band           -> 'banded'
+    symmetric, diag > 0   -> 'cg'
+    anything else         -> 'bicgstab'
+
+    A LinearOperator has no visible structure, so it gets 'cg' if it
+    was marked symmetric and 'bicgstab' otherwise.
+    """
+    if isinstance(A, LinearOperator):
+        return 'cg' if A.symmetric else 'bicgstab'
+
+    lower, upper = A.bandwidth()
+    if lower <= 1 and upper <= 1:
+        return 'thomas'
+    if 2 * lower + upper + 1 <= BANDED_MAX_WIDTH:
+        return 'banded'
+    if A.is_symmetric() and np.all(A.diagonal() > 0):
+        return 'cg'
+    return 'bicgstab'
+
+
+def solve_sparse(equations, answers, method='auto', tol=1e-8, max_iterations=None,
+                 preconditioner=None):
+    """
+    Solve a sparse system, choosing the solver from the matrix structure
+
+    equations: CSRMatrix, LinearOperator (matrix-free),
+               or a dense array (converted to CSR)
+    method: 'auto', 'thomas', 'banded', 'jacobi', 'gauss_seidel',
+            'sor', 'cg' or 'bicgstab'
+    preconditioner: None, 'jacobi', 'ilu0' or a function r -> M⁻¹ r
+                    (only 'cg' and 'bicgstab' use one, naming any other
+                    method with it raises ValueError)
+    tol: relative residual for convergence; the direct solvers
+         ('thomas', 'banded') report converged=False above it too
+
+    Returns: (solution, info) where info has the method used,
+             iteration count, residual history and convergence flag
+    """
+    A = as_operator(equations)
+    b = np.asarray(answers, dtype=float)
+    b_norm = np.linalg.norm(b) or 1.0
+
+    # Only the Krylov solvers take one ('auto' may still pick a direct solver, which needs none)
+    if preconditioner is not None and method not in ('auto', 'cg', 'bicgstab'):
+        raise ValueError(f"'{method}' doesn't use a preconditioner, only 'cg' and 'bicgstab' do")
+
+    if method == 'auto':
+        method = choose_method(A)
+
+    if isinstance(A, LinearOperator) and method in ('thomas', 'banded', 'gauss_seidel', 'sor'):
+        raise ValueError(f"'{method}' needs the matrix entries, a LinearOperator only has A @ x")
+
+    if preconditioner == 'jacobi':
+        preconditioner = jacobi_preconditioner(A)
+    elif preconditioner == 'ilu0':
+        preconditioner = ilu0_preconditioner(A)
+
+    if method == 'thomas':
+        n = A.shape[0]
+        band = A.to_banded(1, 1)
+        try:
+            x = thomas_solve(band[2, :n - 1], band[1], band[0, 1:], b)
+            residual = _relative_residual(A, x, b, b_norm)
+            return x, _info('thomas', 0, [residual], residual < tol)
+        except np.linalg.LinAlgError:
+            # Thomas doesn't pivot, banded LU does
+            method = 'banded'
+
+    if method == 'banded':
+        lower, upper = A.bandwidth()
+        x = banded_lu_solve(A.to_banded(lower, upper, extra_rows=lower), lower, upper, b)
+        residual = _relative_residual(A, x, b, b_norm)
+        return x, _info('banded', 0, [residual], residual < tol)
+
+    iteration_limit = {} if max_iterations is None else {'max_iterations': max_iterations}
+
+    if method == 'jacobi':
+        return jacobi_solve(A, b, tol=tol, **iteration_limit)
+    if method == 'gauss_seidel':
+        return gauss_seidel_solve(A, b, tol=tol, **iteration_limit)
+    if method == 'sor':
+        return sor_solve(A, b, omega=1.5, tol=tol, **iteration_limit)
+    if method == 'cg':
+        return conjugate_gradient_solve(A, b, tol=tol, preconditioner=preconditioner, **iteration_limit)
+    if method == 'bicgstab':
+        return bicgstab_solve(A, b, tol=tol, preconditioner=preconditioner, **iteration_limit)
+
+    raise ValueError(f"Unknown method: {method}")
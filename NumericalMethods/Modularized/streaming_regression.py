@@ -0,0 +1,190 @@
+"""
+STREAMING LINEAR REGRESSION
+Best line y = mx + b in one pass over data of any size
+"""
+
+import numpy as np
+try:
+    from data_files import xy_chunks
+except ImportError:
+    # Imported as Modularized.streaming_regression (e.g. from NumProj.py)
+    from .data_files import xy_chunks
+
+
+# ========================================
+# RUNNING STATE
+# ========================================
+
+class RegressionState:
+    """
+    Everything a best-fit line needs, kept up to date chunk by chunk
+
+    n:       number of points so far
+    mean_x, mean_y: running means
+    m2_x, m2_y:     sum of (x - mean_x)², sum of (y - mean_y)²
+    c_xy:           sum of (x - mean_x)(y - mean_y)
+
+    These are Welford-style centered sums: the textbook formula
+    n*sum_x2 - sum_x*sum_x subtracts two huge, almost equal numbers
+    and loses the answer when n is big or x is far from 0; centered
+    sums never get that problem. The memory used is always 6 numbers.
+    """
+
+    def __init__(self, n=0, mean_x=0.0, mean_y=0.0, m2_x=0.0, m2_y=0.0, c_xy=0.0):
+        self.n = n
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.m2_x = m2_x
+        self.m2_y = m2_y
+        self.c_xy = c_xy
+
+    @classmethod
+    def from_arrays(cls, x, y):
+        """State of one chunk of points (computed with numpy, no python loop)"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) != len(y):
+            raise ValueError("x and y need the same number of points")
+        if len(x) == 0:
+            return cls()
+        mean_x, mean_y = x.mean(), y.mean()
+        dx, dy = x - mean_x, y - mean_y
+        return cls(len(x), float(mean_x), float(mean_y),
+                   float(dx @ dx), float(dy @ dy), float(dx @ dy))
+
+    def merge(self, other):
+        """
+        Combined state of two separate groups of points
+
+        The groups can come from different chunks, threads or processes -
+        merging gives exactly what one pass over all the points would.
+        """
+        if other.n == 0:
+            return RegressionState(self.n, self.mean_x, self.mean_y, self.m2_x, self.m2_y, self.c_xy)
+        if self.n == 0:
+            return RegressionState(other.n, other.mean_x, other.mean_y, other.m2_x, other.m2_y, other.c_xy)
+
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+
+        return RegressionState(
+            n,
+            self.mean_x + delta_x * other.n / n,
+            self.mean_y + delta_y * other.n / n,
+            self.m2_x + other.m2_x + delta_x * delta_x * weight,
+            self.m2_y + other.m2_y + delta_y * delta_y * weight,
+            self.c_xy + other.c_xy + delta_x * delta_y * weight,
+        )
+
+    def update(self, x, y):
+        """Add a chunk of points to this state (in place), returns self"""
+        merged = self.merge(RegressionState.from_arrays(x, y))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    # ---- results ----
+
+    @property
+    def slope(self):
+        if self.m2_x == 0:
+            raise ValueError("Need at least two different x values")
+        return self.c_xy / self.m2_x
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def r_squared(self):
+        """
+        Goodness of fit (0 to 1), from the same sums - no second pass
+
+        nan when all y are equal (nothing to explain)
+        """
+        if self.m2_x == 0:
+            raise ValueError("Need at least two different x values")
+        if self.m2_y == 0:
+            return float('nan')
+        return self.c_xy * self.c_xy / (self.m2_x * self.m2_y)
+
+    @property
+    def variance_x(self):
+        return self.m2_x / self.n
+
+    @property
+    def variance_y(self):
+        return self.m2_y / self.n
+
+    @property
+    def covariance(self):
+        return self.c_xy / self.n
+
+    def fit(self):
+        """Returns: (m, b) of the best line y = mx + b"""
+        return self.slope, self.intercept
+
+    def __repr__(self):
+        return (f"RegressionState(n={self.n}, mean_x={self.mean_x!r}, mean_y={self.mean_y!r}, "
+                f"m2_x={self.m2_x!r}, m2_y={self.m2_y!r}, c_xy={self.c_xy!r})")
+
+
+# ========================================
+# CHUNKS AND FILES
+# ========================================
+
+def fit_stream(chunks):
+    """
+    One pass over an iterable of (x, y) chunks
+
+    Returns the final RegressionState (use .fit(), .r_squared)
+    """
+    state = RegressionState()
+    for chunk in chunks:
+        if not (isinstance(chunk, (tuple, list)) and len(chunk) == 2):
+            raise ValueError("Each chunk must be an (x, y) pair - got one column?")
+        state.update(*chunk)
+    return state
+
+
+def _npy_range_state(path, start, stop, chunk_rows):
+    # Worker: state of rows start..stop of a two-column .npy file
+    data = np.load(path, mmap_mode='r')
+    state = RegressionState()
+    for i in range(start, stop, chunk_rows):
+        rows = np.asarray(data[i:min(i + chunk_rows, stop)], dtype=float)
+        state.update(rows[:, 0], rows[:, 1])
+    return state
+
+
+def fit_file(path, chunk_rows=1_000_000, workers=1):
+    """
+    Best line through the (x, y) points in a CSV or .npy file
+
+    The file needs two columns (x, y) and is read chunk by chunk, so
+    it can be far bigger than memory. For .npy files, workers > 1
+    splits the rows into one range per process and merges the states.
+
+    Returns the final RegressionState
+    """
+    if not str(path).endswith('.npy') or workers == 1:
+        return fit_stream(xy_chunks(path, chunk_rows))
+
+    shape = np.load(path, mmap_mode='r').shape
+    if len(shape) != 2 or shape[1] < 2:
+        raise ValueError(f"{path} needs two columns (x, y)")
+    rows = shape[0]
+    ranges = np.linspace(0, rows, workers + 1).astype(int)
+    tasks = [(path, start, stop, chunk_rows)
+             for start, stop in zip(ranges[:-1], ranges[1:]) if stop > start]
+
+    # Only loaded when worker processes are really used
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        states = list(pool.map(_npy_range_state, *zip(*tasks)))
+
+    state = RegressionState()
+    for part in states:
+        state = state.merge(part)
+    return state
@@ -5,6 +5,12 @@
 import numpy as np  # numpy = math calculator for lists/arrays
 import math         # math = basic math functions like sqrt, exp, etc.
 import matplotlib.pyplot as plt  # matplotlib = makes graphs!
+from Modularized.expressions import compile_expression  # typed formulas -> numpy functions
+from Modularized.gradient_descent import fit_line_iterative  # fast gradient descent
+from Modularized.polynomial_sweep import degree_sweep, best_degree  # all degrees in one pass
+from Modularized.lu_solver import solve_mixed_precision  # float32 solve + float64 refinement
+from Modularized.finite_differences import adaptive_derivative  # Richardson tableau, picks h itself
+from Modularized.streaming_regression import RegressionState  # one-pass centered sums for the line fit
 
 # ========================================
 # PART 1: GAUSSIAN ELIMINATION
@@ -83,93 +89,239 @@ def solve_gaussian(equations, answers):
         return None
 
 
-# NEW FUNCTION - ADD THIS AFTER solve_gaussian
-def solve_gaussian_manual(equations, answers):
+def solve_gaussian_mixed(equations, answers, max_refinements=10):
     """
-    MANUAL Gaussian Elimination - Shows every step!
-    This is how you solve equations by hand in math class
+    MIXED PRECISION: solve in float32, then fix the answer up to float64
     
-    Steps:
-    1. Forward Elimination - Make lower triangle zeros
-    2. Back Substitution - Solve from bottom to top
+    1. Solve with float32 numbers (less memory, faster on big systems)
+    2. Compute the error (residual) with float64 numbers
+    3. Solve for a correction in float32 and add it on
+    4. Repeat until the backward error is as small as float64 allows
+    
+    If the corrections stop helping (badly conditioned equations),
+    we give up and solve normally in float64.
+    The work is done by solve_mixed_precision in Modularized/lu_solver.py,
+    this just prints what happened.
     """
-    print("\n--- Solving MANUALLY (step-by-step) ---")
+    print("\n--- Solving with MIXED PRECISION (float32 + refinement) ---")
     
-    # Get the size (how many equations)
-    n = len(equations)
+    try:
+        x, info = solve_mixed_precision(equations, answers, max_refinements)
+    except np.linalg.LinAlgError:
+        print("ERROR: Cannot solve! Equations might be inconsistent.")
+        return None
     
-    # Make a copy so we don't change the original
-    # We combine equations and answers into one matrix [A|b]
-    matrix = []
-    for i in range(n):
-        row = equations[i].copy()  # Copy the equation
-        row.append(answers[i])      # Add the answer at the end
-        matrix.append(row)
+    refined = info['history'][:-1] if info['fell_back'] else info['history']
+    for step, error in enumerate(refined):
+        print(f"  Step {step}: backward error = {error:.2e}")
+    if info['fell_back']:
+        print("  Refinement stalled - solving again in full float64")
     
-    print("\nStarting matrix [Equations | Answers]:")
-    print_matrix(matrix)
+    print("\nSOLUTION:")
+    for i, value in enumerate(x):
+        var_name = chr(120 + i)  # x, y, z, etc.
+        print(f"  {var_name} = {value:.4f}")
+    print(f"Backward error: {info['backward_error']:.2e}")
     
-    # STEP 1: FORWARD ELIMINATION
-    # Goal: Make all numbers below the diagonal = 0
-    print("\n=== STEP 1: FORWARD ELIMINATION ===")
+    return x
+
+
+# Record types for the elimination trace
+TRACE_SWAP = 0       # swap pivot_row and target_row
+TRACE_ELIMINATE = 1  # target_row = target_row - factor × pivot_row
+
+TRACE_DTYPE = np.dtype([
+    ('op', np.int8),
+    ('pivot_row', np.int32),
+    ('target_row', np.int32),
+    ('factor', np.float64),
+])
+
+
+class EliminationTrace:
+    """
+    Compact record of every row operation done by Gaussian Elimination
     
-    for col in range(n):  # For each column (variable)
-        print(f"\nWorking on column {col} (variable {chr(120 + col)}):")
-        
+    Instead of printing the whole matrix after every step (n³ lines!),
+    we save one small record per operation:
+        (op, pivot_row, target_row, factor)
+    Any step can be rebuilt later by replaying the records
+    on the starting matrix. Nothing is printed until you ask.
+    """
+    
+    def __init__(self, start_matrix, records, perm):
+        self.start_matrix = start_matrix  # [Equations | Answers] before elimination
+        self.records = records            # structured array, one row per operation
+        self.perm = perm                  # perm[i] = original equation now in row i
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def describe(self, k):
+        """One line of text for step k (steps start at 1)"""
+        op, pivot_row, target_row, factor = self.records[k - 1].tolist()
+        if op == TRACE_SWAP:
+            return f"Step {k}: Swap row {pivot_row} with row {target_row}"
+        return f"Step {k}: Row {target_row}: Subtract {factor:.4f} × Row {pivot_row}"
+    
+    def replay(self, k):
+        """Matrix after the first k steps"""
+        matrix = self.start_matrix.copy()
+        for record in self.records[:k]:
+            _apply_record(matrix, record)
+        return matrix
+    
+    def iter_steps(self, start=1, stop=None):
+        """
+        Go through the steps one by one, without redoing earlier ones
+        Yields (k, text, changed_rows, matrix) - matrix is the live copy
+        """
+        stop = len(self) if stop is None else stop
+        matrix = self.replay(start - 1)
+        for k in range(start, stop + 1):
+            record = self.records[k - 1]
+            _apply_record(matrix, record)
+            if record['op'] == TRACE_SWAP:
+                changed = [int(record['pivot_row']), int(record['target_row'])]
+            else:
+                changed = [int(record['target_row'])]
+            yield k, self.describe(k), changed, matrix
+    
+    def show_step(self, k):
+        """Print step k and only the rows it changed"""
+        for _, text, changed, matrix in self.iter_steps(k, k):
+            print(text)
+            for row in changed:
+                print(f"  row {row}: " + format_row(matrix[row]))
+    
+    def show_steps(self, start=1, stop=None, file=None):
+        """Print a range of steps (changed rows only), to screen or to a file"""
+        for _, text, changed, matrix in self.iter_steps(start, stop):
+            print(text, file=file)
+            for row in changed:
+                print(f"  row {row}: " + format_row(matrix[row]), file=file)
+    
+    def export(self, filename):
+        """Write every step to a text file"""
+        with open(filename, "w", encoding="utf-8") as f:
+            print("Starting matrix [Equations | Answers]:", file=f)
+            for row in self.start_matrix:
+                print("  " + format_row(row), file=f)
+            print(file=f)
+            self.show_steps(file=f)
+
+
+def _apply_record(matrix, record):
+    # Do one recorded row operation on matrix (in place)
+    pivot_row, target_row = record['pivot_row'], record['target_row']
+    if record['op'] == TRACE_SWAP:
+        matrix[[pivot_row, target_row]] = matrix[[target_row, pivot_row]]
+    else:
+        matrix[target_row] -= record['factor'] * matrix[pivot_row]
+
+
+def eliminate_with_trace(equations, answers):
+    """
+    Gaussian Elimination with partial pivoting that RECORDS its steps
+    
+    Each column is eliminated in one numpy operation, and all the row
+    operations of that column are written to the trace at once.
+    
+    Returns: (solution, trace) - solution is None if it can't be solved
+    """
+    n = len(equations)
+    
+    # [A|b] as a numpy array
+    matrix = np.hstack([np.array(equations, dtype=float),
+                        np.array(answers, dtype=float).reshape(-1, 1)])
+    start_matrix = matrix.copy()
+    
+    # At most one swap per column + one elimination per entry below the diagonal
+    records = np.zeros(n + n * (n - 1) // 2, dtype=TRACE_DTYPE)
+    count = 0
+    perm = np.arange(n)
+    
+    for col in range(n):
         # Find the biggest number in this column (pivot)
-        # This makes the calculation more accurate
-        max_row = col
-        for row in range(col + 1, n):
-            if abs(matrix[row][col]) > abs(matrix[max_row][col]):
-                max_row = row
+        max_row = col + int(np.argmax(np.abs(matrix[col:, col])))
         
-        # Swap rows if needed
         if max_row != col:
-            print(f"  Swapping row {col} with row {max_row}")
-            matrix[col], matrix[max_row] = matrix[max_row], matrix[col]
-            print_matrix(matrix)
+            matrix[[col, max_row]] = matrix[[max_row, col]]
+            perm[[col, max_row]] = perm[[max_row, col]]
+            records[count] = (TRACE_SWAP, col, max_row, 0.0)
+            count += 1
         
         # Check if pivot is zero (can't divide by zero!)
         if abs(matrix[col][col]) < 0.0001:
-            print("ERROR: Cannot solve! (Division by zero)")
-            return None
+            return None, EliminationTrace(start_matrix, records[:count], perm)
         
-        # Eliminate all rows below this one
-        for row in range(col + 1, n):
-            # Calculate the factor to multiply
-            factor = matrix[row][col] / matrix[col][col]
-            print(f"  Row {row}: Subtract {factor:.4f} × Row {col}")
-            
-            # Subtract: row = row - factor * col_row
-            for j in range(n + 1):  # +1 because we include the answer
-                matrix[row][j] -= factor * matrix[col][j]
-            
-            print_matrix(matrix)
+        # All the factors for this column, then one subtraction for all rows below
+        factors = matrix[col + 1:, col] / matrix[col, col]
+        matrix[col + 1:] -= np.outer(factors, matrix[col])
+        
+        # Record: row (col+1+i) minus factors[i] × row col
+        rows = len(factors)
+        block = records[count:count + rows]
+        block['op'] = TRACE_ELIMINATE
+        block['pivot_row'] = col
+        block['target_row'] = np.arange(col + 1, n)
+        block['factor'] = factors
+        count += rows
+    
+    # Back substitution (bottom row first)
+    solution = np.zeros(n)
+    for i in range(n - 1, -1, -1):
+        solution[i] = (matrix[i, n] - matrix[i, i + 1:n] @ solution[i + 1:]) / matrix[i, i]
+    
+    return solution, EliminationTrace(start_matrix, records[:count], perm)
+
+
+# Steps printed by solve_gaussian_manual before it stops (a 200x200 system has ~20000)
+MAX_SHOWN_STEPS = 50
+
+
+# NEW FUNCTION - ADD THIS AFTER solve_gaussian
+def solve_gaussian_manual(equations, answers, show_steps=True, max_steps=MAX_SHOWN_STEPS):
+    """
+    MANUAL Gaussian Elimination - Shows every step!
+    This is how you solve equations by hand in math class
+    
+    Steps:
+    1. Forward Elimination - Make lower triangle zeros
+    2. Back Substitution - Solve from bottom to top
+    
+    The steps are recorded in a trace first and printed afterwards
+    (only the rows that changed), so big systems stay fast.
+    Only the first max_steps steps are printed (None = all of them);
+    use eliminate_with_trace() directly to replay or export the rest.
+    """
+    print("\n--- Solving MANUALLY (step-by-step) ---")
+    
+    solution, trace = eliminate_with_trace(equations, answers)
+    
+    print("\nStarting matrix [Equations | Answers]:")
+    print_matrix(trace.start_matrix)
+    
+    # STEP 1: FORWARD ELIMINATION
+    print(f"\n=== STEP 1: FORWARD ELIMINATION ({len(trace)} row operations) ===")
+    if show_steps:
+        shown = len(trace) if max_steps is None else min(max_steps, len(trace))
+        trace.show_steps(1, shown)
+        if shown < len(trace):
+            print(f"... {len(trace) - shown} more steps not shown "
+                  f"(eliminate_with_trace(...)[1].export(filename) writes them all)")
+    
+    if solution is None:
+        print("ERROR: Cannot solve! (Division by zero)")
+        return None
     
     print("\n=== After Forward Elimination ===")
-    print_matrix(matrix)
+    print_matrix(trace.replay(len(trace)))
     
     # STEP 2: BACK SUBSTITUTION
-    # Goal: Solve from bottom to top
     print("\n=== STEP 2: BACK SUBSTITUTION ===")
-    
-    # Create list to store solutions
-    solution = [0.0] * n
-    
-    # Start from the last equation and work backwards
-    for i in range(n - 1, -1, -1):  # n-1, n-2, ..., 1, 0
+    for i in range(len(solution) - 1, -1, -1):
         var_name = chr(120 + i)
-        
-        # Start with the answer (right side)
-        solution[i] = matrix[i][n]  # n is the answer column
-        
-        # Subtract all known variables
-        for j in range(i + 1, n):
-            solution[i] -= matrix[i][j] * solution[j]
-        
-        # Divide by the coefficient
-        solution[i] /= matrix[i][i]
-        
         print(f"  {var_name} = {solution[i]:.4f}")
     
     print("\n=== FINAL SOLUTION ===")
@@ -177,7 +329,12 @@ def solve_gaussian_manual(equations, answers):
         var_name = chr(120 + i)
         print(f"  {var_name} = {value:.4f}")
     
-    return solution
+    return solution.tolist()
+
+
+def format_row(row):
+    """One matrix row as text, 4 decimal places"""
+    return "[ " + "  ".join(f"{num:8.4f}" for num in row) + " ]"
 
 
 def print_matrix(matrix):
@@ -187,8 +344,7 @@ def print_matrix(matrix):
     """
     for row in matrix:
         # Format each number to 4 decimal places
-        formatted = [f"{num:8.4f}" for num in row]
-        print("  [ " + "  ".join(formatted) + " ]")
+        print("  " + format_row(row))
 
 
 # UPDATE get_user_equations to ask which method
@@ -204,14 +360,17 @@ def gaussian_menu():
     print("Choose solving method:")
     print("1. NumPy (Fast, no steps shown)")
     print("2. Manual (Slow, shows every step)")
+    print("3. Mixed precision (float32 + refinement)")
     print("="*50)
     
-    method = input("Choice (1-2): ")
+    method = input("Choice (1-3): ")
     
     if method == "1":
         solve_gaussian(equations, answers)
     elif method == "2":
         solve_gaussian_manual(equations, answers)
+    elif method == "3":
+        solve_gaussian_mixed(equations, answers)
     else:
         print("Invalid choice! Using NumPy...")
         solve_gaussian(equations, answers)
@@ -231,54 +390,118 @@ def simple_function(x):
     return x**2 + 2*x + 1
 
 
-def forward_difference(x, h):
+def ask_function(default):
+    """
+    Let the user type their own f(x), like sin(x)*exp(-x**2)
+    Press Enter to keep the default
+    
+    The formula is checked (only numbers, x, pi, e, + - * / ** and
+    functions like sin, exp, log, sqrt) and compiled once - typing the
+    same formula again reuses the compiled version
+    """
+    while True:
+        text = input(f"Enter f(x) (press Enter for {default}): ").strip() or default
+        try:
+            return compile_expression(text)
+        except ValueError as error:
+            print(f"  Can't use that: {error}")
+
+
+def show_derivative(name, x, derivative):
+    """
+    Print a derivative result
+    One line for a single x, a short summary for an array of x values
+    """
+    if np.ndim(derivative) == 0:
+        print(f"{name}: f'({x}) ≈ {derivative:.6f}")
+    else:
+        print(f"{name}: computed {np.size(derivative)} derivatives "
+              f"(from {np.min(derivative):.6f} to {np.max(derivative):.6f})")
+
+
+def forward_difference(x, h, f=simple_function):
     """
     Forward Difference: Look ahead
     Formula: f'(x) ≈ [f(x+h) - f(x)] / h
+    
+    x can be one number or a numpy array of points (all done at once),
+    and f can be any function that works on numpy arrays
     """
+    x = np.asarray(x, dtype=float)
+    
     # Calculate function at x and x+h
-    f_x = simple_function(x)
-    f_x_plus_h = simple_function(x + h)
+    f_x = f(x)
+    f_x_plus_h = f(x + h)
     
     # Apply formula
     derivative = (f_x_plus_h - f_x) / h
     
-    print(f"Forward Difference: f'({x}) ≈ {derivative:.6f}")
+    show_derivative("Forward Difference", x, derivative)
     return derivative
 
 
-def backward_difference(x, h):
+def backward_difference(x, h, f=simple_function):
     """
     Backward Difference: Look behind
     Formula: f'(x) ≈ [f(x) - f(x-h)] / h
+    
+    x can be one number or a numpy array of points (all done at once),
+    and f can be any function that works on numpy arrays
     """
+    x = np.asarray(x, dtype=float)
+    
     # Calculate function at x and x-h
-    f_x = simple_function(x)
-    f_x_minus_h = simple_function(x - h)
+    f_x = f(x)
+    f_x_minus_h = f(x - h)
     
     # Apply formula
     derivative = (f_x - f_x_minus_h) / h
     
-    print(f"Backward Difference: f'({x}) ≈ {derivative:.6f}")
+    show_derivative("Backward Difference", x, derivative)
     return derivative
 
 
-def central_difference(x, h):
+def central_difference(x, h, f=simple_function):
     """
     Central Difference: Look both ways (most accurate!)
     Formula: f'(x) ≈ [f(x+h) - f(x-h)] / 2h
+    
+    x can be one number or a numpy array of points (all done at once),
+    and f can be any function that works on numpy arrays
     """
+    x = np.asarray(x, dtype=float)
+    
     # Calculate function at x+h and x-h
-    f_x_plus_h = simple_function(x + h)
-    f_x_minus_h = simple_function(x - h)
+    f_x_plus_h = f(x + h)
+    f_x_minus_h = f(x - h)
     
     # Apply formula
     derivative = (f_x_plus_h - f_x_minus_h) / (2 * h)
     
-    print(f"Central Difference: f'({x}) ≈ {derivative:.6f}")
+    show_derivative("Central Difference", x, derivative)
     return derivative
 
 
+def adaptive_difference(x, f=simple_function, tolerance=1e-10, max_levels=12):
+    """
+    ADAPTIVE step size with Richardson extrapolation
+    No need to guess h!
+    
+    1. Central difference with h, h/2, h/4, ...
+    2. Combine neighbours to cancel the h² error, then h⁴, ... (the tableau)
+    3. Stop when two diagonal entries agree to within the tolerance
+    
+    The tableau is adaptive_derivative in Modularized/finite_differences.py,
+    this just prints its answer.
+    """
+    derivative, error, evaluations = adaptive_derivative(f, x, tol=tolerance, max_levels=max_levels)
+    derivative, error = float(derivative), float(error)
+    
+    print(f"Adaptive (Richardson): f'({x}) ≈ {derivative:.10f}")
+    print(f"  Error estimate: {error:.2e}, function evaluations: {evaluations}")
+    return derivative, error, evaluations
+
+
 def differentiation_menu():
     """
     Let user choose differentiation method
@@ -286,15 +509,16 @@ def differentiation_menu():
     print("\n" + "="*50)
     print("NUMERICAL DIFFERENTIATION")
     print("="*50)
-    print("Function: f(x) = x² + 2x + 1")
-    print("Exact derivative: f'(x) = 2x + 2")
+    f = ask_function("x**2 + 2*x + 1")
+    print(f"Function: f(x) = {f.text}")
+    print(f"Exact derivative: f'(x) = {f.derivative.text}")
     
     # Get x value from user
     x = float(input("\nEnter x value: "))
     h = float(input("Enter step size h (try 0.01): "))
     
-    # Calculate exact answer for comparison
-    exact = 2*x + 2
+    # Calculate exact answer for comparison (from the symbolic derivative)
+    exact = f.derivative(x)
     print(f"\nExact answer: f'({x}) = {exact}")
     print("\nNumerical methods:")
     
@@ -304,20 +528,23 @@ def differentiation_menu():
     print("2. Backward Difference")
     print("3. Central Difference")
     print("4. Compare all three!")
+    print("5. Adaptive (picks h by itself)")
     
-    choice = input("Choice (1-4): ")
+    choice = input("Choice (1-5): ")
     
     if choice == "1":
-        forward_difference(x, h)
+        forward_difference(x, h, f)
     elif choice == "2":
-        backward_difference(x, h)
+        backward_difference(x, h, f)
     elif choice == "3":
-        central_difference(x, h)
+        central_difference(x, h, f)
     elif choice == "4":
         print("\nComparing all methods:")
-        forward_difference(x, h)
-        backward_difference(x, h)
-        central_difference(x, h)
+        forward_difference(x, h, f)
+        backward_difference(x, h, f)
+        central_difference(x, h, f)
+    elif choice == "5":
+        adaptive_difference(x, f)
 
 
 # ========================================
@@ -334,63 +561,62 @@ def analytical_regression(x_points, y_points):
     print("\n--- ANALYTICAL METHOD ---")
     print("This solves using direct formulas (fast!)")
     
-    n = len(x_points)
+    # Work with distances from the averages ("centered" sums), see
+    # Modularized/streaming_regression.py - the same code as the GUI uses.
+    # The formula m = (n*sum_xy - sum_x*sum_y) / (n*sum_x2 - sum_x²) is the
+    # same on paper, but it subtracts two huge, almost equal numbers when
+    # there are many points or x is far from 0, and the answer gets lost
+    state = RegressionState.from_arrays(x_points, y_points)
     
-    # Calculate sums needed for formulas
-    sum_x = sum(x_points)
-    sum_y = sum(y_points)
-    sum_xy = sum(x_points[i] * y_points[i] for i in range(n))
-    sum_x2 = sum(x * x for x in x_points)
-    
-    # Formula for slope (m)
-    m = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-    
-    # Formula for intercept (b)
-    b = (sum_y - m * sum_x) / n
+    # Slope m = sum(dx*dy) / sum(dx²), and the line goes through the averages
+    m, b = state.fit()
     
     print(f"Result: y = {m:.4f}x + {b:.4f}")
+    print(f"R² (how well the line fits, 1 = perfect): {state.r_squared:.4f}")
     return m, b
 
 
-def iterative_regression(x_points, y_points, learning_rate=0.01, iterations=1000):
+def iterative_regression(x_points, y_points, learning_rate=0.01, iterations=1000,
+                         mode="batch", optimizer="sgd", batch_size=32, tolerance=1e-12):
     """
     ITERATIVE METHOD (Gradient Descent)
     This guesses the answer and improves it step by step
     Like climbing down a hill to find the lowest point
+    
+    mode: "batch" (all points per step), "minibatch" (batch_size points per step)
+          or "stochastic" (batch_size random points per step)
+    optimizer: "sgd" (plain steps), "momentum" or "adam"
+    Stops early once the error stops changing (tolerance)
+    
+    The work is done on numpy arrays by Modularized/gradient_descent.py,
+    so millions of points take seconds
     """
     print("\n--- ITERATIVE METHOD (Gradient Descent) ---")
     print("This starts with a guess and improves it step by step")
     
-    # Start with random guess
-    m = 0.0  # slope
-    b = 0.0  # intercept
-    n = len(x_points)
-    
-    print(f"Starting guess: y = {m}x + {b}")
-    print(f"Learning rate: {learning_rate}, Iterations: {iterations}")
-    
-    # Improve guess many times
-    for i in range(iterations):
-        # Predict y values with current m and b
-        y_predicted = [m * x + b for x in x_points]
-        
-        # Calculate error
-        error = [(y_predicted[j] - y_points[j]) for j in range(n)]
-        
-        # Update m and b to reduce error
-        # These formulas come from calculus (derivatives)
-        m_gradient = (2/n) * sum(error[j] * x_points[j] for j in range(n))
-        b_gradient = (2/n) * sum(error)
-        
-        # Take a small step in the right direction
-        m = m - learning_rate * m_gradient
-        b = b - learning_rate * b_gradient
-        
-        # Show progress every 200 steps
-        if (i+1) % 200 == 0:
-            avg_error = sum(abs(e) for e in error) / n
-            print(f"  Step {i+1}: y = {m:.4f}x + {b:.4f}, Error: {avg_error:.4f}")
-    
+    # Start with a guess of m = 0, b = 0 (the engine's default)
+    print("Starting guess: y = 0.0x + 0.0")
+    print(f"Learning rate: {learning_rate}, Max iterations: {iterations}, "
+          f"Mode: {mode}, Optimizer: {optimizer}")
+    
+    def show_progress(step, weights, loss):
+        # Called whenever the error is measured, show progress every 200 steps
+        if step > 0 and step % 200 == 0:
+            print(f"  Step {step}: y = {weights[0]:.4f}x + {weights[1]:.4f}, Error (MSE): {loss:.4f}")
+    
+    m, b, info = fit_line_iterative(x_points, y_points, mode=mode, optimizer=optimizer,
+                                    learning_rate=learning_rate, max_epochs=iterations,
+                                    batch_size=batch_size, loss_tol=tolerance,
+                                    callback=show_progress)
+    
+    if info["converged"]:
+        print(f"Converged after {info['epochs']} iterations")
+    elif info["reason"] == "loss_tol":
+        # The error stopped changing, but the slope may still be far from flat
+        print(f"Stopped after {info['epochs']} iterations: the error stopped changing "
+              f"(gradient size {info['gradient_norm']:.1e})")
+    elif info["reason"] != "max_epochs":
+        print(f"Stopped: {info['reason']}")
     print(f"Final result: y = {m:.4f}x + {b:.4f}")
     return m, b
 
@@ -426,11 +652,27 @@ def polynomial_regression(x_points, y_points, degree=2):
     return coefficients, poly_function
 
 
-def plot_polynomial_regression(x_points, y_points, degree_list=[1, 2, 3]):
+def plot_polynomial_regression(x_points, y_points, degree_list=None, sweep=None):
     """
     Plot data with different polynomial curves
     Shows how curves fit better than lines for curved data
+    
+    degree_list defaults to [1, 2, 3]; degrees above (points - 1) are
+    skipped, since n points can't pin down more than n coefficients.
+    All the degrees come from one degree_sweep (pass sweep to reuse one
+    that was already computed)
     """
+    n = len(x_points)
+    if n < 2:
+        print("ERROR: Need at least 2 points to fit a curve!")
+        return
+    if degree_list is None:
+        degree_list = [1, 2, 3]
+    degree_list = [degree for degree in degree_list if 1 <= degree <= n - 1]
+    if not degree_list:
+        print(f"ERROR: With {n} points the degree must be between 1 and {n - 1}")
+        return
+    
     print("\n📊 Creating polynomial comparison graph...")
     
     plt.figure(figsize=(12, 6))
@@ -445,9 +687,13 @@ def plot_polynomial_regression(x_points, y_points, degree_list=[1, 2, 3]):
     colors = ['blue', 'red', 'green', 'purple', 'orange']
     line_styles = ['-', '--', '-.', ':']
     
-    # Fit and plot each polynomial degree
+    # Fit every degree up to the highest one at once
+    if sweep is None or max(degree_list) > sweep["degrees"][-1]:
+        sweep = degree_sweep(x_points, y_points, max(degree_list))
+    
+    # Plot each polynomial degree
     for i, degree in enumerate(degree_list):
-        coeffs, poly_func = polynomial_regression(x_points, y_points, degree)
+        poly_func = sweep["functions"][degree - 1]
         
         # Calculate y values for the smooth curve
         y_smooth = poly_func(x_smooth)
@@ -499,6 +745,12 @@ def polynomial_menu():
     
     print(f"\nData points: {list(zip(x_points, y_points))}")
     
+    # n points can fit at most degree n - 1
+    max_allowed = len(x_points) - 1
+    if max_allowed < 1:
+        print("ERROR: Need at least 2 points to fit a curve!")
+        return
+    
     # Ask what degree polynomial
     print("\nWhat degree polynomial?")
     print("1 = Line (y = mx + b)")
@@ -511,16 +763,34 @@ def polynomial_menu():
     if choice == "0":
         # Compare multiple degrees
         print("\n=== Comparing Different Polynomial Degrees ===")
-        for deg in [1, 2, 3]:
-            polynomial_regression(x_points, y_points, deg)
+        
+        # Degrees 1, 2, 3 in one pass (one QR, one new column per degree)
+        max_degree = min(3, max_allowed)
+        sweep = degree_sweep(x_points, y_points, max_degree)
+        
+        # AIC / BIC: lower is better, they punish extra coefficients
+        print(f"{'Degree':>6} | {'Error (RSS)':>12} | {'R²':>8} | {'AIC':>8} | {'BIC':>8}")
+        print("-" * 54)
+        for i, deg in enumerate(sweep["degrees"]):
+            print(f"{deg:6d} | {sweep['rss'][i]:12.4f} | {sweep['r_squared'][i]:8.4f} | "
+                  f"{sweep['aic'][i]:8.2f} | {sweep['bic'][i]:8.2f}")
+        for deg, poly_func in zip(sweep["degrees"], sweep["functions"]):
+            print(f"\nDegree {deg}:\n{poly_func}")
+        print(f"\nBest degree by BIC: {best_degree(sweep)}")
         
         # Show graph
         show_graph = input("\nShow comparison graph? (y/n): ").lower()
         if show_graph == 'y':
-            plot_polynomial_regression(x_points, y_points, [1, 2, 3])
+            plot_polynomial_regression(x_points, y_points, list(sweep["degrees"]), sweep)
     else:
         # Single degree
         degree = int(choice)
+        if degree < 1:
+            print("ERROR: Degree must be at least 1")
+            return
+        if degree > max_allowed:
+            print(f"Only {len(x_points)} points - using degree {max_allowed} instead of {degree}")
+            degree = max_allowed
         coeffs, poly_func = polynomial_regression(x_points, y_points, degree)
         
         # Show graph
@@ -554,7 +824,8 @@ def test_function_derivative(x):
     return 2 * x
 
 
-def newtons_method(x0, tolerance=0.0001, max_iterations=50):
+def newtons_method(x0, tolerance=0.0001, max_iterations=50,
+                   f=test_function, f_derivative=test_function_derivative, name="x² - 4"):
     """
     NEWTON'S METHOD
     Find where f(x) = 0 by making better and better guesses
@@ -564,9 +835,10 @@ def newtons_method(x0, tolerance=0.0001, max_iterations=50):
     x0 = starting guess
     tolerance = how close to zero is "good enough"
     max_iterations = give up after this many tries
+    f, f_derivative = the function and its derivative (name is for printing)
     """
     print("\n--- NEWTON'S METHOD ---")
-    print("Finding where f(x) = x² - 4 equals zero")
+    print(f"Finding where f(x) = {name} equals zero")
     print(f"Starting guess: x = {x0}")
     print(f"Tolerance: {tolerance}")
     
@@ -577,8 +849,8 @@ def newtons_method(x0, tolerance=0.0001, max_iterations=50):
     
     for i in range(max_iterations):
         # Calculate function value and derivative at current x
-        fx = test_function(x)
-        fpx = test_function_derivative(x)
+        fx = f(x)
+        fpx = f_derivative(x)
         
         # Check if derivative is zero (can't divide by zero!)
         if abs(fpx) < 0.000001:
@@ -604,25 +876,26 @@ def newtons_method(x0, tolerance=0.0001, max_iterations=50):
         x = x_new
     
     print(f"\n⚠️ Did not converge after {max_iterations} iterations")
-    print(f"Last value: x = {x:.6f}, f(x) = {test_function(x):.6f}")
+    print(f"Last value: x = {x:.6f}, f(x) = {f(x):.6f}")
     return x
 
 
-def bisection_method(a, b, tolerance=0.0001, max_iterations=50):
+def bisection_method(a, b, tolerance=0.0001, max_iterations=50, f=test_function, name="x² - 4"):
     """
     BISECTION METHOD (Alternative to Newton's)
     Repeatedly cut the interval in half
     Slower but more reliable than Newton's method
     
     a, b = interval endpoints (must have opposite signs)
+    f = the function (name is for printing)
     """
     print("\n--- BISECTION METHOD ---")
-    print("Finding where f(x) = x² - 4 equals zero")
+    print(f"Finding where f(x) = {name} equals zero")
     print(f"Starting interval: [{a}, {b}]")
     
     # Check if there's a root in this interval
-    fa = test_function(a)
-    fb = test_function(b)
+    fa = f(a)
+    fb = f(b)
     
     if fa * fb > 0:
         print("ERROR: Function has same sign at both ends!")
@@ -635,7 +908,7 @@ def bisection_method(a, b, tolerance=0.0001, max_iterations=50):
     for i in range(max_iterations):
         # Find the middle point
         c = (a + b) / 2
-        fc = test_function(c)
+        fc = f(c)
         
         print(f"{i+1:9d} | {a:5.4f} | {b:5.4f} | {c:6.4f} | {fc:9.6f}")
         
@@ -665,8 +938,9 @@ def root_finding_menu():
     print("\n" + "="*50)
     print("ROOT FINDING METHODS")
     print("="*50)
-    print("Function: f(x) = x² - 4")
-    print("This has roots at x = 2 and x = -2")
+    f = ask_function("x**2 - 4")
+    print(f"Function: f(x) = {f.text}")
+    print(f"Derivative (for Newton's): f'(x) = {f.derivative.text}")
     
     print("\nWhich method?")
     print("1. Newton's Method (fast, needs good starting guess)")
@@ -677,25 +951,25 @@ def root_finding_menu():
     
     if choice == "1":
         x0 = float(input("\nEnter starting guess: "))
-        newtons_method(x0)
+        newtons_method(x0, f=f, f_derivative=f.derivative, name=f.text)
         
     elif choice == "2":
         print("\nEnter interval [a, b] where root exists")
         a = float(input("  Left endpoint (a): "))
         b = float(input("  Right endpoint (b): "))
-        bisection_method(a, b)
+        bisection_method(a, b, f=f, name=f.text)
         
     elif choice == "3":
         print("\n=== NEWTON'S METHOD ===")
         x0 = float(input("Starting guess for Newton's: "))
-        root_newton = newtons_method(x0)
+        root_newton = newtons_method(x0, f=f, f_derivative=f.derivative, name=f.text)
         
         print("\n" + "="*50)
         print("\n=== BISECTION METHOD ===")
         print("Enter interval [a, b] where root exists")
         a = float(input("  Left endpoint (a): "))
         b = float(input("  Right endpoint (b): "))
-        root_bisection = bisection_method(a, b)
+        root_bisection = bisection_method(a, b, f=f, name=f.text)
         
         if root_newton and root_bisection:
             print("\n" + "="*50)
@@ -784,7 +1058,12 @@ def regression_menu():
     print(f"\nData points: {list(zip(x_points, y_points))}")
     
     # Run BOTH regression methods
-    m1, b1 = analytical_regression(x_points, y_points)
+    try:
+        m1, b1 = analytical_regression(x_points, y_points)
+    except ValueError as error:
+        # Every x the same: no line through the points has a slope
+        print(f"Can't fit a line: {error}")
+        return
     m2, b2 = iterative_regression(x_points, y_points)
     
     # Compare results
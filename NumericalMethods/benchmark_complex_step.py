@@ -0,0 +1,41 @@
+# Benchmark: accuracy per function evaluation, complex step vs the finite-difference stencils
+# run:  python benchmark_complex_step.py
+#       python benchmark_complex_step.py --points 100000
+#
+# the sweep, the error / cost records and the table come from benchmark_derivatives.py,
+# this script only picks the stencils, complex step and a few test functions
+# (the full suite with dual numbers, adaptive steps, json and plots is benchmark_derivatives.py)
+
+import argparse
+from Modularized.expressions import compile_expression
+from benchmark_derivatives import run_benchmark, print_summary
+
+METHODS = ["forward", "central", "central4", "central6", "complex"]
+
+TEST_FUNCTIONS = [
+    "sin(x)",
+    "exp(x)",
+    "x**3 - 2*x",
+    # classic test from Squire & Trapp: lots of cancellation for the stencils
+    "exp(x) / sqrt(sin(x)**3 + cos(x)**3)",
+]
+
+STEPS = [10.0 ** -k for k in range(1, 21)]
+X_RANGE = [0.1, 1.4]  # sin^3 + cos^3 > 0 here
+
+
+def run_comparison(points, repeat=3, functions=TEST_FUNCTIONS):
+    # every method over the whole h sweep, records as in benchmark_derivatives.run_benchmark
+    functions = [compile_expression(text).text for text in functions]
+    return functions, run_benchmark(functions, METHODS, STEPS, points, X_RANGE, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare complex-step derivatives with finite-difference stencils")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--tolerance", type=float, default=1e-12,
+                        help="the summary names the cheapest method below this error")
+    args = parser.parse_args()
+
+    functions, results = run_comparison(args.points)
+    print_summary(results, functions, args.tolerance)
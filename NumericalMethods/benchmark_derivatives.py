@@ -0,0 +1,191 @@
+# Benchmark suite: accuracy and cost of every derivative method over a sweep of step sizes
+# run:  python benchmark_derivatives.py
+#       python benchmark_derivatives.py --tolerance 1e-8 --json results.json --plot error_vs_h.png
+#       python benchmark_derivatives.py --functions "sin(x)" "x**x" --methods central central4 --points 100000
+#
+# for every test function and method, h goes over --decades (10^-1 ... 10^-20 by default, the
+# stencils get worse again for tiny h, complex step doesn't) and each run records the max relative
+# error, the number of f evaluations and the wall time. the summary picks, per function, the
+# cheapest method (fewest evaluations, then time) that reaches the tolerance. no window is
+# opened: the plot is written to a file
+#
+# benchmark_complex_step.py reuses run_benchmark / print_summary for its smaller comparison
+
+import argparse
+import json
+import time
+import numpy as np
+from Modularized.finite_differences import (STENCIL_OFFSETS, derivative, complex_step_derivative,
+                                            adaptive_derivative, function_evaluations)
+from Modularized.dual_numbers import dual_derivative
+from Modularized.expressions import compile_expression
+
+# test functions as expressions: the exact derivative comes from the symbolic derivative
+TEST_FUNCTIONS = [
+    "x**2 + 2*x + 1",                            # simple_function
+    "sin(x)",
+    "exp(x)",
+    "sin(x)*exp(-x**2)",
+    "log(1 + x**2)",
+    "x**x",
+    "1 / (1 + 25*x**2)",                         # Runge function, large higher derivatives
+    "exp(x) / sqrt(sin(x)**3 + cos(x)**3)",      # Squire & Trapp test, lots of cancellation
+]
+
+# methods that take a step h; 'dual' and 'adaptive' don't and get one row each
+STEP_METHODS = list(STENCIL_OFFSETS) + ["complex"]
+FIXED_METHODS = ["dual", "adaptive"]
+
+
+def evaluate(method, f, x, h):
+    # returns (derivative values, number of f evaluations)
+    if method == "complex":
+        return complex_step_derivative(f, x, h), np.size(x)
+    if method == "dual":
+        return dual_derivative(f, x), np.size(x)
+    if method == "adaptive":
+        result, _, evaluations = adaptive_derivative(f, x)
+        return result, evaluations
+    return derivative(f, x, h, method), function_evaluations(x, method)
+
+
+def run_case(method, f, x, exact, h, repeat):
+    # best-of-repeat wall time, max relative error
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        approx, evaluations = evaluate(method, f, x, h)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    with np.errstate(all="ignore"):
+        error = np.max(np.abs(approx - exact) / np.maximum(1.0, np.abs(exact)))
+    return {"method": method, "h": h, "max_error": float(error) if np.isfinite(error) else None,
+            "evaluations": int(evaluations), "evaluations_per_point": evaluations / np.size(x),
+            "seconds": seconds}
+
+
+def run_benchmark(functions, methods, steps, points, x_range, repeat):
+    x = np.linspace(*x_range, points)
+    results = []
+    for text in functions:
+        f = compile_expression(text)
+        exact = f.derivative(x)
+        for method in methods:
+            for h in (steps if method in STEP_METHODS else [None]):
+                record = run_case(method, f, x, exact, h, repeat)
+                record["function"] = f.text
+                results.append(record)
+    return results
+
+
+def best_runs(results):
+    # best step size per (function, method)
+    best = {}
+    for record in results:
+        if record["max_error"] is None:
+            continue
+        key = (record["function"], record["method"])
+        if key not in best or record["max_error"] < best[key]["max_error"]:
+            best[key] = record
+    return best
+
+
+def cheapest_methods(results, tolerance):
+    # per function: the method with the fewest evaluations (then least time) meeting the tolerance
+    choice = {}
+    for (function, method), record in best_runs(results).items():
+        if record["max_error"] > tolerance:
+            continue
+        cost = (record["evaluations_per_point"], record["seconds"])
+        if function not in choice or cost < choice[function][0]:
+            choice[function] = (cost, record)
+    return {function: record for function, (_, record) in choice.items()}
+
+
+def print_summary(results, functions, tolerance):
+    best = best_runs(results)
+    cheapest = cheapest_methods(results, tolerance)
+
+    for function in functions:
+        print(f"\nf(x) = {function}")
+        print(f"{'method':>9} | {'best h':>7} | {'max rel err':>11} | {'evals/pt':>8} | "
+              f"{'digits/eval':>11} | {'time (s)':>8}")
+        print("-" * 70)
+        for (name, method), record in best.items():
+            if name != function:
+                continue
+            h = "-" if record["h"] is None else f"{record['h']:7.0e}"
+            # correct digits bought by each evaluation of f
+            digits = -np.log10(max(record["max_error"], 1e-17)) / record["evaluations_per_point"]
+            print(f"{method:>9} | {h:>7} | {record['max_error']:11.1e} | "
+                  f"{record['evaluations_per_point']:8.1f} | {digits:11.2f} | {record['seconds']:8.4f}")
+
+        if function in cheapest:
+            record = cheapest[function]
+            h = "" if record["h"] is None else f" with h = {record['h']:.0e}"
+            print(f"cheapest for error <= {tolerance:.0e}: {record['method']}{h}")
+        else:
+            print(f"no method reaches error <= {tolerance:.0e}")
+
+
+def plot_results(results, functions, path):
+    import matplotlib
+    matplotlib.use("Agg")  # headless, straight to a file
+    import matplotlib.pyplot as plt
+
+    columns = min(len(functions), 3)
+    rows = -(-len(functions) // columns)
+    fig, axes = plt.subplots(rows, columns, figsize=(5 * columns, 4 * rows), squeeze=False)
+
+    for ax, function in zip(axes.flat, functions):
+        for method in dict.fromkeys(r["method"] for r in results if r["h"] is not None):
+            runs = [r for r in results if r["function"] == function and r["method"] == method
+                    and r["max_error"] is not None]
+            h = [r["h"] for r in runs]
+            error = [max(r["max_error"], 1e-17) for r in runs]
+            ax.loglog(h, error, marker="o", markersize=3, label=method)
+        ax.set_title(f"f(x) = {function}", fontsize=10)
+        ax.set_xlabel("h")
+        ax.set_ylabel("max relative error")
+        ax.grid(True, which="both", alpha=0.3)
+    for ax in list(axes.flat)[len(functions):]:
+        ax.set_visible(False)
+    axes.flat[0].legend(fontsize=8)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy and cost of every derivative method over a sweep of h")
+    parser.add_argument("--functions", nargs="+", default=TEST_FUNCTIONS, help="expressions in x")
+    parser.add_argument("--methods", nargs="+", default=STEP_METHODS + FIXED_METHODS,
+                        choices=STEP_METHODS + FIXED_METHODS)
+    parser.add_argument("--decades", type=int, nargs=2, default=[1, 20], metavar=("FIRST", "LAST"),
+                        help="h goes from 10^-FIRST down to 10^-LAST")
+    parser.add_argument("--points", type=int, default=10000, help="x values per run (one batch)")
+    parser.add_argument("--x-range", type=float, nargs=2, default=[0.1, 1.4])
+    parser.add_argument("--repeat", type=int, default=3, help="timing is the best of this many runs")
+    parser.add_argument("--tolerance", type=float, default=1e-8)
+    parser.add_argument("--json", help="write all runs and the summary to this file")
+    parser.add_argument("--plot", help="save a log-log error vs h plot to this image file")
+    args = parser.parse_args()
+
+    steps = [10.0 ** -k for k in range(args.decades[0], args.decades[1] + 1)]
+    functions = [compile_expression(text).text for text in args.functions]
+
+    results = run_benchmark(functions, args.methods, steps, args.points, args.x_range, args.repeat)
+    print_summary(results, functions, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"settings": {"points": args.points, "x_range": args.x_range,
+                                    "tolerance": args.tolerance, "steps": steps},
+                       "runs": results,
+                       "cheapest": cheapest_methods(results, args.tolerance)}, file, indent=2)
+        print(f"\nresults written to {args.json}")
+
+    if args.plot:
+        plot_results(results, functions, args.plot)
+        print(f"plot written to {args.plot}")
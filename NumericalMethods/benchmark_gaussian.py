@@ -0,0 +1,59 @@
+# Benchmark: gaussian.gaussian_elimination vs np.linalg.solve
+# run:  python benchmark_gaussian.py
+#       python benchmark_gaussian.py --sizes 10 100 1000 --block 64
+
+import argparse
+import time
+import numpy as np
+from gaussian import gaussian_elimination
+
+DEFAULT_SIZES = [10, 50, 100, 250, 500, 1000, 2000, 4000]
+
+
+def time_call(func, repeats):
+    # best of a few runs, so one slow run doesn't ruin the number
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(sizes, block_size, skip_unblocked_above):
+    rng = np.random.default_rng(0)
+
+    print(f"{'n':>6} | {'numpy':>10} | {'rank-1':>10} | {'blocked':>10} | {'blocked/numpy':>13} | {'residual':>9}")
+    print("-" * 74)
+
+    for n in sizes:
+        A = rng.standard_normal((n, n))
+        B = rng.standard_normal(n)
+        repeats = 3 if n <= 1000 else 1
+
+        t_numpy, _ = time_call(lambda: np.linalg.solve(A, B), repeats)
+
+        # the column-by-column version gets very slow for huge n, so it can be skipped
+        if n <= skip_unblocked_above:
+            t_rank1, _ = time_call(lambda: gaussian_elimination(A, B), repeats)
+            rank1_text = f"{t_rank1:10.4f}"
+        else:
+            rank1_text = f"{'skipped':>10}"
+
+        t_blocked, x = time_call(lambda: gaussian_elimination(A, B, block_size), repeats)
+
+        # relative residual tells us the answer is actually right
+        residual = np.linalg.norm(A @ x - B) / (np.linalg.norm(A) * np.linalg.norm(x))
+
+        print(f"{n:6d} | {t_numpy:10.4f} | {rank1_text} | {t_blocked:10.4f} | {t_blocked / t_numpy:13.1f} | {residual:9.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time gaussian_elimination against np.linalg.solve")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--block", type=int, default=64, help="panel width for the blocked variant")
+    parser.add_argument("--skip-unblocked-above", type=int, default=2000,
+                        help="don't time the rank-1 version for n bigger than this")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.block, args.skip_unblocked_above)
@@ -0,0 +1,62 @@
+# Benchmark: perturbation-based numerical_gradients vs the copy-and-recompute loop
+# run:  python benchmark_gradients.py
+#       python benchmark_gradients.py --rows 2000 --dims 10 100 1000 10000
+
+import argparse
+import time
+import numpy as np
+from differentiation import compute_cost, numerical_gradients
+
+DEFAULT_DIMS = [10, 100, 1000, 3000, 10000]
+
+
+def loop_gradients(weights, X, y, h=1e-5):
+    # the old way: copy the weights and recompute X.dot(weights) for every coordinate
+    gradients = np.zeros_like(weights)
+    for i in range(len(weights)):
+        weights_plus = weights.copy()
+        weights_minus = weights.copy()
+        weights_plus[i] += h
+        weights_minus[i] -= h
+        gradients[i] = (compute_cost(weights_plus, X, y) - compute_cost(weights_minus, X, y)) / (2*h)
+    return gradients
+
+
+def run_benchmark(rows, dims, skip_loop_above):
+    rng = np.random.default_rng(0)
+
+    print(f"rows = {rows}, central differences")
+    print(f"{'d':>6} | {'loop (s)':>9} | {'perturb (s)':>11} | {'speedup':>8} | {'max error':>9}")
+    print("-" * 56)
+
+    for d in dims:
+        X = rng.standard_normal((rows, d))
+        y = rng.standard_normal(rows)
+        weights = rng.standard_normal(d) / np.sqrt(d)
+
+        start = time.perf_counter()
+        fast = numerical_gradients(weights, X, y)
+        t_fast = time.perf_counter() - start
+
+        # exact gradient of the MSE, to check accuracy
+        exact = 2 * X.T.dot(X.dot(weights) - y) / rows
+        error = np.max(np.abs(fast - exact))
+
+        if d <= skip_loop_above:
+            start = time.perf_counter()
+            loop_gradients(weights, X, y)
+            t_loop = time.perf_counter() - start
+            print(f"{d:6d} | {t_loop:9.4f} | {t_fast:11.4f} | {t_loop / t_fast:8.1f} | {error:9.1e}")
+        else:
+            print(f"{d:6d} | {'skipped':>9} | {t_fast:11.4f} | {'-':>8} | {error:9.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time numerical_gradients against the per-coordinate loop")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--dims", type=int, nargs="+", default=DEFAULT_DIMS)
+    parser.add_argument("--skip-loop-above", type=int, default=3000,
+                        help="don't time the loop version for d bigger than this")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.dims, args.skip_loop_above)
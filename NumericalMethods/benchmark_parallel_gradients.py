@@ -0,0 +1,79 @@
+# Scaling benchmark: parallel_gradients with 1..N worker processes on a slow black-box cost
+# run:  python benchmark_parallel_gradients.py
+#       python benchmark_parallel_gradients.py --dims 32 --delay 0.1 --workers 1 2 4 8
+#       python benchmark_parallel_gradients.py --iterations 20   (new pool per call vs one reused pool)
+
+import argparse
+import time
+import numpy as np
+from parallel_gradients import GradientEvaluator, parallel_gradients
+from parallel_lu import default_workers
+
+
+class SlowCost:
+    # stands in for an expensive simulation: the MSE plus a fixed delay per call
+    def __init__(self, delay):
+        self.delay = delay
+
+    def __call__(self, weights, X, y):
+        time.sleep(self.delay)
+        return np.mean((X @ weights - y) ** 2)
+
+
+def run_benchmark(rows, d, delay, worker_counts):
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((rows, d))
+    y = rng.standard_normal(rows)
+    weights = rng.standard_normal(d)
+    exact = 2 * X.T @ (X @ weights - y) / rows
+    cost = SlowCost(delay)
+
+    print(f"rows = {rows}, d = {d}, {2*d} calls of {delay} s, cores available = {default_workers()}")
+    print(f"{'workers':>8} | {'time (s)':>9} | {'speedup':>8} | {'max error':>9}")
+    print("-" * 44)
+
+    base_time = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        gradients = parallel_gradients(weights, X, y, cost, workers=workers)
+        elapsed = time.perf_counter() - start
+        base_time = base_time or elapsed
+        error = np.max(np.abs(gradients - exact))
+        print(f"{workers:8d} | {elapsed:9.3f} | {base_time / elapsed:8.2f} | {error:9.1e}")
+
+
+def run_reuse_benchmark(rows, d, delay, workers, iterations):
+    # an optimizer needs one gradient per iteration: compare a fresh pool per call with one evaluator
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((rows, d))
+    y = rng.standard_normal(rows)
+    weights = rng.standard_normal(d)
+    cost = SlowCost(delay)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parallel_gradients(weights, X, y, cost, workers=workers)
+    fresh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with GradientEvaluator(X, y, cost, workers) as evaluator:
+        for _ in range(iterations):
+            evaluator.gradient(weights)
+    reused = time.perf_counter() - start
+
+    print(f"\n{iterations} gradients with {workers} workers:")
+    print(f"  new pool every call:   {fresh:6.3f} s")
+    print(f"  one GradientEvaluator: {reused:6.3f} s ({fresh / reused:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time parallel_gradients with different worker counts")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dims", type=int, default=16)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds per cost call")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, default_workers()])
+    parser.add_argument("--iterations", type=int, default=10, help="gradients for the pool reuse comparison")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.dims, args.delay, args.workers)
+    run_reuse_benchmark(args.rows, args.dims, args.delay, max(args.workers), args.iterations)
@@ -0,0 +1,60 @@
+# Scaling benchmark: parallel block LU with 1..N worker threads
+# run:  python benchmark_parallel_lu.py
+#       python benchmark_parallel_lu.py --n 4000 --block 256 --workers 1 2 4 8
+
+import os
+
+# one BLAS thread per worker, otherwise numpy's own threading hides the pool's speedup
+# (has to be set before numpy is imported)
+for var in ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]:
+    os.environ.setdefault(var, "1")
+
+import argparse
+import time
+import numpy as np
+from parallel_lu import parallel_gaussian_elimination, default_workers
+
+
+def run_benchmark(n, block_size, worker_counts):
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((n, n))
+    B = rng.standard_normal(n)
+
+    print(f"n = {n}, block = {block_size}, cores available = {default_workers()}")
+    print(f"{'workers':>8} | {'time (s)':>9} | {'speedup':>8} | {'efficiency':>10}")
+    print("-" * 45)
+
+    base_time = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        x = parallel_gaussian_elimination(A, B, block_size, workers)
+        elapsed = time.perf_counter() - start
+
+        if not np.allclose(A @ x, B):
+            print(f"{workers:8d} | wrong answer!")
+            continue
+
+        if base_time is None:
+            base_time = elapsed
+        speedup = base_time / elapsed
+
+        print(f"{workers:8d} | {elapsed:9.3f} | {speedup:8.2f} | {speedup / workers:10.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speedup of parallel block LU from 1 to N workers")
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--block", type=int, default=128)
+    parser.add_argument("--workers", type=int, nargs="+")
+    args = parser.parse_args()
+
+    # default: 1, 2, 4, ... up to the number of cores
+    worker_counts = args.workers
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= default_workers():
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != default_workers():
+            worker_counts.append(default_workers())
+
+    run_benchmark(args.n, args.block, worker_counts)
@@ -1,40 +1,58 @@
 import numpy as np
+from Modularized.dual_numbers import dual_gradient
 
 # this is for the calculation of the Mean Squared Error, serves as the 'f(x)'
+# (X @ weights rather than X.dot(weights) so dual-number weights work too)
 def compute_cost(weights, X, y):
-    predictions = X.dot(weights)
+    predictions = X @ weights
     errors = predictions - y
     return np.mean(errors ** 2)
 
+# how many numbers the (rows x columns) perturbation block may hold at once
+CHUNK_ELEMENTS = 2**22
+
 # this calculates the cost of function with respect of each weight depending on the numerical method the user uses.
+#
+# moving weight i by h only moves the predictions by h * X[:, i], so the predictions are computed once
+# and every perturbed cost is (errors + h*X[:, i])**2 averaged -- O(n*d) instead of d full X.dot(weights).
+# the columns are done together in one broadcasted block (chunked so memory stays bounded)
+#
+# method="dual" gives the exact gradient instead: compute_cost is run once on dual numbers
+# (forward-mode automatic differentiation, see Modularized/dual_numbers.py), h is ignored
 def numerical_gradients(weights, X, y, method = "central", h=1e-5):
-    gradients = np.zeros_like(weights)
+    if method == "centralized":  # old name
+        method = "central"
+    if method == "dual":
+        return dual_gradient(compute_cost, weights, np.asarray(X, dtype=float), y)
+    if method not in ("forward", "backward", "central"):
+        raise ValueError(f"unknown method: {method}")
+
+    X = np.asarray(X, dtype=float)
+    errors = X.dot(weights) - y
+    cost_current = np.mean(errors ** 2)
+
+    n, d = X.shape
+    gradients = np.zeros(d)
+    chunk = max(1, CHUNK_ELEMENTS // max(n, 1))
 
-    for i in range(len(weights)):
-        
-        weights_plus = weights.copy()
-        weights_minus = weights.copy()
+    for start in range(0, d, chunk):
+        cols = slice(start, min(start + chunk, d))
+        shift = h * X[:, cols]  # column i = change in predictions when weight i moves by h
 
         if method == "forward":
-            # f'(x) = (f(x+deltax)+ f(x)) / (deltax)
-            weights_plus[i] += h
-            cost_plus = compute_cost(weights_plus, X, y)
-            cost_current = compute_cost(weights, X, y)
-            gradients[i] = (cost_plus - cost_current) / h
+            # f'(x) = (f(x+deltax) - f(x)) / (deltax)
+            cost_plus = np.mean((errors[:, None] + shift) ** 2, axis=0)
+            gradients[cols] = (cost_plus - cost_current) / h
 
         elif method == "backward":
             # f'(x) = (f(x) - f(x - deltax)) / (deltax)
-            weights_plus[i] -= h
-            cost_plus       = compute_cost(weights, X, y)
-            cost_minus      = compute_cost(weights_minus, X, y)
-            gradients[i]    = (cost_current - cost_minus) / h
+            cost_minus = np.mean((errors[:, None] - shift) ** 2, axis=0)
+            gradients[cols] = (cost_current - cost_minus) / h
 
-        elif method == "centralized":
+        else:
             # f'(x) = (f(x + deltax) - f(x - deltax)) / 2(deltax)
-            weights_plus[i] += h 
-            weights_minus[i] -= h
-            cost_plus = compute_cost(weights_plus, X, y)
-            cost_minus = compute_cost(weights_minus, X, y)
-            gradients[i]    = (cost_plus - cost_minus) / (2*h)
+            cost_plus = np.mean((errors[:, None] + shift) ** 2, axis=0)
+            cost_minus = np.mean((errors[:, None] - shift) ** 2, axis=0)
+            gradients[cols] = (cost_plus - cost_minus) / (2*h)
 
-    return gradients
\ No newline at end of file
+    return gradients
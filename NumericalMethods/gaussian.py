@@ -1,26 +1,20 @@
 import numpy as np
+from Modularized.lu_solver import lu_decompose, factor_panel, lu_solve
 
-def gaussian_elimination(A,B):
-    n = len(B)
+# the LU routines themselves live in Modularized/lu_solver.py (one implementation for
+# the whole project), this file keeps the plain A x = B entry point
+#   lu_decompose(A, block_size) - factors A in place, returns perm or None if singular
+#   factor_panel(...)           - eliminates one panel of columns, False if singular
+#   lu_solve(LU, perm, B)       - forward then back substitution
 
-    # create augmented matrix
-    Aug = np.hstack([A, B.reshape(-1, 1)]).astype(float)
 
-    # forward elim
-    for i in range(n):
-        # pivot checking
-        if Aug[i][i] == 0.0:
-            print('Error, Divide by 0 detected...')
-            return None
-        
-        for j in range(i + 1, n):
-            ratio = Aug[j][i] / Aug[i][i]
-            Aug[j] = Aug[j] - ratio*Aug[i] #ratio * row i subtracted by row j
+def gaussian_elimination(A, B, block_size=None):
+    # copy so the caller's matrix isn't overwritten by the factors
+    LU = np.array(A, dtype=float)
 
-    x = np.zeros(n)
+    # None means a zero pivot was found, the caller decides what to tell the user
+    perm = lu_decompose(LU, block_size)
+    if perm is None:
+        return None
 
-    # this starts from last row then goes backward
-    for i in range(n -1, -1, -1):
-        x[i] = (Aug[i][n] - np.sum(Aug[i][i+1:n]*x[i+1:n])) / Aug[i][i] #(right side - sum of knowns) / coeff of unknown
-
-    return x
+    return lu_solve(LU, perm, B)
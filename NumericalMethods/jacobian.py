@@ -0,0 +1,110 @@
+import numpy as np
+from Modularized.sparse_solvers import CSRMatrix
+
+# sparse jacobians and hessians by finite differences with column coloring
+#
+# column by column differencing needs one evaluation per variable. but two columns that never
+# have a nonzero in the same row ("structurally orthogonal") can be moved together: each row of
+# F(x + h*(e_i + e_j)) - F(x) only sees one of them. so the columns are colored so that no two
+# columns of the same color share a row, and it costs one evaluation per COLOR instead.
+# a tridiagonal jacobian needs 3 colors no matter how many variables there are.
+
+
+# pattern: a 2D array (nonzero/True = may be nonzero) or a CSRMatrix
+# returns the (row, col) positions and the shape
+def pattern_positions(pattern):
+    if isinstance(pattern, CSRMatrix):
+        return pattern.row_ids, pattern.indices, pattern.shape
+    pattern = np.asarray(pattern)
+    rows, cols = np.nonzero(pattern)
+    return rows, cols, pattern.shape
+
+
+# pattern of a banded matrix: lower diagonals below, upper above the main one.
+# built one diagonal at a time as (row, col) lists, so it costs O(n * band) memory, not n*n
+def banded_pattern(n, lower, upper):
+    rows, cols = [], []
+    for offset in range(-min(lower, n - 1), min(upper, n - 1) + 1):
+        diagonal_rows = np.arange(max(0, -offset), min(n, n - offset))
+        rows.append(diagonal_rows)
+        cols.append(diagonal_rows + offset)
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    return CSRMatrix.from_coo(rows, cols, np.ones(len(rows)), (n, n))
+
+
+# greedy coloring of the column intersection graph (columns are neighbours if they share a row).
+# columns with the most nonzeros are colored first, each takes the smallest color none of its
+# neighbours has. returns one color (0, 1, 2, ...) per column
+def color_columns(pattern):
+    rows, cols, (m, n) = pattern_positions(pattern)
+
+    # rows of each column, and columns of each row
+    by_col = np.argsort(cols, kind="stable")
+    col_start = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=n))))
+    col_rows = rows[by_col]
+    by_row = np.argsort(rows, kind="stable")
+    row_start = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=m))))
+    row_cols = cols[by_row]
+
+    colors = np.full(n, -1)
+    for j in np.argsort(-np.diff(col_start), kind="stable"):
+        touched_rows = col_rows[col_start[j]:col_start[j + 1]]
+        neighbours = np.concatenate([row_cols[row_start[r]:row_start[r + 1]] for r in touched_rows]) \
+            if len(touched_rows) else np.empty(0, dtype=int)
+        used = colors[neighbours]
+        used = np.unique(used[used >= 0])
+
+        # smallest color not in used
+        free = np.flatnonzero(np.arange(len(used) + 1) != np.append(used, -1))
+        colors[j] = free[0]
+
+    return colors
+
+
+# jacobian of a vector function F(x) (m outputs, n inputs) that is known to be sparse.
+# forward costs (colors + 1) evaluations of F, central 2*colors.
+# returns a CSRMatrix with the pattern's positions
+def sparse_jacobian(F, x, pattern, h=1e-7, method="forward", colors=None):
+    if method not in ("forward", "central"):
+        raise ValueError(f"unknown method: {method}")
+
+    x = np.asarray(x, dtype=float)
+    rows, cols, shape = pattern_positions(pattern)
+    if colors is None:
+        colors = color_columns(pattern)
+
+    values = np.zeros(len(rows))
+    F_current = np.asarray(F(x), dtype=float) if method == "forward" else None
+
+    for color in range(colors.max() + 1 if len(colors) else 0):
+        # move every column of this color by h at the same time
+        step = h * (colors == color)
+
+        if method == "forward":
+            difference = (np.asarray(F(x + step), dtype=float) - F_current) / h
+        else:
+            difference = (np.asarray(F(x + step), dtype=float) - np.asarray(F(x - step), dtype=float)) / (2*h)
+
+        # row i of the difference belongs to the only column of this color that touches row i
+        here = colors[cols] == color
+        values[here] = difference[rows[here]]
+
+    return CSRMatrix.from_coo(rows, cols, values, shape)
+
+
+# hessian of a scalar cost from its gradient function (the hessian is the jacobian of the gradient).
+# gradient can be exact or numerical, e.g. lambda w: numerical_gradients(w, X, y, method="dual")
+# the hessian is symmetric, so the pattern is made symmetric and the result averaged with its transpose
+def sparse_hessian(gradient, x, pattern, h=1e-5, method="central", colors=None):
+    rows, cols, shape = pattern_positions(pattern)
+    # pattern joined with its transpose, kept sparse (duplicate positions merge in from_coo)
+    both_rows = np.concatenate([rows, cols])
+    both_cols = np.concatenate([cols, rows])
+    symmetric = CSRMatrix.from_coo(both_rows, both_cols, np.ones(len(both_rows)), shape)
+
+    H = sparse_jacobian(gradient, x, symmetric, h, method, colors)
+
+    # (H + H^T) / 2 on the same positions
+    rows = np.concatenate([H.row_ids, H.indices])
+    cols = np.concatenate([H.indices, H.row_ids])
+    return CSRMatrix.from_coo(rows, cols, np.concatenate([H.data, H.data]) / 2, H.shape)
@@ -0,0 +1,142 @@
+import math
+import numpy as np
+from Modularized.lu_solver import factor_panel
+
+# out-of-core LU: the matrix lives in a file (np.memmap) and only a few tiles are in RAM at once
+#
+# resident at any time:
+#   - one column panel  A[k:, k:k+tile]  (needed for partial pivoting down the whole column)
+#   - two tile x tile blocks of the trailing matrix
+# so memory is about (n + 2*tile) * tile numbers no matter how big the file is
+
+
+def tile_size_for_memory(n, memory_bytes, itemsize=8):
+    # biggest tile t so that the panel + 2 tiles fit in memory_bytes:
+    # n*t + 2*t*t <= numbers, solved for t with the quadratic formula
+    numbers = memory_bytes // itemsize
+    tile = (math.isqrt(n * n + 8 * numbers) - n) // 4
+    return int(min(max(tile, 1), n))
+
+
+def open_matrix(path, n, dtype=float, mode='r+'):
+    # n x n matrix stored row by row in a raw binary file
+    return np.memmap(path, dtype=dtype, mode=mode, shape=(n, n))
+
+
+def factor_out_of_core(A, tile_size, progress=None):
+    # factors the memmap A in place: P*A = L*U, tile by tile
+    # progress(stage, step, total_steps) is called after every panel
+    # returns the row moves per panel, needed by solve_out_of_core
+    n = A.shape[0]
+    panels = range(0, n, tile_size)
+
+    # one streaming pass for the biggest entry, used for the singular check
+    scale = 0.0
+    for i in range(0, n, tile_size):
+        scale = max(scale, float(np.abs(A[i:i+tile_size]).max()))
+    tiny = np.finfo(float).eps * n * (scale or 1.0)
+
+    moves = []
+
+    for step, k in enumerate(panels):
+        end = min(k + tile_size, n)
+
+        # factor the whole column panel in memory (pivots can come from any row below)
+        panel = np.array(A[k:, k:end], dtype=float)
+        perm = np.arange(n - k)
+        if not factor_panel(panel, perm, 0, end - k, tiny):
+            raise np.linalg.LinAlgError("Singular matrix")
+        A[k:, k:end] = panel
+
+        # only the swapped rows need to move in the other columns
+        moved = np.flatnonzero(perm != np.arange(n - k))
+        dst, src = k + moved, k + perm[moved]
+        moves.append((dst, src))
+
+        L11 = np.tril(panel[:end-k], -1) + np.eye(end - k)
+        L21 = panel[end-k:]
+
+        # trailing update, one column of tiles at a time (columns left of the panel are untouched,
+        # solve_out_of_core applies the row moves in the same order instead)
+        for j in range(end, n, tile_size):
+            j_end = min(j + tile_size, n)
+
+            if len(moved):
+                A[dst, j:j_end] = A[src, j:j_end]
+
+            # U12 tile = inv(L11) * A12 tile
+            U1j = np.linalg.solve(L11, A[k:end, j:j_end])
+            A[k:end, j:j_end] = U1j
+
+            # A22 tiles -= L21 * U12
+            for i in range(end, n, tile_size):
+                i_end = min(i + tile_size, n)
+                tile = np.array(A[i:i_end, j:j_end])
+                tile -= L21[i-end:i_end-end] @ U1j
+                A[i:i_end, j:j_end] = tile
+
+        if isinstance(A, np.memmap):
+            A.flush()
+
+        if progress is not None:
+            progress('factor', step + 1, len(panels))
+
+    return moves
+
+
+def solve_out_of_core(A, moves, B, tile_size, progress=None):
+    # forward then back substitution, streaming the factors from A one tile at a time
+    n = A.shape[0]
+    y = np.array(B, dtype=float)
+    panels = list(range(0, n, tile_size))
+    total = 2 * len(panels)
+
+    # forward: same row moves as the factorization, then L, panel by panel
+    for step, k in enumerate(panels):
+        end = min(k + tile_size, n)
+        dst, src = moves[step]
+        y[dst] = y[src]
+
+        L11 = np.tril(A[k:end, k:end], -1) + np.eye(end - k)
+        y[k:end] = np.linalg.solve(L11, y[k:end])
+
+        for i in range(end, n, tile_size):
+            i_end = min(i + tile_size, n)
+            y[i:i_end] -= A[i:i_end, k:end] @ y[k:end]
+
+        if progress is not None:
+            progress('solve', step + 1, total)
+
+    # backward: last panel first, then push the knowns up into the rows above
+    for step, k in enumerate(reversed(panels)):
+        end = min(k + tile_size, n)
+
+        U11 = np.triu(A[k:end, k:end])
+        y[k:end] = np.linalg.solve(U11, y[k:end])
+
+        for i in range(0, k, tile_size):
+            i_end = min(i + tile_size, k)
+            y[i:i_end] -= A[i:i_end, k:end] @ y[k:end]
+
+        if progress is not None:
+            progress('solve', len(panels) + step + 1, total)
+
+    return y
+
+
+def solve_matrix_file(path, B, n, memory_bytes=256 * 2**20, work_path=None, progress=None):
+    # solves A x = B where A is an n x n float64 matrix in a raw binary file
+    # work_path=None factors the file in place (it gets overwritten by L and U),
+    # otherwise the matrix is first copied there tile row by tile row
+    tile_size = tile_size_for_memory(n, memory_bytes)
+    A = open_matrix(path, n, mode='r+' if work_path is None else 'r')
+
+    if work_path is not None:
+        work = open_matrix(work_path, n, mode='w+')
+        for i in range(0, n, tile_size):
+            work[i:i+tile_size] = A[i:i+tile_size]
+        work.flush()
+        A = work
+
+    moves = factor_out_of_core(A, tile_size, progress)
+    return solve_out_of_core(A, moves, B, tile_size, progress)
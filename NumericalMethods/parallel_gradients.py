@@ -0,0 +1,145 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from differentiation import compute_cost
+from parallel_lu import default_workers
+
+# parallel numerical gradient for expensive black-box costs
+# numerical_gradients uses a shortcut that only works for the MSE. when the cost is some
+# slow simulation (seconds per call) all that's left is to call it d*2 times -- but the calls
+# don't depend on each other, so they're sent to a process pool.
+#
+# X and y are copied ONCE into shared memory and every worker maps the same block, instead of
+# pickling the whole dataset into every task. the tasks only carry (weight index, step) pairs.
+# pool.map returns the chunks in the order they were given, so the result doesn't depend on
+# which worker finished first.
+#
+# cost has to be a top-level function (it's pickled to the workers), called as cost(weights, X, y)
+
+# what a worker sees: filled in once per process by _attach
+_worker = {}
+
+
+def _share(array):
+    # copy an array into a new shared memory block
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block
+
+
+def _attach(x_name, x_shape, y_name, y_shape, cost):
+    # pool initializer: map the shared X and y (read only) and remember the cost
+    x_block = shared_memory.SharedMemory(name=x_name)
+    y_block = shared_memory.SharedMemory(name=y_name)
+    X = np.ndarray(x_shape, dtype=float, buffer=x_block.buf)
+    y = np.ndarray(y_shape, dtype=float, buffer=y_block.buf)
+    X.flags.writeable = False
+    y.flags.writeable = False
+    _worker.update(X=X, y=y, cost=cost, blocks=(x_block, y_block))
+
+
+def _evaluate_chunk(weights, indices, steps):
+    # cost with weights[i] moved by step, for every (i, step) in the chunk
+    X, y, cost = _worker["X"], _worker["y"], _worker["cost"]
+    costs = np.empty(len(indices))
+    for k, (i, step) in enumerate(zip(indices, steps)):
+        moved = weights.copy()
+        if i >= 0:  # i = -1 is the unmoved weights
+            moved[i] += step
+        costs[k] = cost(moved, X, y)
+    return costs
+
+
+def _perturbations(d, method, h):
+    # the (index, step) pairs a method needs, in a fixed order
+    index = np.arange(d)
+    if method == "central":
+        return np.concatenate([index, index]), np.concatenate([np.full(d, h), np.full(d, -h)])
+    step = h if method == "forward" else -h
+    return np.append(index, -1), np.append(np.full(d, step), 0.0)
+
+
+def _check_method(method):
+    if method == "centralized":  # old name
+        method = "central"
+    if method not in ("forward", "backward", "central"):
+        raise ValueError(f"unknown method: {method}")
+    return method
+
+
+class GradientEvaluator:
+    # keeps the worker pool and the shared X and y alive between gradients, so an optimizer
+    # that needs one gradient per iteration pays the process start-up and the copy only once
+    #
+    #   with GradientEvaluator(X, y, cost, workers=4) as evaluator:
+    #       for step in range(iterations):
+    #           weights -= rate * evaluator.gradient(weights)
+    #
+    # X, y and cost are fixed for the life of the evaluator (the workers mapped them at start)
+
+    def __init__(self, X, y, cost=compute_cost, workers=None):
+        X = np.ascontiguousarray(X, dtype=float)
+        y = np.ascontiguousarray(y, dtype=float)
+        self.workers = workers or default_workers()
+        self._blocks = (_share(X), _share(y))
+        try:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_attach,
+                initargs=(self._blocks[0].name, X.shape, self._blocks[1].name, y.shape, cost))
+        except BaseException:
+            self._free_blocks()
+            raise
+
+    def gradient(self, weights, method="central", h=1e-5, chunk_size=None):
+        method = _check_method(method)
+        if self._pool is None:
+            raise ValueError("the evaluator is closed")
+        weights = np.asarray(weights, dtype=float)
+        d = len(weights)
+
+        indices, steps = _perturbations(d, method, h)
+        if chunk_size is None:
+            # about 4 chunks per worker: few enough to keep overhead low, enough to balance the load
+            chunk_size = max(1, -(-len(indices) // (4 * self.workers)))
+        starts = range(0, len(indices), chunk_size)
+        index_chunks = [indices[s:s + chunk_size] for s in starts]
+        step_chunks = [steps[s:s + chunk_size] for s in starts]
+
+        chunks = self._pool.map(_evaluate_chunk, [weights] * len(index_chunks), index_chunks, step_chunks)
+        costs = np.concatenate(list(chunks))
+
+        if method == "central":
+            # f'(x) = (f(x + deltax) - f(x - deltax)) / 2(deltax)
+            return (costs[:d] - costs[d:]) / (2*h)
+        if method == "forward":
+            # f'(x) = (f(x+deltax) - f(x)) / (deltax)
+            return (costs[:d] - costs[d]) / h
+        # f'(x) = (f(x) - f(x - deltax)) / (deltax)
+        return (costs[d] - costs[:d]) / h
+
+    def close(self):
+        # stop the workers, then free the shared memory (safe to call twice)
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._free_blocks()
+
+    def _free_blocks(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parallel_gradients(weights, X, y, cost=compute_cost, method="central", h=1e-5,
+                       workers=None, chunk_size=None):
+    # one-off gradient: starts a pool, uses it once and shuts it down
+    # (for one gradient per iteration use a GradientEvaluator instead)
+    method = _check_method(method)
+    with GradientEvaluator(X, y, cost, workers) as evaluator:
+        return evaluator.gradient(weights, method, h, chunk_size)
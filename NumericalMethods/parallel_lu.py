@@ -0,0 +1,70 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from Modularized.lu_solver import factor_panel, lu_solve
+
+# parallel blocked LU
+# the panel is factored by one thread (pivot search is sequential), then the U12 tiles
+# and the trailing-matrix tiles are handed to a thread pool as independent tasks.
+# numpy's matmul / solve release the GIL, so the threads really run at the same time.
+# for a clean speedup, limit BLAS to 1 thread (OMP_NUM_THREADS=1) so the two kinds
+# of threading don't fight each other
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def parallel_lu_decompose(A, block_size=128, workers=None, pool=None):
+    # same result as lu_decompose(A, block_size) in Modularized/lu_solver.py, A is factored in place
+    # returns perm (original row now at row i), or None if singular
+    n = A.shape[0]
+    perm = np.arange(n)
+    tiny = np.finfo(A.dtype).eps * n * (np.abs(A).max() if A.size else 1.0)
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ThreadPoolExecutor(max_workers=workers or default_workers())
+
+    try:
+        for k in range(0, n, block_size):
+            end = min(k + block_size, n)
+
+            if not factor_panel(A, perm, k, end, tiny):
+                return None
+
+            if end == n:
+                break
+
+            L11 = np.tril(A[k:end, k:end], -1) + np.eye(end - k)
+            column_tiles = [(j, min(j + block_size, n)) for j in range(end, n, block_size)]
+            row_tiles = [(i, min(i + block_size, n)) for i in range(end, n, block_size)]
+
+            # phase 1: U12 = inv(L11) * A12, every tile column on its own
+            def solve_u_tile(j, j_end):
+                A[k:end, j:j_end] = np.linalg.solve(L11, A[k:end, j:j_end])
+
+            list(pool.map(lambda t: solve_u_tile(*t), column_tiles))
+
+            # phase 2: A22 -= L21 * U12, every (row tile, column tile) pair is independent
+            def update_tile(tile):
+                (i, i_end), (j, j_end) = tile
+                A[i:i_end, j:j_end] -= A[i:i_end, k:end] @ A[k:end, j:j_end]
+
+            list(pool.map(update_tile, [(r, c) for r in row_tiles for c in column_tiles]))
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    return perm
+
+
+def parallel_gaussian_elimination(A, B, block_size=128, workers=None):
+    # drop-in for gaussian.gaussian_elimination that uses a worker pool
+    LU = np.array(A, dtype=float)
+
+    perm = parallel_lu_decompose(LU, block_size, workers)
+    if perm is None:
+        return None
+
+    return lu_solve(LU, perm, B)
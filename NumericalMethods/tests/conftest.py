@@ -0,0 +1,13 @@
+import os
+import sys
+
+# top-level scripts import "Modularized.x", the Modularized modules import each other by plain name,
+# so both folders go on the path
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+for folder in (ROOT, os.path.join(ROOT, "Modularized")):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+
+# NumProj imports pyplot: draw off screen so tests never open a window
+os.environ.setdefault("MPLBACKEND", "Agg")
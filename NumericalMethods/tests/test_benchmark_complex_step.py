@@ -0,0 +1,16 @@
+from benchmark_complex_step import METHODS, STEPS, run_comparison
+from benchmark_derivatives import best_runs, cheapest_methods
+
+
+def test_complex_step_beats_the_stencils():
+    functions, results = run_comparison(points=50, repeat=1)
+    assert len(results) == len(functions) * len(METHODS) * len(STEPS)
+
+    best = best_runs(results)
+    cheapest = cheapest_methods(results, 1e-13)
+    for function in functions:
+        complex_error = best[(function, "complex")]["max_error"]
+        assert complex_error < 1e-14
+        assert all(best[(function, method)]["max_error"] > complex_error for method in ("forward", "central"))
+        # one evaluation per point and the best error: nothing cheaper reaches it
+        assert cheapest[function]["method"] == "complex"
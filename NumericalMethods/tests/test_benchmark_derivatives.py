@@ -0,0 +1,17 @@
+import json
+from benchmark_derivatives import run_benchmark, best_runs, cheapest_methods
+
+
+def test_sweep_and_cheapest_method():
+    steps = [10.0 ** -k for k in range(1, 21)]
+    results = run_benchmark(["sin(x)"], ["central", "central4", "complex", "dual"], steps,
+                            points=50, x_range=[0.1, 1.4], repeat=1)
+
+    assert len(results) == 3 * len(steps) + 1
+    best = best_runs(results)
+    assert best[("sin(x)", "complex")]["max_error"] < 1e-15
+    assert best[("sin(x)", "central")]["max_error"] > 1e-12   # round-off floor of the stencil
+
+    cheapest = cheapest_methods(results, 1e-12)["sin(x)"]
+    assert cheapest["evaluations_per_point"] == 1
+    json.dumps(results)   # everything recorded can be written to the --json file
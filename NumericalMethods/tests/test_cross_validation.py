@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from cross_validation import kfold_cv, loo_cv, select_degree
+
+
+def curve_data(n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.sort(rng.uniform(-1, 1, n))
+    return x, np.sin(3 * x) + 0.05 * rng.standard_normal(n)
+
+
+def brute_force_loo(x, y, degree):
+    errors = []
+    for i in range(len(x)):
+        keep = np.arange(len(x)) != i
+        fit = np.poly1d(np.polyfit(x[keep], y[keep], degree))
+        errors.append((fit(x[i]) - y[i]) ** 2)
+    return np.mean(errors)
+
+
+def test_loo_shortcut_equals_refitting():
+    x, y = curve_data(30)
+    result = loo_cv(x, y, 5)
+    expected = [brute_force_loo(x, y, degree) for degree in range(1, 6)]
+    assert np.allclose(result["cv_error"], expected, rtol=1e-8)
+
+
+def test_kfold_with_n_folds_is_leave_one_out():
+    x, y = curve_data(25)
+    assert np.allclose(kfold_cv(x, y, 4, folds=25)["cv_error"], loo_cv(x, y, 4)["cv_error"])
+
+
+def test_parallel_folds_match_serial():
+    x, y = curve_data()
+    serial = kfold_cv(x, y, 6, folds=5, workers=1)
+    parallel = kfold_cv(x, y, 6, folds=5, workers=2)
+    assert np.allclose(serial["cv_error"], parallel["cv_error"])
+    assert np.allclose(serial["cv_std"], parallel["cv_std"])
+
+
+@pytest.mark.parametrize("method", ["kfold", "loo"])
+def test_select_degree_avoids_underfit(method):
+    x, y = curve_data(200)
+    degree, curves = select_degree(x, y, 12, method)
+    assert 3 <= degree <= 9
+    assert curves["cv_error"][degree - 1] < curves["cv_error"][0] / 10
+
+
+def test_select_degree_lowers_max_degree_for_few_points():
+    x, y = curve_data(6)
+    _, curves = select_degree(x, y, 10, "loo")
+    assert curves["degrees"][-1] == 4
+    with pytest.raises(ValueError):
+        select_degree(x, y, 3, "bootstrap")
+    with pytest.raises(ValueError):
+        kfold_cv(x, y, 2, folds=1)
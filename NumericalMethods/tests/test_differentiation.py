@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+import differentiation
+from differentiation import compute_cost, numerical_gradients
+
+
+def data(n=200, d=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, d))
+    y = rng.standard_normal(n)
+    return X, y, rng.standard_normal(d)
+
+
+def exact_gradient(weights, X, y):
+    return 2 / len(y) * X.T @ (X @ weights - y)
+
+
+@pytest.mark.parametrize("method, tolerance", [
+    ("forward", 1e-4), ("backward", 1e-4), ("central", 1e-8), ("centralized", 1e-8),
+])
+def test_matches_exact_gradient(method, tolerance):
+    X, y, w = data()
+    assert np.allclose(numerical_gradients(w, X, y, method), exact_gradient(w, X, y), atol=tolerance)
+
+
+def test_same_as_moving_each_weight(monkeypatch):
+    # the one-base-prediction shortcut must equal d full cost evaluations
+    X, y, w = data(50, 4)
+    h = 1e-5
+    expected = [(compute_cost(w + h * e, X, y) - compute_cost(w - h * e, X, y)) / (2 * h) for e in np.eye(4)]
+    monkeypatch.setattr(differentiation, "CHUNK_ELEMENTS", 100)   # several column chunks
+    assert np.allclose(numerical_gradients(w, X, y), expected, rtol=1e-9)
+
+
+def test_unknown_method():
+    X, y, w = data()
+    with pytest.raises(ValueError):
+        numerical_gradients(w, X, y, "sideways")
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from dual_numbers import Dual, dual_derivative, dual_gradient
+
+X = np.linspace(0.1, 1.4, 25)
+
+
+@pytest.mark.parametrize("f, df", [
+    (lambda x: x**3 - 2 * x + 1, lambda x: 3 * x**2 - 2),
+    (np.sin, np.cos),
+    (lambda x: np.exp(x) * np.log(x), lambda x: np.exp(x) * (np.log(x) + 1 / x)),
+    (lambda x: 1 / (1 + x**2), lambda x: -2 * x / (1 + x**2)**2),
+    (lambda x: np.sqrt(x) / np.cos(x), lambda x: (0.5 / np.sqrt(x) + np.sqrt(x) * np.tan(x)) / np.cos(x)),
+    (lambda x: x**x, lambda x: x**x * (np.log(x) + 1)),
+])
+def test_derivatives_exact(f, df):
+    assert np.allclose(dual_derivative(f, X), df(X), rtol=1e-13, atol=0)
+
+
+def test_value_carried_along():
+    result = np.sin(Dual(2.0, [1.0])) * 3
+    assert np.isclose(result.value, 3 * np.sin(2.0))
+    assert np.allclose(result.deriv, [3 * np.cos(2.0)])
+
+
+def test_constant_function_and_scalar():
+    assert np.all(dual_derivative(lambda x: 5.0, X) == 0)
+    assert np.ndim(dual_derivative(np.exp, 1.0)) == 0
+
+
+def test_gradient_of_mse():
+    rng = np.random.default_rng(0)
+    X_data = rng.standard_normal((100, 4))
+    y = rng.standard_normal(100)
+    w = rng.standard_normal(4)
+    cost = lambda weights, X, y: np.mean((X @ weights - y) ** 2)
+    expected = 2 / 100 * X_data.T @ (X_data @ w - y)
+    assert np.allclose(dual_gradient(cost, w, X_data, y), expected, rtol=1e-13)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+from NumProj import eliminate_with_trace, solve_gaussian_manual, MAX_SHOWN_STEPS
+
+
+def test_trace_replays_to_upper_triangle():
+    rng = np.random.default_rng(7)
+    A = rng.standard_normal((8, 8))
+    b = rng.standard_normal(8)
+    solution, trace = eliminate_with_trace(A, b)
+
+    assert np.allclose(solution, np.linalg.solve(A, b))
+    final = trace.replay(len(trace))
+    assert np.allclose(np.tril(final[:, :8], -1), 0)
+
+
+def test_iter_steps_matches_replay():
+    A = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 10.0]])
+    _, trace = eliminate_with_trace(A, [1.0, 2.0, 3.0])
+    for k, _, _, matrix in trace.iter_steps():
+        assert np.allclose(matrix, trace.replay(k))
+
+
+def test_manual_solve_caps_printed_steps(capsys):
+    n = 30
+    A = np.random.default_rng(8).random((n, n)) + n * np.eye(n)
+    solution = solve_gaussian_manual(A, np.ones(n))
+    out = capsys.readouterr().out
+
+    assert np.allclose(solution, np.linalg.solve(A, np.ones(n)))
+    assert sum(line.startswith("Step ") for line in out.splitlines()) == MAX_SHOWN_STEPS
+    assert "more steps not shown" in out
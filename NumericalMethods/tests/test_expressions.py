@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import expressions
+from expressions import (compile_expression, normalize_expression, symbolic_derivative,
+                         clear_expression_cache, _expression_cache)
+from dual_numbers import dual_derivative
+
+X = np.linspace(0.2, 1.3, 30)
+
+
+@pytest.mark.parametrize("text, df", [
+    ("x^2 + 2*x + 1", lambda x: 2 * x + 2),
+    ("sin(x)*exp(-x**2)", lambda x: np.exp(-x**2) * (np.cos(x) - 2 * x * np.sin(x))),
+    ("log(1 + x**2)", lambda x: 2 * x / (1 + x**2)),
+    ("x**x", lambda x: x**x * (np.log(x) + 1)),
+    ("sqrt(x) / tan(x)", lambda x: 0.5 / (np.sqrt(x) * np.tan(x)) - np.sqrt(x) / np.sin(x)**2),
+    ("pi * cosh(2*x)", lambda x: 2 * np.pi * np.sinh(2 * x)),
+])
+def test_symbolic_derivative_matches_analytic(text, df):
+    f = compile_expression(text)
+    assert np.allclose(f.derivative(X), df(X), rtol=1e-12)
+    assert np.allclose(dual_derivative(f, X), df(X), rtol=1e-12)
+
+
+def test_constant_expression_gives_one_value_per_x():
+    f = compile_expression("3")
+    assert f(X).shape == X.shape
+    assert np.all(f.derivative(X) == 0)
+    assert symbolic_derivative("5*pi") in ("0", "0.0")
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os')", "x.real", "open('f')", "y + 1", "sin(x, 2)", "x if x else 1",
+    "[x]", "'a'", "x +",
+])
+def test_rejects_unsafe_or_invalid(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_cache_shares_normalized_text(monkeypatch):
+    clear_expression_cache()
+    assert normalize_expression("x^2+1") == normalize_expression("x ** 2 + 1")
+    assert compile_expression("x^2+1") is compile_expression("x ** 2 + 1")
+
+    monkeypatch.setattr(expressions, "EXPRESSION_CACHE_SIZE", 3)
+    first = compile_expression("x + 1")
+    for k in range(2, 5):
+        compile_expression(f"x + {k}")
+    assert len(_expression_cache) == 3
+    assert compile_expression("x + 1") is not first
+    clear_expression_cache()
+
+
+def test_cache_hit_skips_parsing(monkeypatch):
+    clear_expression_cache()
+    first = compile_expression("sin(x)^2")
+
+    def no_parse(text):
+        raise AssertionError("cache hit parsed the text again")
+
+    monkeypatch.setattr(expressions, "parse_expression", no_parse)
+    assert compile_expression("sin(x)^2") is first
+    clear_expression_cache()
+
+
+@pytest.mark.parametrize("text", ["-" * 100_000 + "x", "+".join(["x"] * 100_000), "x" + "**x" * 5000])
+def test_deep_nesting_is_a_value_error(text):
+    with pytest.raises(ValueError, match="nested too deeply"):
+        compile_expression(text)
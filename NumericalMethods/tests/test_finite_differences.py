@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from finite_differences import (stencil_weights, derivative, function_evaluations, adaptive_derivative,
+                                complex_step_derivative)
+
+X = np.linspace(0.1, 1.4, 101)
+
+
+def test_stencil_weights_known_values():
+    assert np.allclose(stencil_weights([-1, 1]), [-0.5, 0.5])
+    assert np.allclose(stencil_weights([-2, -1, 1, 2]), [1 / 12, -2 / 3, 2 / 3, -1 / 12])
+    assert np.allclose(stencil_weights([-1, 0, 1], order=2), [1, -2, 1])
+    with pytest.raises(ValueError):
+        stencil_weights([0, 1], order=2)
+
+
+@pytest.mark.parametrize("method, h, tolerance", [
+    ("forward", 1e-7, 1e-6), ("backward", 1e-7, 1e-6), ("central", 1e-5, 1e-9),
+    ("central4", 1e-3, 1e-11), ("central6", 1e-2, 1e-11),
+])
+def test_named_stencils_on_sin(method, h, tolerance):
+    assert np.max(np.abs(derivative(np.sin, X, h, method) - np.cos(X))) < tolerance
+
+
+def test_polynomial_exact_up_to_stencil_order():
+    # central4 is exact for polynomials up to degree 4
+    f = lambda x: 3 * x**4 - x**3 + 2 * x
+    exact = 12 * X**3 - 3 * X**2 + 2
+    assert np.allclose(derivative(f, X, 0.1, "central4"), exact, atol=1e-9)
+
+
+def test_f_called_once_and_scalar_result():
+    calls = []
+
+    def f(x):
+        calls.append(np.shape(x))
+        return np.exp(x)
+
+    derivative(f, X, method="central6")
+    assert calls == [(len(X), 6)]
+    assert function_evaluations(X, "central6") == 6 * len(X)
+    assert np.ndim(derivative(np.exp, 0.0)) == 0
+
+
+def test_custom_offsets_and_unknown_method():
+    assert np.isclose(derivative(np.exp, 0.0, 1e-3, [-1, 0, 1]), 1.0)
+    with pytest.raises(ValueError):
+        derivative(np.exp, 0.0, method="sideways")
+
+
+@pytest.mark.parametrize("method", ["central", "forward"])
+def test_adaptive_derivative_reaches_tolerance(method):
+    result, error, evaluations = adaptive_derivative(np.sin, X, method=method, tol=1e-9)
+    assert np.max(np.abs(result - np.cos(X))) < 1e-8
+    assert np.all(error < 1e-8)
+    assert evaluations > 0
+
+
+def test_adaptive_derivative_hard_function():
+    f = lambda x: np.exp(x) / np.sqrt(np.sin(x)**3 + np.cos(x)**3)
+    s, c = np.sin(1.0), np.cos(1.0)
+    exact = np.exp(1.0) * (s**3 + c**3 - 1.5 * s * c * (s - c)) / (s**3 + c**3)**1.5
+    result, error, _ = adaptive_derivative(f, 1.0)
+    assert abs(result - exact) < 1e-9
+
+
+def test_numproj_adaptive_uses_same_routine(capsys):
+    pytest.importorskip("matplotlib")
+    from NumProj import adaptive_difference
+    result, error, evaluations = adaptive_difference(0.5, np.sin)
+    expected = adaptive_derivative(np.sin, 0.5)
+    assert (result, error, evaluations) == (float(expected[0]), float(expected[1]), expected[2])
+
+
+def test_complex_step_machine_precision():
+    f = lambda x: np.exp(x) / np.sqrt(np.sin(x)**3 + np.cos(x)**3)
+    s, c = np.sin(X), np.cos(X)
+    exact = np.exp(X) * (s**3 + c**3 - 1.5 * s * c * (s - c)) / (s**3 + c**3)**1.5
+    assert np.allclose(complex_step_derivative(f, X), exact, rtol=1e-14, atol=0)
+    assert np.allclose(complex_step_derivative(np.sin, X, 1e-200), np.cos(X), rtol=1e-15, atol=0)
+    assert function_evaluations(X, "complex") == len(X)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from gaussian import lu_decompose, gaussian_elimination
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 7, 64])
+def test_matches_numpy_solve(block_size):
+    rng = np.random.default_rng(1)
+    A = rng.standard_normal((50, 50))
+    b = rng.standard_normal(50)
+    assert np.allclose(gaussian_elimination(A, b, block_size), np.linalg.solve(A, b))
+
+
+def test_blocked_factors_equal_unblocked():
+    rng = np.random.default_rng(2)
+    A = rng.standard_normal((40, 40))
+    plain, blocked = A.copy(), A.copy()
+    perm_plain = lu_decompose(plain)
+    perm_blocked = lu_decompose(blocked, block_size=8)
+    assert np.array_equal(perm_plain, perm_blocked)
+    assert np.allclose(plain, blocked)
+
+    L = np.tril(blocked, -1) + np.eye(40)
+    assert np.allclose(L @ np.triu(blocked), A[perm_blocked])
+
+
+def test_input_not_overwritten_and_singular():
+    A = np.array([[2.0, 1.0], [4.0, 3.0]])
+    original = A.copy()
+    gaussian_elimination(A, [1.0, 2.0])
+    assert np.array_equal(A, original)
+    assert gaussian_elimination([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0]) is None
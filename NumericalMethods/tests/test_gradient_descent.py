@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from gradient_descent import mse_and_gradient, data_loss, fit_iterative, fit_line_iterative
+
+
+def data(n=500, seed=0, noise=0.1):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.standard_normal((n, 2)), np.ones(n)])
+    y = X @ np.array([1.5, -2.0, 0.5]) + noise * rng.standard_normal(n)
+    return X, y
+
+
+def lstsq(X, y):
+    return np.linalg.lstsq(X, y, rcond=None)[0]
+
+
+def test_mse_and_gradient():
+    X, y = data()
+    w = np.array([0.3, 0.1, -1.0])
+    loss, gradient = mse_and_gradient(X, y, w)
+    assert np.isclose(loss, np.mean((X @ w - y) ** 2))
+    assert np.allclose(gradient, 2 / len(y) * X.T @ (X @ w - y))
+
+
+def test_batch_losses_measured_on_the_data():
+    # tiny noise: the loss at the answer is ~1e-12, which wᵀGw - 2wᵀc + yy can't resolve
+    X, y = data(noise=1e-6)
+    seen = []
+    w, info = fit_iterative(X, y, learning_rate=0.05, max_epochs=400, loss_tol=0, gradient_tol=0, loss_every=25,
+                            callback=lambda epoch, weights, loss: seen.append((epoch, weights.copy(), loss)))
+
+    assert info["reason"] == "max_epochs"
+    assert list(info["loss_epochs"]) == list(range(0, 401, 25))
+    assert [epoch for epoch, _, _ in seen] == list(info["loss_epochs"])
+    for (_, weights, loss), reported in zip(seen, info["losses"]):
+        assert loss == reported
+        assert np.isclose(loss, data_loss(X, y, weights, chunk_rows=77), rtol=1e-12)
+    assert np.isclose(info["losses"][-1], np.mean((X @ w - y) ** 2), rtol=1e-9)
+    assert info["losses"][-1] < 1e-10
+
+
+def test_batch_gradient_is_the_full_gradient():
+    # converged means the true gradient 2/n Xᵀ(Xw - y) is below gradient_tol
+    X, y = data()
+    w, info = fit_iterative(X, y, learning_rate=0.1, max_epochs=5000, loss_tol=0, gradient_tol=1e-9)
+    assert info["converged"]
+    assert np.linalg.norm(mse_and_gradient(X, y, w)[1]) <= 1e-9 * (1 + 1e-6)
+    assert np.isclose(info["gradient_norm"], np.linalg.norm(mse_and_gradient(X, y, w)[1]), rtol=1e-5, atol=1e-15)
+
+
+@pytest.mark.parametrize("mode, optimizer, options", [
+    ("batch", "sgd", {"learning_rate": 0.1, "max_epochs": 3000}),
+    ("batch", "momentum", {"learning_rate": 0.05, "max_epochs": 3000}),
+    ("batch", "sgd", {"line_search": True, "max_epochs": 3000}),
+    ("minibatch", "adam", {"learning_rate": 0.01, "batch_size": 16, "max_epochs": 100}),
+    ("stochastic", "sgd", {"learning_rate": 0.02, "batch_size": 8, "max_epochs": 60}),
+])
+def test_modes_reach_least_squares(mode, optimizer, options):
+    X, y = data()
+    w, info = fit_iterative(X, y, mode, optimizer, loss_tol=0, gradient_tol=1e-6, **options)
+    tolerance = 1e-4 if mode == "batch" else 5e-2   # stochastic steps keep jittering
+    assert np.allclose(w, lstsq(X, y), atol=tolerance)
+    assert info["losses"][-1] <= info["losses"][0]
+
+
+def test_stalled_fit_is_not_converged():
+    # x far from 0: the loss hardly changes along the intercept direction, so the
+    # loss test stops the fit while the intercept is still far from 2
+    rng = np.random.default_rng(1)
+    x = 100 + rng.random(1000)
+    X = np.column_stack([x, np.ones_like(x)])
+    w, info = fit_iterative(X, 3 * x + 2, learning_rate=1e-6, max_epochs=5000)
+    assert info["reason"] == "loss_tol"
+    assert abs(w[1] - 2) > 1
+    assert not info["converged"]
+
+
+def test_divergence_reported():
+    X, y = data()
+    _, info = fit_iterative(X, y, learning_rate=10.0, max_epochs=200)
+    assert not info["converged"]
+    assert info["reason"].startswith("diverged")
+
+
+def test_fit_line_and_bad_arguments():
+    x = np.linspace(0, 1, 100)
+    m, b, info = fit_line_iterative(x, 4 * x - 1, learning_rate=0.5, max_epochs=20000, loss_tol=0)
+    assert info["converged"]
+    assert np.isclose(m, 4, atol=1e-5) and np.isclose(b, -1, atol=1e-5)
+    with pytest.raises(ValueError):
+        fit_iterative(np.ones((3, 1)), np.ones(3), mode="turbo")
+    with pytest.raises(ValueError):
+        fit_iterative(np.ones((3, 1)), np.ones(3), mode="minibatch", line_search=True)
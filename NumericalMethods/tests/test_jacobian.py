@@ -0,0 +1,73 @@
+import numpy as np
+from jacobian import pattern_positions, banded_pattern, color_columns, sparse_jacobian, sparse_hessian
+
+
+def to_dense(csr):
+    rows, cols, shape = pattern_positions(csr)
+    dense = np.zeros(shape)
+    dense[rows, cols] = csr.data
+    return dense
+
+
+def test_banded_pattern_positions():
+    rows, cols, shape = pattern_positions(banded_pattern(7, 1, 2))
+    offsets = np.arange(7)[None, :] - np.arange(7)[:, None]
+    expected = (offsets >= -1) & (offsets <= 2)
+    dense = np.zeros(shape, dtype=bool)
+    dense[rows, cols] = True
+    assert np.array_equal(dense, expected)
+    assert banded_pattern(1, 3, 3).nnz == 1
+
+
+def test_banded_pattern_stays_sparse():
+    pattern = banded_pattern(1_000_000, 1, 1)
+    assert pattern.nnz == 3 * 1_000_000 - 2
+    assert color_columns(banded_pattern(500, 1, 1)).max() + 1 == 3
+
+
+def test_coloring_is_valid():
+    rng = np.random.default_rng(0)
+    pattern = rng.random((30, 20)) < 0.15
+    colors = color_columns(pattern)
+    for row in pattern:
+        used = colors[row]
+        assert len(used) == len(np.unique(used))
+
+
+def test_sparse_jacobian_tridiagonal():
+    # F_i = x_i² - x_(i-1) + 2 x_(i+1)
+    n = 50
+    def F(x):
+        out = x**2
+        out[1:] -= x[:-1]
+        out[:-1] += 2 * x[1:]
+        return out
+
+    x = np.linspace(-1, 1, n)
+    exact = np.diag(2 * x) - np.eye(n, k=-1) + 2 * np.eye(n, k=1)
+    for method, tolerance in (("forward", 1e-6), ("central", 1e-8)):
+        J = sparse_jacobian(F, x, banded_pattern(n, 1, 1), method=method)
+        assert np.allclose(to_dense(J), exact, atol=tolerance)
+
+
+def test_sparse_hessian_from_lower_pattern():
+    # f = sum x_i⁴ + sum (x_(i+1) - x_i)², tridiagonal hessian
+    n = 20_000
+    def gradient(x):
+        g = 4 * x**3
+        d = x[1:] - x[:-1]
+        g[:-1] -= 2 * d
+        g[1:] += 2 * d
+        return g
+
+    x = np.random.default_rng(1).random(n)
+    H = sparse_hessian(gradient, x, banded_pattern(n, 1, 0))   # only the lower half given
+    assert H.nnz == 3 * n - 2
+    ends = np.full(n, 4.0)
+    ends[[0, -1]] = 2.0
+    assert np.allclose(H.diagonal(), 12 * x**2 + ends, atol=1e-6)
+
+    small = sparse_hessian(gradient, x[:6], banded_pattern(6, 1, 0))
+    dense = to_dense(small)
+    assert np.allclose(dense, dense.T)
+    assert np.allclose(np.diag(dense, 1), -2, atol=1e-6)
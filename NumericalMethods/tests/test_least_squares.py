@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from least_squares import least_squares, tsqr_least_squares, tsqr_least_squares_npy
+
+
+def tall_system(rows=1000, d=6, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((rows, d))
+    b = A @ np.arange(1.0, d + 1) + 0.1 * rng.standard_normal(rows)
+    return A, b
+
+
+def reference(A, b):
+    x = np.linalg.lstsq(A, b, rcond=None)[0]
+    return x, np.linalg.norm(A @ x - b)
+
+
+def test_in_memory_tall_and_wide():
+    A, b = tall_system()
+    x, rank, residual = least_squares(A, b)
+    x_ref, residual_ref = reference(A, b)
+    assert rank == 6
+    assert np.allclose(x, x_ref) and np.isclose(residual, residual_ref)
+
+    # wide: fits exactly, and is the smallest such x
+    wide = A[:3]
+    x, rank, residual = least_squares(wide, b[:3])
+    assert rank == 3 and residual < 1e-10
+    assert np.allclose(x, np.linalg.pinv(wide) @ b[:3])
+
+
+@pytest.mark.parametrize("block_rows", [1, 37, 1000])
+def test_tsqr_matches_lstsq(block_rows):
+    A, b = tall_system()
+    blocks = ((A[i:i + block_rows], b[i:i + block_rows]) for i in range(0, len(b), block_rows))
+    x, rank, residual = tsqr_least_squares(blocks)
+    x_ref, residual_ref = reference(A, b)
+    assert rank == 6
+    assert np.allclose(x, x_ref)
+    assert np.isclose(residual, residual_ref)
+
+
+def test_tsqr_rank_deficient_residual():
+    A, b = tall_system(200, 3)
+    A = np.column_stack([A, A[:, 0] + A[:, 1]])
+    x, rank, residual = tsqr_least_squares([(A, b)])
+    assert rank == 3
+    assert np.isclose(residual, reference(A, b)[1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tsqr_npy_files(tmp_path, workers):
+    A, b = tall_system(5000)
+    np.save(tmp_path / "A.npy", A)
+    np.save(tmp_path / "b.npy", b)
+    x, _, residual = tsqr_least_squares_npy(str(tmp_path / "A.npy"), str(tmp_path / "b.npy"),
+                                            chunk_rows=700, workers=workers)
+    x_ref, residual_ref = reference(A, b)
+    assert np.allclose(x, x_ref) and np.isclose(residual, residual_ref)
+
+
+def test_no_rows():
+    with pytest.raises(ValueError):
+        tsqr_least_squares([])
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from lu_solver import (LUFactorization, lu_factor, clear_lu_cache, _lu_cache,
+                       lu_decompose, factor_panel, lu_solve,
+                       solve_mixed_precision, backward_error)
+
+
+def random_system(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, n)) + n * np.eye(n), rng.standard_normal(n)
+
+
+def test_factors_rebuild_matrix():
+    A, _ = random_system(20)
+    lu = LUFactorization(A)
+    assert np.allclose(lu.L @ lu.U, A[lu.perm])
+
+
+def test_solve_vector_and_columns():
+    A, b = random_system(15)
+    lu = LUFactorization(A)
+    assert np.allclose(lu.solve(b), np.linalg.solve(A, b))
+
+    B = np.column_stack([b, 2 * b, -b])
+    assert np.allclose(lu.solve(B), np.linalg.solve(A, B))
+
+
+@pytest.mark.parametrize("dtype", [float, np.float32])
+def test_blocked_and_column_by_column_agree(dtype):
+    A, b = random_system(70, seed=5)
+    plain = LUFactorization(A, dtype, block_size=None)
+    blocked = LUFactorization(A, dtype, block_size=16)
+    assert blocked.LU.dtype == dtype
+    assert np.array_equal(plain.perm, blocked.perm)
+    assert np.allclose(plain.LU, blocked.LU, atol=10 * np.finfo(dtype).eps * 70)
+    assert np.allclose(blocked.solve(b), np.linalg.solve(A, b), rtol=1e-4 if dtype == np.float32 else 1e-10)
+
+
+def test_routines_flag_singular_without_printing(capsys):
+    A = np.array([[1.0, 2.0], [2.0, 4.0]])
+    assert lu_decompose(A.copy()) is None
+    assert lu_decompose(np.zeros((100, 100)), block_size=16) is None
+    assert not factor_panel(A.copy(), np.arange(2), 0, 2, 1e-12)
+    assert capsys.readouterr().out == ""
+
+    A, b = random_system(10)
+    LU = A.copy()
+    assert np.allclose(lu_solve(LU, lu_decompose(LU), b), np.linalg.solve(A, b))
+
+
+def test_singular_and_non_square():
+    with pytest.raises(np.linalg.LinAlgError):
+        LUFactorization([[1.0, 2.0], [2.0, 4.0]])
+    with pytest.raises(ValueError):
+        LUFactorization(np.ones((2, 3)))
+
+
+def test_cache_reuses_factorization():
+    clear_lu_cache()
+    A, _ = random_system(5)
+    first = lu_factor(A, use_cache=True)
+    assert lu_factor(A.copy(), use_cache=True) is first
+    assert lu_factor(A + np.eye(5), use_cache=True) is not first
+    assert len(_lu_cache) == 2
+    clear_lu_cache()
+    assert len(_lu_cache) == 0
+
+
+def test_mixed_precision_reaches_float64_accuracy():
+    A, b = random_system(60, seed=4)
+    x, info = solve_mixed_precision(A, b)
+    assert not info["fell_back"]
+    assert info["backward_error"] <= np.finfo(float).eps * np.sqrt(60)
+    assert np.allclose(x, np.linalg.solve(A, b), rtol=1e-12)
+
+
+def test_mixed_precision_falls_back_when_ill_conditioned():
+    n = 10
+    hilbert = 1.0 / (np.arange(n)[:, None] + np.arange(n) + 1)
+    b = hilbert @ np.ones(n)
+    x, info = solve_mixed_precision(hilbert, b)
+    assert info["fell_back"]
+    assert backward_error(hilbert, x, b) < 1e-14
+
+
+def test_backward_error_with_known_residual_and_norm():
+    A, b = random_system(30, seed=6)
+    x = np.linalg.solve(A, b) + 1e-6
+    residual = b - A @ x
+    expected = backward_error(A, x, b)
+    assert backward_error(A, x, b, residual, np.linalg.norm(A, np.inf)) == expected
+
+
+def test_mixed_precision_fallback_is_float64_solve():
+    n = 12
+    hilbert = 1.0 / (np.arange(n)[:, None] + np.arange(n) + 1)
+    b = np.arange(n, dtype=float)
+    x, info = solve_mixed_precision(hilbert, b)
+    assert info["fell_back"]
+    assert np.array_equal(x, np.linalg.solve(hilbert, b))
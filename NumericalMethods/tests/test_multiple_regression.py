@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from multiple_regression import (MultipleRegressionState, multiple_regression, multiple_regression_columns,
+                                 multiple_regression_npy, fit_chunks, rows_for_budget)
+from numerical_core import multiple_regression_3d
+
+
+def features(n=20_000, d=8, seed=0, offset=0.0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, d)) * rng.uniform(0.5, 5, d) + offset
+    y = X @ rng.standard_normal(d) + 4.0 + 0.5 * rng.standard_normal(n)
+    return X, y
+
+
+def reference(X, y):
+    # centred lstsq, accurate even for big offsets
+    mean_x, mean_y = X.mean(axis=0), y.mean()
+    w = np.linalg.lstsq(X - mean_x, y - mean_y, rcond=None)[0]
+    residual = (X - mean_x) @ w - (y - mean_y)
+    return w, mean_y - w @ mean_x, 1 - residual @ residual / np.sum((y - mean_y) ** 2)
+
+
+@pytest.mark.parametrize("method", ["normal", "qr"])
+@pytest.mark.parametrize("memory_bytes", [20_000, 10**9])
+def test_matches_lstsq(method, memory_bytes):
+    X, y = features()
+    coefficients, intercept, r2 = multiple_regression(X, y, method, memory_bytes)
+    w, b, r2_ref = reference(X, y)
+    assert np.allclose(coefficients, w, rtol=1e-10, atol=1e-12)
+    assert np.isclose(intercept, b, rtol=1e-10)
+    assert np.isclose(r2, r2_ref, rtol=1e-10)
+
+
+def test_large_offsets():
+    X, y = features(offset=1e6)
+    coefficients, intercept, _ = multiple_regression(X, y, memory_bytes=50_000)
+    w, b, _ = reference(X, y)
+    assert np.allclose(coefficients, w, rtol=1e-8)
+    assert np.isclose(intercept, b, rtol=1e-8)
+
+
+def test_budget_sets_chunk_rows():
+    assert rows_for_budget(8, 8 * 3 * 10 * 100) == 100
+    assert rows_for_budget(1000, 1) == 1
+
+
+def test_collinear_features_fall_back():
+    X, y = features(5000, 3)
+    X = np.column_stack([X, X[:, 0] + X[:, 1]])
+    for method, solver in (("normal", "lstsq"), ("qr", "qr (rank deficient)")):
+        state = fit_chunks([(X[i:i + 600], y[i:i + 600]) for i in range(0, len(y), 600)], 4, method)
+        coefficients, intercept = state.solve()
+        assert state.solver == solver
+        # any least-squares answer gives the same predictions
+        w, b, r2 = reference(X, y)
+        assert np.allclose(X @ coefficients + intercept, X @ w + b, atol=1e-8)
+        assert np.isclose(state.r_squared(), r2)
+
+
+def test_solve_cached_until_update():
+    X, y = features(3000, 4)
+    state = MultipleRegressionState(4).update(X[:1500], y[:1500])
+    first = state.solve()
+    weights = state._weights
+    state.r_squared()
+    assert state._weights is weights
+    state.update(X[1500:], y[1500:])
+    assert state._weights is None
+    assert not np.allclose(state.solve()[0], first[0])
+    with pytest.raises(ValueError):
+        MultipleRegressionState(2).solve()
+
+
+def test_columns_and_npy_files(tmp_path):
+    X, y = features(4000, 3)
+    expected = reference(X, y)
+    by_columns = multiple_regression_columns(list(X.T), y, memory_bytes=10_000)
+    np.save(tmp_path / "X.npy", X)
+    np.save(tmp_path / "y.npy", y)
+    from_files = multiple_regression_npy(str(tmp_path / "X.npy"), str(tmp_path / "y.npy"), memory_bytes=10_000)
+    for coefficients, intercept, r2 in (by_columns, from_files):
+        assert np.allclose(coefficients, expected[0]) and np.isclose(intercept, expected[1])
+        assert np.isclose(r2, expected[2])
+    with pytest.raises(ValueError):
+        multiple_regression_columns([X[:, 0], X[:10, 1]], y)
+
+
+def test_plane_3d():
+    rng = np.random.default_rng(3)
+    x, y = rng.random(500), rng.random(500) * 50
+    z = 2 * x - 0.3 * y + 7
+    a, b, c, r2 = multiple_regression_3d(list(x), list(y), list(z))
+    assert np.allclose([a, b, c], [2, -0.3, 7])
+    assert np.isclose(r2, 1.0)
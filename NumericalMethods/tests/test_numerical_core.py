@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from numerical_core import solve_gaussian, solve_gaussian_batch
+
+
+def stacked_systems(k, n, m=None, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((k, n, n))
+    b = rng.standard_normal((k, n) if m is None else (k, n, m))
+    return A, b
+
+
+def test_matches_numpy_one_answer_per_system():
+    A, b = stacked_systems(50, 6)
+    x, solved = solve_gaussian_batch(A, b)
+    assert x.shape == b.shape
+    assert solved.all()
+    assert np.allclose(x, np.linalg.solve(A, b[..., None])[..., 0])
+
+
+def test_matches_numpy_several_answer_columns():
+    A, B = stacked_systems(20, 5, m=3, seed=1)
+    x, solved = solve_gaussian_batch(A, B)
+    assert x.shape == B.shape
+    assert solved.all()
+    assert np.allclose(x, np.linalg.solve(A, B))
+
+
+def test_needs_pivoting():
+    # zero in the first pivot position, solvable only with a row swap
+    A = np.array([[[0.0, 1.0], [1.0, 1.0]]])
+    x, solved = solve_gaussian_batch(A, [[1.0, 3.0]])
+    assert solved[0]
+    assert np.allclose(x[0], [2.0, 1.0])
+
+
+def test_singular_systems_masked_with_nan():
+    A, b = stacked_systems(6, 4, seed=2)
+    A[1, 3] = A[1, 0] + A[1, 2]    # dependent row
+    A[4] = 0.0                     # all zeros
+    x, solved = solve_gaussian_batch(A, b)
+
+    assert solved.tolist() == [True, False, True, True, False, True]
+    assert np.isnan(x[~solved]).all()
+    assert np.allclose(x[solved], np.linalg.solve(A[solved], b[solved][..., None])[..., 0])
+
+
+def test_input_not_changed():
+    A, b = stacked_systems(3, 4, seed=3)
+    A_before, b_before = A.copy(), b.copy()
+    solve_gaussian_batch(A, b)
+    assert np.array_equal(A, A_before) and np.array_equal(b, b_before)
+
+
+@pytest.mark.parametrize("equations, answers", [
+    (np.ones((3, 4)), np.ones((3, 4))),          # not stacked
+    (np.ones((3, 4, 5)), np.ones((3, 4))),       # not square
+    (np.eye(3)[None].repeat(2, 0), np.ones((2, 4))),     # wrong n
+    (np.eye(3)[None].repeat(2, 0), np.ones((5, 3))),     # wrong k
+    (np.eye(3)[None].repeat(2, 0), np.ones((2, 3, 1, 1))),
+])
+def test_shape_mismatch(equations, answers):
+    with pytest.raises(ValueError):
+        solve_gaussian_batch(equations, answers)
+
+
+def test_solve_gaussian_returns_mixed_precision_info():
+    A = [[4.0, 1.0], [1.0, 3.0]]
+    x, info = solve_gaussian(A, [1.0, 2.0], mode="mixed", return_info=True)
+    assert np.allclose(x, np.linalg.solve(A, [1.0, 2.0]))
+    assert info["backward_error"] <= 1e-15
+    assert not info["fell_back"] and len(info["history"]) == info["refinements"] + 1
+
+    x, info = solve_gaussian([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0], return_info=True)
+    assert x is None and "error" in info
+    assert solve_gaussian(A, [1.0, 2.0], mode="mixed") is not None
+
+
+def test_import_loads_only_what_it_uses():
+    # the GUI imports the regression / CV / gradient-descent modules itself
+    folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Modularized")
+    script = "import sys, numerical_core; print(' '.join(sorted(sys.modules)))"
+    loaded = subprocess.run([sys.executable, "-c", script], cwd=folder, capture_output=True,
+                            text=True, check=True).stdout.split()
+    for module in ("cross_validation", "gradient_descent", "polynomial_sweep", "sampled_derivatives",
+                   "expressions", "concurrent.futures", "multiprocessing"):
+        assert module not in loaded
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from out_of_core import tile_size_for_memory, solve_matrix_file
+
+
+@pytest.mark.parametrize("n, memory_bytes, expected", [
+    (5, 10**9, 5),                                  # budget bigger than the whole matrix
+    (300, 10**8, 300),
+    (1000, 8 * (1000 * 100 + 2 * 100 * 100), 100),  # exactly panel + 2 tiles of 100
+    (1000, 8 * (1000 * 100 + 2 * 100 * 100) - 1, 99),
+    (10, 1, 1),                                     # never below one column
+])
+def test_tile_size(n, memory_bytes, expected):
+    assert tile_size_for_memory(n, memory_bytes) == expected
+
+
+def test_tile_fits_budget():
+    for n in (7, 100, 4096):
+        for memory_bytes in (10**4, 10**6, 10**8):
+            tile = tile_size_for_memory(n, memory_bytes)
+            fits = lambda t: 8 * (n * t + 2 * t * t) <= memory_bytes
+            assert tile == n or tile == 1 or (fits(tile) and not fits(tile + 1))
+
+
+@pytest.mark.parametrize("memory_bytes", [8 * 64 * 5, 10**9])
+def test_solve_matrix_file_matches_numpy(tmp_path, memory_bytes):
+    n = 64
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((n, n))
+    b = rng.standard_normal(n)
+    path = tmp_path / "A.bin"
+    A.tofile(path)
+
+    x = solve_matrix_file(str(path), b, n, memory_bytes, work_path=str(tmp_path / "work.bin"))
+    assert np.allclose(x, np.linalg.solve(A, b))
+    # with a work file the original matrix is left alone
+    assert np.array_equal(np.fromfile(path).reshape(n, n), A)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from differentiation import numerical_gradients
+from parallel_gradients import GradientEvaluator, parallel_gradients
+
+
+def absolute_cost(weights, X, y):
+    # not the MSE, so only plain cost calls can differentiate it
+    return np.mean(np.abs(X @ weights - y) ** 1.5)
+
+
+def data(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((80, 6)), rng.standard_normal(80), rng.standard_normal(6)
+
+
+@pytest.mark.parametrize("method", ["forward", "backward", "central"])
+def test_mse_matches_serial_gradient(method):
+    X, y, w = data()
+    expected = numerical_gradients(w, X, y, method)
+    assert np.allclose(parallel_gradients(w, X, y, method=method, workers=2), expected, atol=1e-6)
+
+
+def test_custom_cost_and_chunking():
+    X, y, w = data(1)
+    h = 1e-6
+    expected = [(absolute_cost(w + h * e, X, y) - absolute_cost(w - h * e, X, y)) / (2 * h) for e in np.eye(6)]
+    for chunk_size in (1, 5, 100):
+        result = parallel_gradients(w, X, y, cost=absolute_cost, h=h, workers=2, chunk_size=chunk_size)
+        assert np.allclose(result, expected, rtol=1e-12)
+
+
+def test_evaluator_reuses_one_pool():
+    X, y, w = data(2)
+    with GradientEvaluator(X, y, workers=2) as evaluator:
+        pool = evaluator._pool
+        for step in range(3):
+            gradient = evaluator.gradient(w)
+            assert np.allclose(gradient, numerical_gradients(w, X, y, "central"), atol=1e-6)
+            w = w - 0.1 * gradient
+        assert evaluator._pool is pool
+        assert np.allclose(evaluator.gradient(w, method="forward"), numerical_gradients(w, X, y, "forward"), atol=1e-6)
+
+    # closed: workers stopped and shared memory freed
+    assert evaluator._pool is None
+    with pytest.raises(ValueError):
+        evaluator.gradient(w)
+    evaluator.close()
+
+
+def test_unknown_method():
+    X, y, w = data()
+    with pytest.raises(ValueError):
+        parallel_gradients(w, X, y, method="sideways", workers=1)
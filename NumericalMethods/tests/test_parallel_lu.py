@@ -0,0 +1,24 @@
+import numpy as np
+from gaussian import lu_decompose
+from parallel_lu import parallel_lu_decompose, parallel_gaussian_elimination
+
+
+def test_same_factors_as_serial_blocked_lu():
+    rng = np.random.default_rng(5)
+    A = rng.standard_normal((90, 90))
+    serial, parallel = A.copy(), A.copy()
+    perm_serial = lu_decompose(serial, block_size=16)
+    perm_parallel = parallel_lu_decompose(parallel, block_size=16, workers=3)
+    assert np.array_equal(perm_serial, perm_parallel)
+    assert np.allclose(serial, parallel)
+
+
+def test_solve_matches_numpy():
+    rng = np.random.default_rng(6)
+    A = rng.standard_normal((70, 70))
+    b = rng.standard_normal(70)
+    assert np.allclose(parallel_gaussian_elimination(A, b, block_size=32, workers=2), np.linalg.solve(A, b))
+
+
+def test_singular_returns_none():
+    assert parallel_gaussian_elimination(np.ones((4, 4)), np.ones(4), block_size=2, workers=2) is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from polynomial_sweep import IncrementalQR, degree_sweep, best_degree, information_criteria
+
+
+def curve_data(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-2, 3, n)
+    return x, 0.5 * x**3 - x**2 + 2 + 0.1 * rng.standard_normal(n)
+
+
+def test_incremental_qr_matches_lstsq():
+    rng = np.random.default_rng(1)
+    A = rng.standard_normal((40, 5))
+    y = rng.standard_normal(40)
+    qr = IncrementalQR(y, 5)
+    for k in range(5):
+        qr.add_column(A[:, k])
+        expected = np.linalg.lstsq(A[:, :k + 1], y, rcond=None)[0]
+        assert np.allclose(qr.coefficients(), expected)
+        assert np.isclose(qr.rss(), np.sum((A[:, :k + 1] @ expected - y) ** 2))
+    assert np.allclose(qr.Q.T @ qr.Q, np.eye(5))
+
+    with pytest.raises(ValueError):
+        IncrementalQR(y, 2).add_column(np.zeros(40))
+
+
+@pytest.mark.parametrize("basis", ["monomial", "chebyshev"])
+def test_sweep_matches_polyfit(basis):
+    x, y = curve_data()
+    sweep = degree_sweep(x, y, 6, basis)
+    assert list(sweep["degrees"]) == [1, 2, 3, 4, 5, 6]
+    for degree, function, rss in zip(sweep["degrees"], sweep["functions"], sweep["rss"]):
+        reference = np.poly1d(np.polyfit(x, y, degree))
+        assert np.allclose(function(x), reference(x), atol=1e-9)
+        assert np.isclose(rss, np.sum((reference(x) - y) ** 2))
+    if basis == "monomial":
+        assert np.allclose(sweep["coefficients"][2], np.polyfit(x, y, 3))
+
+
+def test_best_degree_and_criteria():
+    x, y = curve_data(200)
+    sweep = degree_sweep(x, y, 8, "chebyshev")
+    assert best_degree(sweep, "bic") == 3
+    assert np.all(np.diff(sweep["rss"]) <= 1e-9)          # more terms never fit worse
+    aic, bic = information_criteria(1.0, 100, 3)
+    assert bic - aic == pytest.approx(3 * np.log(100) - 6)
+
+
+def test_degree_limits():
+    with pytest.raises(ValueError):
+        degree_sweep([1.0, 2.0, 3.0], [1.0, 2.0, 3.0], 3)
+    assert len(degree_sweep([1.0, 2.0], [1.0, 3.0], 1)["degrees"]) == 1
+
+
+def test_numproj_menu_handles_few_points(monkeypatch, capsys):
+    pytest.importorskip("matplotlib")
+    import NumProj
+    monkeypatch.setattr(NumProj.plt, "show", lambda: None)
+
+    # one point: rejected; two points with degree 3: lowered to a line
+    for answers, expected in ((["n", "1", "3", "4"], "at least 2 points"),
+                              (["n", "2", "1", "1", "2", "2", "3", "y"], "using degree 1")):
+        replies = iter(answers)
+        monkeypatch.setattr("builtins.input", lambda *args: next(replies))
+        NumProj.polynomial_menu()
+        assert expected in capsys.readouterr().out
+
+    NumProj.plot_polynomial_regression([1.0, 2.0, 3.0], [1.0, 4.0, 9.0])   # default degrees cut to 1, 2
+    assert "Graph displayed" in capsys.readouterr().out
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from sampled_derivatives import (uniform_derivative, nonuniform_derivative, savgol_coefficients,
+                                 savgol_derivative, sampled_derivative, stream_derivative,
+                                 differentiate_file)
+
+
+@pytest.mark.parametrize("order", [2, 4, 6])
+def test_uniform_exact_for_polynomials(order):
+    # an order-p stencil is exact for polynomials of degree p, ends included
+    x = np.linspace(-1, 2, 40)
+    dx = x[1] - x[0]
+    y = x**order - 3 * x
+    assert np.allclose(uniform_derivative(y, dx, order), order * x**(order - 1) - 3, atol=1e-9)
+
+
+def test_nonuniform_grid():
+    x = np.sort(np.random.default_rng(0).uniform(0, 2, 200))
+    assert np.allclose(nonuniform_derivative(x, x**2, 2), 2 * x, atol=1e-10)
+    assert np.allclose(nonuniform_derivative(x, np.sin(x), 4), np.cos(x), atol=1e-5)
+
+
+def test_savgol_coefficients_and_noise():
+    # a straight line is fitted exactly, so its slope comes straight out
+    weights = savgol_coefficients(7, 2)
+    assert np.isclose(weights @ (2.5 * np.arange(7)), 2.5)
+
+    rng = np.random.default_rng(1)
+    x = np.linspace(0, 2 * np.pi, 2000)
+    dx = x[1] - x[0]
+    y = np.sin(x) + 1e-3 * rng.standard_normal(len(x))
+    smooth = savgol_derivative(y, dx, window=101, polyorder=3)
+    plain = uniform_derivative(y, dx)
+    assert np.max(np.abs(smooth - np.cos(x))) < 0.05
+    assert np.std(smooth - np.cos(x)) < np.std(plain - np.cos(x)) / 10
+
+
+@pytest.mark.parametrize("method, chunk", [("stencil", 7), ("stencil", 1000), ("savgol", 13)])
+def test_stream_equals_whole_array(method, chunk):
+    x = np.linspace(0, 3, 500)
+    y = np.exp(-x) * np.sin(5 * x)
+    dx = x[1] - x[0]
+    whole = sampled_derivative(y, dx=dx, method=method, order=4, window=11)
+    pieces = stream_derivative((y[i:i + chunk] for i in range(0, len(y), chunk)),
+                               dx, method, order=4, window=11)
+    assert np.allclose(np.concatenate(list(pieces)), whole)
+
+
+def test_differentiate_file(tmp_path):
+    x = np.linspace(0, 1, 300)
+    np.savetxt(tmp_path / "xy.csv", np.column_stack([x, x**3]), delimiter=",", header="x,y", comments="")
+    np.save(tmp_path / "y.npy", x**3)
+
+    from_csv = differentiate_file(str(tmp_path / "xy.csv"), chunk_rows=50)
+    assert np.allclose(from_csv, 3 * x**2, atol=1e-4)
+
+    out = differentiate_file(str(tmp_path / "y.npy"), dx=x[1] - x[0], order=4, chunk_rows=64,
+                             out_path=str(tmp_path / "dy.npy"))
+    assert np.allclose(np.load(out), 3 * x**2, atol=1e-9)
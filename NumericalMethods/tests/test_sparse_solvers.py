@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from sparse_solvers import CSRMatrix, LinearOperator, thomas_solve, banded_lu_solve, choose_method, solve_sparse
+
+
+def poisson_1d(n):
+    # -1 2 -1 tridiagonal, symmetric positive definite
+    return 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+
+
+def banded_matrix(n, lower, upper, seed=0):
+    rng = np.random.default_rng(seed)
+    A = np.zeros((n, n))
+    for offset in range(-lower, upper + 1):
+        A += np.diag(rng.standard_normal(n - abs(offset)), offset)
+    return A
+
+
+def test_csr_round_trip_and_matvec():
+    A = banded_matrix(12, 2, 3)
+    csr = CSRMatrix.from_dense(A)
+    x = np.arange(12.0)
+    assert csr.nnz == np.count_nonzero(A)
+    assert np.allclose(csr @ x, A @ x)
+    assert np.allclose(csr.diagonal(), np.diag(A))
+    assert csr.bandwidth() == (2, 3)
+
+
+def test_from_coo_adds_duplicates():
+    csr = CSRMatrix.from_coo([0, 0, 1], [1, 1, 0], [2.0, 3.0, 4.0], (2, 2))
+    assert np.allclose(csr @ np.array([1.0, 1.0]), [5.0, 4.0])
+
+
+def test_thomas_matches_numpy():
+    n = 30
+    A = poisson_1d(n) + np.eye(n)
+    b = np.sin(np.arange(n))
+    x = thomas_solve(np.diag(A, -1), np.diag(A), np.diag(A, 1), b)
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+
+def test_banded_lu_with_pivoting():
+    A = banded_matrix(40, 2, 1, seed=3)
+    b = np.ones(40)
+    band = CSRMatrix.from_dense(A).to_banded(2, 1, extra_rows=2)
+    assert np.allclose(banded_lu_solve(band, 2, 1, b), np.linalg.solve(A, b))
+
+
+@pytest.mark.parametrize("A, expected", [
+    (poisson_1d(50), "thomas"),
+    (banded_matrix(50, 3, 3) + 10 * np.eye(50), "banded"),
+])
+def test_automatic_choice(A, expected):
+    b = np.ones(len(A))
+    x, info = solve_sparse(A, b)
+    assert choose_method(CSRMatrix.from_dense(A)) == expected
+    assert info["method"] == expected
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+
+@pytest.mark.parametrize("method", ["jacobi", "gauss_seidel", "sor", "cg", "bicgstab"])
+def test_iterative_solvers_converge(method):
+    n = 40
+    A = poisson_1d(n) + 2 * np.eye(n)   # diagonally dominant, so Jacobi converges too
+    b = np.cos(np.arange(n))
+    x, info = solve_sparse(A, b, method=method, tol=1e-10)
+    assert info["converged"]
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-7)
+
+
+def test_linear_operator_matrix_free():
+    n = 60
+    A = poisson_1d(n) + 0.5 * np.eye(n)
+
+    def matvec(x):
+        y = 2.5 * x
+        y[1:] -= x[:-1]
+        y[:-1] -= x[1:]
+        return y
+
+    operator = LinearOperator(matvec, (n, n), diagonal=np.full(n, 2.5), symmetric=True)
+    b = np.ones(n)
+    x, info = solve_sparse(operator, b, tol=1e-12)
+    assert info["method"] == "cg"
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+    with pytest.raises(ValueError):
+        solve_sparse(operator, b, method="thomas")
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", "ilu0"])
+def test_preconditioners_cut_iterations(preconditioner):
+    n = 80
+    rng = np.random.default_rng(9)
+    A = poisson_1d(n) + np.diag(rng.uniform(0.1, 50, n))
+    b = np.ones(n)
+
+    _, plain = solve_sparse(A, b, method="cg", tol=1e-10)
+    x, info = solve_sparse(A, b, method="cg", tol=1e-10, preconditioner=preconditioner)
+    assert info["converged"]
+    assert info["iterations"] < plain["iterations"]
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+
+def test_direct_solvers_report_a_bad_residual():
+    # tiny first pivot: Thomas (no pivoting) runs but the answer is wrong
+    A = np.array([[1e-20, 1.0], [1.0, 1.0]])
+    x, info = solve_sparse(A, [1.0, 2.0], method="thomas")
+    assert info["method"] == "thomas"
+    assert not info["converged"]
+    assert info["residuals"][0] > 1e-8
+
+    # banded LU pivots, so the same system is fine there
+    x, info = solve_sparse(A, [1.0, 2.0], method="banded")
+    assert info["converged"]
+    assert np.allclose(x, [1.0, 1.0])
+
+
+@pytest.mark.parametrize("method", ["jacobi", "gauss_seidel", "sor", "thomas", "banded"])
+def test_preconditioner_only_for_krylov(method):
+    A = poisson_1d(10) + 2 * np.eye(10)
+    with pytest.raises(ValueError):
+        solve_sparse(A, np.ones(10), method=method, preconditioner="jacobi")
+
+    # 'auto' may pick a direct solver, which just doesn't need it
+    x, info = solve_sparse(A, np.ones(10), preconditioner="jacobi")
+    assert info["converged"]
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from data_files import row_chunks, xy_chunks
+from streaming_regression import RegressionState, fit_stream, fit_file
+
+
+def line_data(n=10_000, seed=0, offset=0.0):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 10, n) + offset
+    return x, 3.0 * x - 2.0 + rng.standard_normal(n)
+
+
+def reference(x, y):
+    m, b = np.polyfit(x, y, 1)
+    return m, b, np.corrcoef(x, y)[0, 1] ** 2
+
+
+def test_one_chunk_matches_polyfit():
+    x, y = line_data()
+    state = RegressionState.from_arrays(x, y)
+    m, b, r2 = reference(x, y)
+    assert np.allclose(state.fit(), (m, b))
+    assert np.isclose(state.r_squared, r2)
+    assert np.isclose(state.variance_x, np.var(x))
+    assert np.isclose(state.covariance, np.cov(x, y, bias=True)[0, 1])
+
+
+def test_merge_in_any_order_equals_one_pass():
+    x, y = line_data()
+    parts = [RegressionState.from_arrays(x[i:i + 777], y[i:i + 777]) for i in range(0, len(x), 777)]
+    forward = RegressionState()
+    for part in parts:
+        forward = forward.merge(part)
+    backward = RegressionState()
+    for part in reversed(parts):
+        backward = backward.merge(part)
+    whole = RegressionState.from_arrays(x, y)
+    for state in (forward, backward):
+        assert state.n == whole.n
+        assert np.allclose([state.mean_x, state.m2_x, state.c_xy, state.m2_y],
+                           [whole.mean_x, whole.m2_x, whole.c_xy, whole.m2_y])
+
+
+def test_large_offset_keeps_accuracy():
+    # x around 1e9: the n*sum_x2 - sum_x**2 formula loses every digit here
+    x, y = line_data(offset=1e9)
+    state = fit_stream((x[i:i + 1000], y[i:i + 1000]) for i in range(0, len(x), 1000))
+    m, _, _ = reference(x - 1e9, y)
+    assert np.isclose(state.slope, m, rtol=1e-6)   # y ~ 3e9 itself only carries ~1e-7 detail
+
+    n = len(x)
+    textbook = (n * (x @ y) - x.sum() * y.sum()) / (n * (x @ x) - x.sum() ** 2)
+    assert abs(textbook - m) > 1e3 * abs(state.slope - m)
+
+
+def test_zero_variance_and_bad_chunks():
+    with pytest.raises(ValueError):
+        RegressionState.from_arrays([2, 2, 2], [1, 2, 3]).r_squared
+    with pytest.raises(ValueError):
+        RegressionState.from_arrays([2, 2, 2], [1, 2, 3]).slope
+    assert np.isnan(RegressionState.from_arrays([1, 2, 3], [4, 4, 4]).r_squared)
+    with pytest.raises(ValueError):
+        fit_stream([np.arange(3.0)])
+    with pytest.raises(ValueError):
+        RegressionState.from_arrays([1, 2], [1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fit_npy_file(tmp_path, workers):
+    x, y = line_data()
+    path = str(tmp_path / "xy.npy")
+    np.save(path, np.column_stack([x, y]))
+    state = fit_file(path, chunk_rows=999, workers=workers)
+    m, b, r2 = reference(x, y)
+    assert np.allclose(state.fit(), (m, b)) and np.isclose(state.r_squared, r2)
+
+
+def test_fit_csv_file_and_one_column(tmp_path):
+    x, y = line_data(500)
+    csv = tmp_path / "xy.csv"
+    np.savetxt(csv, np.column_stack([x, y]), delimiter=",", header="x,y", comments="")
+    assert np.allclose(fit_file(str(csv), chunk_rows=64).fit(), reference(x, y)[:2])
+
+    np.save(tmp_path / "y.npy", y)
+    np.savetxt(tmp_path / "y.csv", y)
+    for path, workers in (("y.npy", 1), ("y.npy", 2), ("y.csv", 1)):
+        with pytest.raises(ValueError, match="two columns"):
+            fit_file(str(tmp_path / path), workers=workers)
+
+
+def test_row_chunks_reads_every_row(tmp_path):
+    data = np.arange(30.0).reshape(10, 3)
+    np.savetxt(tmp_path / "d.csv", data, delimiter=",")
+    np.save(tmp_path / "d.npy", data)
+    for name in ("d.csv", "d.npy"):
+        assert np.array_equal(np.vstack(list(row_chunks(str(tmp_path / name), 4))), data)
+        x, y = zip(*xy_chunks(str(tmp_path / name), 4))
+        assert np.array_equal(np.concatenate(y), data[:, 1])
+
+
+def test_numproj_analytical_regression_uses_the_state(monkeypatch, capsys):
+    pytest.importorskip("matplotlib")
+    import NumProj
+
+    x = 1e8 + np.arange(200.0)     # far from 0: the raw-sums formula loses the slope here
+    y = 0.5 * x + 3.0
+    state = RegressionState.from_arrays(x, y)
+    assert NumProj.analytical_regression(x, y) == state.fit()
+    assert "R²" in capsys.readouterr().out
+
+    replies = iter(["n", "2", "1", "3", "1", "5"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(replies))
+    NumProj.regression_menu()
+    assert "Can't fit a line" in capsys.readouterr().out